@@ -0,0 +1,406 @@
+"""
+Benchmarks every djangoapp route against local backend/analyzer stubs and reports
+throughput and p50/p95/p99 latency per route and concurrency level as JSON.
+
+Run from the server/ directory:
+
+    python -m benchmarks.run --concurrency 1,8,32 --requests 400 --latency-ms 20 --output bench.json
+    python -m benchmarks.run --baseline bench.json --tolerance 0.15
+
+By default Django runs in-process (django.test.Client per worker thread) against a
+throwaway SQLite database loaded with database/data/car_records.json, and the
+backend and analyzer are replaced by benchmarks.stubs. With --url the requests go
+to a running server instead; point that server at `python -m benchmarks.stubs`.
+
+With --baseline the run is compared against an earlier report, and the exit
+status is 1 when any route got slower or less reliable than --tolerance allows.
+"""
+import argparse
+import contextlib
+import itertools
+import json
+import math
+import os
+import platform
+import sys
+import tempfile
+import time
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import Path
+
+from .stubs import DATA_DIR, load_fixtures, start_stubs
+
+SERVER_DIR = Path(__file__).resolve().parent.parent
+BENCH_USER = {"userName": "bench-user", "password": "bench-password",
+              "firstName": "Bench", "lastName": "User", "email": "bench@example.com"}
+# Responses bigger than this are not parsed when checking for an error status
+MAX_CHECKED_BODY = 1024 * 1024
+
+
+# --- Scenarios: how each named route in djangoapp/urls.py is exercised ---
+class Scenario:
+    """
+    One route's request recipe. build(i) returns (method, url name, kwargs,
+    query string, JSON body) for the i-th request; i keeps counting across
+    concurrency levels, so e.g. registrations never repeat a user name.
+    """
+
+    def __init__(self, route, build, needs_login=False):
+        self.route = route
+        self.build = build
+        self.needs_login = needs_login
+        self.sequence = itertools.count()
+
+
+def build_scenarios(run_id):
+    dealers, reviews = load_fixtures(DATA_DIR)
+    dealer_ids = [dealer["id"] for dealer in dealers]
+    reviewed_ids = sorted({review["dealership"] for review in reviews})
+    states = sorted({dealer["state"] for dealer in dealers})
+    points = [(dealer["lat"], dealer["long"]) for dealer in dealers]
+    car_queries = ["limit=100", "limit=20&type=SUV", "limit=50&year_min=2015", "limit=100&make=Toyota"]
+    review_queries = ["q=service", "q=great+car&sentiment=positive", "q=price&car_make=Audi",
+                      "q=dealer+service&dealer_id={}".format(reviewed_ids[0])]
+    inventory_queries = ["", "make=Toyota", "body_type=SUV&year_min=2021&sort=mileage",
+                         "mileage_max=10000&sort=-mileage&limit=20", "dealer_id={}"]
+    review = {"name": "Bench User", "review": "Great service, fair price", "purchase": True,
+              "purchase_date": "01/01/2024", "car_make": "Toyota", "car_model": "Corolla", "car_year": 2020}
+    credentials = {"userName": BENCH_USER["userName"], "password": BENCH_USER["password"]}
+
+    def pick(values, i):
+        return values[i % len(values)]
+
+    scenarios = [
+        Scenario("registration", lambda i: ("POST", "registration", {}, "", dict(
+            BENCH_USER, userName=f"bench-{run_id}-{i}"))),
+        Scenario("login", lambda i: ("POST", "login", {}, "", credentials)),
+        Scenario("logout", lambda i: ("GET", "logout", {}, "", None)),
+        Scenario("getcars", lambda i: ("GET", "getcars", {}, pick(car_queries, i), None)),
+        Scenario("inventory", lambda i: (
+            "GET", "inventory", {}, pick(inventory_queries, i).format(pick(dealer_ids, i)), None)),
+        Scenario("get_dealers", lambda i: ("GET", "get_dealers", {}, "", None)),
+        Scenario("get_dealers_by_state", lambda i: (
+            "GET", "get_dealers_by_state", {"state": pick(states, i)}, "", None)),
+        Scenario("nearby_dealers", lambda i: (
+            "GET", "nearby_dealers", {}, "lat={}&long={}&k=5".format(*pick(points, i)), None)),
+        Scenario("dealer_details", lambda i: (
+            "GET", "dealer_details", {"dealer_id": pick(dealer_ids, i)}, "", None)),
+        Scenario("dealer_sentiment_summary", lambda i: (
+            "GET", "dealer_sentiment_summary", {"dealer_id": pick(dealer_ids, i)}, "", None)),
+        Scenario("dealers_sentiment_summary", lambda i: ("GET", "dealers_sentiment_summary", {}, "", None)),
+        Scenario("review_search", lambda i: ("GET", "review_search", {}, pick(review_queries, i), None)),
+        Scenario("dealer_reviews", lambda i: (
+            "GET", "dealer_reviews", {"dealer_id": pick(reviewed_ids, i)}, "", None)),
+        Scenario("add_review", lambda i: ("POST", "add_review", {}, "", dict(
+            review, dealership=pick(dealer_ids, i))), needs_login=True),
+        Scenario("add_reviews", lambda i: ("POST", "add_reviews", {}, "", [
+            dict(review, dealership=pick(dealer_ids, i + n)) for n in range(50)]), needs_login=True),
+    ]
+    return {scenario.route: scenario for scenario in scenarios}
+
+
+def route_names():
+    from djangoapp import urls
+    return [pattern.name for pattern in urls.urlpatterns if getattr(pattern, "name", None)]
+
+
+# --- Drivers: where the requests go ---
+class InProcessDriver:
+    """
+    Calls the Django app in this process, one test Client per worker thread.
+    """
+
+    def __init__(self):
+        from django.test import Client
+        self.client_class = Client
+
+    def session(self, login=False):
+        client = self.client_class()
+        if login:
+            client.post(self.path("login"), data=json.dumps(BENCH_USER), content_type="application/json")
+        return InProcessSession(client, self)
+
+    @staticmethod
+    def path(name, kwargs=None, query=""):
+        from django.urls import reverse
+        path = reverse(f"djangoapp:{name}", kwargs=kwargs or None)
+        return f"{path}?{query}" if query else path
+
+
+class InProcessSession:
+    def __init__(self, client, driver):
+        self.client = client
+        self.driver = driver
+
+    def request(self, method, name, kwargs, query, body):
+        path = self.driver.path(name, kwargs, query)
+        if method == "POST":
+            response = self.client.post(path, data=json.dumps(body), content_type="application/json")
+        else:
+            response = self.client.get(path)
+        content = b"".join(response.streaming_content) if response.streaming else response.content
+        return response.status_code, content
+
+
+class HTTPDriver:
+    """
+    Sends real HTTP requests to a running server at base_url.
+    """
+
+    def __init__(self, base_url):
+        self.base_url = base_url.rstrip("/")
+
+    def session(self, login=False):
+        import requests
+        http = requests.Session()
+        if login:
+            # Registering an existing user is a no-op, so this works on a fresh server too
+            http.post(self.path("registration"), json=BENCH_USER, timeout=30)
+            http.post(self.path("login"), json=BENCH_USER, timeout=30)
+        return HTTPSession(http, self)
+
+    def path(self, name, kwargs=None, query=""):
+        return self.base_url + InProcessDriver.path(name, kwargs, query)
+
+
+class HTTPSession:
+    def __init__(self, http, driver):
+        self.http = http
+        self.driver = driver
+
+    def request(self, method, name, kwargs, query, body):
+        url = self.driver.path(name, kwargs, query)
+        response = self.http.request(method, url, json=body, timeout=60)
+        return response.status_code, response.content
+
+
+def is_error(status, content):
+    """
+    Views report most failures as HTTP 200 with a "status" or "error" field, so
+    check the body as well as the status code.
+    """
+    if status >= 400:
+        return True
+    if len(content) > MAX_CHECKED_BODY or not content.startswith(b"{"):
+        return False
+    try:
+        payload = json.loads(content)
+    except ValueError:
+        return True
+    if "error" in payload:
+        return True
+    return isinstance(payload.get("status"), int) and payload["status"] >= 400
+
+
+# --- Measurement ---
+def percentile(sorted_values, fraction):
+    """
+    Nearest-rank percentile of an already sorted list.
+    """
+    if not sorted_values:
+        return None
+    rank = max(1, math.ceil(fraction * len(sorted_values)))
+    return sorted_values[rank - 1]
+
+
+def run_level(driver, scenario, concurrency, requests, warmup):
+    """
+    Sends requests requests for one scenario from concurrency worker threads and
+    returns the summary dict for that (route, concurrency) pair.
+    """
+    sessions = [driver.session(login=scenario.needs_login) for _ in range(concurrency)]
+    for i in range(warmup):
+        sessions[i % concurrency].request(*scenario.build(next(scenario.sequence)))
+
+    remaining = itertools.count(requests, -1)
+
+    def work(session):
+        latencies, errors = [], 0
+        while next(remaining) > 0:
+            request = scenario.build(next(scenario.sequence))
+            started = time.perf_counter()
+            status, content = session.request(*request)
+            latencies.append(time.perf_counter() - started)
+            errors += is_error(status, content)
+        return latencies, errors
+
+    started = time.perf_counter()
+    with ThreadPoolExecutor(max_workers=concurrency) as pool:
+        outcomes = list(pool.map(work, sessions))
+    elapsed = time.perf_counter() - started
+
+    latencies = sorted(latency for worker_latencies, _ in outcomes for latency in worker_latencies)
+    errors = sum(worker_errors for _, worker_errors in outcomes)
+
+    def ms(value):
+        return round(value * 1000, 3) if value is not None else None
+
+    return {
+        "route": scenario.route,
+        "concurrency": concurrency,
+        "requests": len(latencies),
+        "errors": errors,
+        "error_rate": round(errors / len(latencies), 4) if latencies else 0.0,
+        "throughput_rps": round(len(latencies) / elapsed, 2) if elapsed else None,
+        "latency_ms": {
+            "p50": ms(percentile(latencies, 0.50)),
+            "p95": ms(percentile(latencies, 0.95)),
+            "p99": ms(percentile(latencies, 0.99)),
+            "mean": ms(sum(latencies) / len(latencies)) if latencies else None,
+            "max": ms(latencies[-1]) if latencies else None,
+        },
+    }
+
+
+# --- Baseline comparison ---
+def compare(report, baseline, tolerance, min_delta_ms):
+    """
+    Returns human-readable regressions of report against baseline: throughput
+    down, or p50/p95 latency up, by more than tolerance (a fraction), and any
+    rise in error rate. Latency changes under min_delta_ms are ignored as noise.
+    """
+    previous = {(result["route"], result["concurrency"]): result for result in baseline["results"]}
+    regressions = []
+    for result in report["results"]:
+        key = (result["route"], result["concurrency"])
+        before = previous.get(key)
+        if before is None:
+            continue
+        label = f"{key[0]} @ c={key[1]}"
+        if before["throughput_rps"] and result["throughput_rps"] < before["throughput_rps"] * (1 - tolerance):
+            regressions.append(f"{label}: throughput {before['throughput_rps']} -> {result['throughput_rps']} req/s")
+        for metric in ("p50", "p95"):
+            old, new = before["latency_ms"][metric], result["latency_ms"][metric]
+            if old is not None and new is not None and new > old * (1 + tolerance) and new - old > min_delta_ms:
+                regressions.append(f"{label}: {metric} {old} -> {new} ms")
+        if result["error_rate"] > before["error_rate"]:
+            regressions.append(f"{label}: error rate {before['error_rate']} -> {result['error_rate']}")
+    return regressions
+
+
+# --- Environment ---
+def configure_django(backend_url, sentiment_url):
+    """
+    Points restapis at the stubs and sets Django up on a throwaway SQLite
+    database holding the car_records.json catalogue and the benchmark user.
+    Must run before anything imports djangoapp.
+    """
+    os.environ["backend_url"] = backend_url
+    os.environ["sentiment_analyzer_url"] = sentiment_url
+    # Keep sentiment results in memory only so runs don't depend on each other
+    os.environ.setdefault("sentiment_cache_path", "")
+    os.environ.setdefault("DJANGO_SETTINGS_MODULE", "djangoproj.settings")
+    sys.path.insert(0, str(SERVER_DIR))
+
+    import django
+    from django.conf import settings
+    django.setup()
+    from django.test.utils import setup_test_environment
+    setup_test_environment()  # DEBUG off, "testserver" allowed
+
+    database = tempfile.NamedTemporaryFile(prefix="bench-", suffix=".sqlite3", delete=False)
+    database.close()
+    settings.DATABASES["default"]["NAME"] = database.name
+
+    from django.contrib.auth.models import User
+    from django.core.management import call_command
+    call_command("migrate", verbosity=0)
+    call_command("load_catalogue", str(SERVER_DIR / "database" / "data" / "car_records.json"), verbosity=0)
+    User.objects.create_user(username=BENCH_USER["userName"], password=BENCH_USER["password"])
+    return database.name
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--concurrency", default="1,8,32", help="Comma-separated concurrency levels")
+    parser.add_argument("--requests", type=int, default=200, help="Timed requests per route and level")
+    parser.add_argument("--warmup", type=int, default=10, help="Untimed requests before each level")
+    parser.add_argument("--routes", help="Comma-separated route names to run (default: all)")
+    parser.add_argument("--latency-ms", type=float, default=10.0, help="Latency injected into backend replies")
+    parser.add_argument("--sentiment-latency-ms", type=float, help="Latency for analyzer replies (default: --latency-ms)")
+    parser.add_argument("--jitter-ms", type=float, default=0.0, help="Extra random stub latency, uniform in [0, jitter]")
+    parser.add_argument("--url", help="Benchmark a running server at this base URL instead of in-process")
+    parser.add_argument("--output", help="Write the JSON report here (default: stdout)")
+    parser.add_argument("--baseline", help="Earlier JSON report to compare against")
+    parser.add_argument("--tolerance", type=float, default=0.10, help="Allowed relative regression (default 0.10)")
+    parser.add_argument("--min-delta-ms", type=float, default=1.0,
+                        help="Ignore latency regressions smaller than this (default 1.0)")
+    args = parser.parse_args(argv)
+    levels = [int(level) for level in args.concurrency.split(",")]
+
+    database = None
+    if args.url:
+        driver = HTTPDriver(args.url)
+        sys.path.insert(0, str(SERVER_DIR))
+        os.environ.setdefault("DJANGO_SETTINGS_MODULE", "djangoproj.settings")
+        import django
+        django.setup()  # Only to reverse() route names
+    else:
+        backend, sentiment = start_stubs(
+            latency=args.latency_ms / 1000,
+            sentiment_latency=None if args.sentiment_latency_ms is None else args.sentiment_latency_ms / 1000,
+            jitter=args.jitter_ms / 1000,
+        )
+        database = configure_django(backend.url, sentiment.url + "/")
+        driver = InProcessDriver()
+
+    scenarios = build_scenarios(run_id=int(time.time()))
+    missing = [name for name in route_names() if name not in scenarios]
+    if missing:
+        parser.error(f"No benchmark scenario for route(s): {', '.join(missing)}; add them to build_scenarios()")
+    selected = args.routes.split(",") if args.routes else route_names()
+    unknown = [name for name in selected if name not in scenarios]
+    if unknown:
+        parser.error(f"Unknown route(s): {', '.join(unknown)}")
+
+    from django.core.cache import cache
+    results = []
+    try:
+        # The views print progress; keep stdout for the report
+        with contextlib.redirect_stdout(sys.stderr):
+            for name in selected:
+                for level in levels:
+                    if not args.url:
+                        cache.clear()  # Every level starts from the same (cold) cache
+                    result = run_level(driver, scenarios[name], level, args.requests, args.warmup)
+                    results.append(result)
+                    print(f"{name:<22} c={level:<4} {result['throughput_rps']:>9} req/s  "
+                          f"p50={result['latency_ms']['p50']}ms p95={result['latency_ms']['p95']}ms "
+                          f"p99={result['latency_ms']['p99']}ms errors={result['errors']}", file=sys.stderr)
+    finally:
+        if database:
+            os.unlink(database)
+
+    report = {
+        "meta": {
+            "created": time.strftime("%Y-%m-%dT%H:%M:%S%z"),
+            "python": platform.python_version(),
+            "target": args.url or "in-process",
+            "concurrency": levels,
+            "requests": args.requests,
+            "warmup": args.warmup,
+            "latency_ms": args.latency_ms,
+            "sentiment_latency_ms": args.latency_ms if args.sentiment_latency_ms is None else args.sentiment_latency_ms,
+            "jitter_ms": args.jitter_ms,
+        },
+        "results": results,
+    }
+    rendered = json.dumps(report, indent=2)
+    if args.output:
+        Path(args.output).write_text(rendered + "\n", encoding="utf-8")
+    else:
+        print(rendered)
+
+    if args.baseline:
+        baseline = json.loads(Path(args.baseline).read_text(encoding="utf-8"))
+        regressions = compare(report, baseline, args.tolerance, args.min_delta_ms)
+        for regression in regressions:
+            print(f"REGRESSION {regression}", file=sys.stderr)
+        if regressions:
+            return 1
+        print(f"No regressions against {args.baseline} (tolerance {args.tolerance:.0%})", file=sys.stderr)
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,188 @@
+"""
+Local stand-ins for the Express/Mongo backend and the sentiment analyzer, serving
+the fixtures in database/data with configurable injected latency.
+
+Run them on their own (e.g. to point a deployed server at them) with:
+
+    python -m benchmarks.stubs --backend-port 3030 --sentiment-port 5050 --latency-ms 20
+"""
+import argparse
+import json
+import random
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from pathlib import Path
+from urllib.parse import unquote, urlsplit
+
+DATA_DIR = Path(__file__).resolve().parent.parent / "database" / "data"
+
+
+def load_fixtures(data_dir=DATA_DIR):
+    with open(data_dir / "dealerships.json", encoding="utf-8") as f:
+        dealers = json.load(f)["dealerships"]
+    with open(data_dir / "reviews.json", encoding="utf-8") as f:
+        reviews = json.load(f)["reviews"]
+    return dealers, reviews
+
+
+class StubServer(ThreadingHTTPServer):
+    """
+    Threaded HTTP server whose handlers sleep latency seconds (plus up to jitter
+    seconds) before every reply.
+    """
+    daemon_threads = True
+
+    def __init__(self, address, handler, latency=0.0, jitter=0.0):
+        super().__init__(address, handler)
+        self.latency = latency
+        self.jitter = jitter
+        self.requests_served = 0
+        self._count_lock = threading.Lock()
+
+    def delay(self):
+        with self._count_lock:
+            self.requests_served += 1
+        wait = self.latency + (random.uniform(0, self.jitter) if self.jitter else 0.0)
+        if wait > 0:
+            time.sleep(wait)
+
+    @property
+    def url(self):
+        host, port = self.server_address[:2]
+        return f"http://{host}:{port}"
+
+    def start(self):
+        threading.Thread(target=self.serve_forever, name=type(self).__name__, daemon=True).start()
+        return self
+
+
+class JSONHandler(BaseHTTPRequestHandler):
+    protocol_version = "HTTP/1.1"
+    # Headers and body go out in separate writes; without TCP_NODELAY the body
+    # waits on a delayed ACK and every keep-alive reply gains ~40ms
+    disable_nagle_algorithm = True
+
+    def log_message(self, *args):
+        pass
+
+    def send_json(self, payload, status=200):
+        body = json.dumps(payload).encode("utf-8")
+        self.send_response(status)
+        self.send_header("Content-Type", "application/json; charset=utf-8")
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def read_json(self):
+        length = int(self.headers.get("Content-Length") or 0)
+        try:
+            return json.loads(self.rfile.read(length) or b"null")
+        except ValueError:
+            return None
+
+
+class BackendHandler(JSONHandler):
+    """
+    Mirrors the routes of database/app.js over the fixture data.
+    """
+    dealers = []
+    reviews = []
+
+    def do_GET(self):
+        self.server.delay()
+        parts = [unquote(part) for part in urlsplit(self.path).path.strip("/").split("/")]
+        if parts == ["fetchDealers"]:
+            return self.send_json(self.dealers)
+        if len(parts) == 2 and parts[0] == "fetchDealers":
+            return self.send_json([dealer for dealer in self.dealers if dealer["state"] == parts[1]])
+        if len(parts) == 2 and parts[0] == "fetchDealer":
+            for dealer in self.dealers:
+                if str(dealer["id"]) == parts[1]:
+                    return self.send_json(dealer)
+            return self.send_json({"error": "Dealer not found"}, 404)
+        if parts == ["fetchReviews"]:
+            return self.send_json(self.reviews)
+        if len(parts) == 3 and parts[:2] == ["fetchReviews", "dealer"]:
+            return self.send_json([review for review in self.reviews if str(review["dealership"]) == parts[2]])
+        return self.send_json({"error": "Not found"}, 404)
+
+    def do_POST(self):
+        self.server.delay()
+        data = self.read_json()
+        if urlsplit(self.path).path == "/insert_reviews":
+            if not isinstance(data, list):
+                return self.send_json({"error": "Expected a JSON array of reviews"}, 400)
+            first_id = len(self.reviews) + 1
+            return self.send_json([{"status": "created", "id": first_id + i} for i in range(len(data))], 201)
+        if not isinstance(data, dict):
+            return self.send_json({"error": "Invalid JSON format"}, 400)
+        # Nothing is stored, so every run sees the same fixtures
+        if urlsplit(self.path).path == "/insert_review":
+            return self.send_json(dict(data, id=len(self.reviews) + 1))
+        return self.send_json({"error": "Not found"}, 404)
+
+
+class SentimentHandler(JSONHandler):
+    """
+    Answers the analyzer's /analyze and /analyze_batch routes with a fixed result.
+    """
+    result = {"sentiment": "neutral", "scores": {"neg": 0.0, "neu": 1.0, "pos": 0.0, "compound": 0.0}}
+
+    def do_GET(self):
+        self.server.delay()
+        if self.path.startswith("/analyze/"):
+            return self.send_json({"sentiment": self.result["sentiment"]})
+        return self.send_json({"error": "Not found"}, 404)
+
+    def do_POST(self):
+        self.server.delay()
+        texts = self.read_json()
+        if self.path != "/analyze_batch":
+            return self.send_json({"error": "Not found"}, 404)
+        if not isinstance(texts, list):
+            return self.send_json({"error": "Expected a JSON array of texts"}, 400)
+        return self.send_json([self.result] * len(texts))
+
+
+def start_stubs(latency=0.0, sentiment_latency=None, jitter=0.0, host="127.0.0.1",
+                backend_port=0, sentiment_port=0, data_dir=DATA_DIR):
+    """
+    Starts the backend and sentiment stubs in background threads (port 0 picks a
+    free port) and returns (backend, sentiment) StubServer instances.
+    """
+    dealers, reviews = load_fixtures(data_dir)
+    backend_handler = type("FixtureBackendHandler", (BackendHandler,), {"dealers": dealers, "reviews": reviews})
+    backend = StubServer((host, backend_port), backend_handler, latency, jitter).start()
+    sentiment = StubServer((host, sentiment_port), SentimentHandler,
+                           latency if sentiment_latency is None else sentiment_latency, jitter).start()
+    return backend, sentiment
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--backend-port", type=int, default=3030)
+    parser.add_argument("--sentiment-port", type=int, default=5050)
+    parser.add_argument("--latency-ms", type=float, default=0.0, help="Delay added to every backend reply")
+    parser.add_argument("--sentiment-latency-ms", type=float, help="Delay for analyzer replies (default: --latency-ms)")
+    parser.add_argument("--jitter-ms", type=float, default=0.0, help="Extra random delay, uniform in [0, jitter]")
+    args = parser.parse_args()
+
+    backend, sentiment = start_stubs(
+        latency=args.latency_ms / 1000,
+        sentiment_latency=None if args.sentiment_latency_ms is None else args.sentiment_latency_ms / 1000,
+        jitter=args.jitter_ms / 1000, host=args.host,
+        backend_port=args.backend_port, sentiment_port=args.sentiment_port,
+    )
+    print(f"backend_url={backend.url}")
+    print(f"sentiment_analyzer_url={sentiment.url}/")
+    try:
+        while True:
+            time.sleep(3600)
+    except KeyboardInterrupt:
+        pass
+
+
+if __name__ == "__main__":
+    main()
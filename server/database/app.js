@@ -135,6 +135,7 @@ app.post('/insert_review', express.raw({ type: '*/*' }), async (req, res) => {
         "car_make": data['car_make'],
         "car_model": data['car_model'],
         "car_year": data['car_year'],
+        "sentiment": data['sentiment'],
     });
 
   try {
@@ -146,6 +147,63 @@ app.post('/insert_review', express.raw({ type: '*/*' }), async (req, res) => {
   }
 });
 
+// Express route to insert a batch of reviews (used by the djangoapp bulk ingestion endpoint)
+// Replies 201 with one {status, id} or {status, error} per input review, in order
+app.post('/insert_reviews', express.raw({ type: '*/*', limit: '16mb' }), async (req, res) => {
+  let data;
+  try {
+    data = JSON.parse(req.body.toString());
+  } catch (parseError) {
+    return res.status(400).json({ error: 'Invalid JSON format' });
+  }
+  if (!Array.isArray(data)) {
+    return res.status(400).json({ error: 'Expected a JSON array of reviews' });
+  }
+
+  // One max-ID lookup for the whole batch, then consecutive IDs
+  const documents = await Reviews.find().sort( { id: -1 } ).limit(1);
+  let next_id = documents.length > 0 ? documents[0]['id'] + 1 : 1;
+
+  const results = [];
+  const batch = [];
+  for (const item of data) {
+    const review = new Reviews({
+          "id": next_id,
+          "name": item['name'],
+          "dealership": item['dealership'],
+          "review": item['review'],
+          "purchase": item['purchase'],
+          "purchase_date": item['purchase_date'],
+          "car_make": item['car_make'],
+          "car_model": item['car_model'],
+          "car_year": item['car_year'],
+          "sentiment": item['sentiment'],
+      });
+    const invalid = review.validateSync();
+    if (invalid) {
+      results.push({ status: 'error', error: invalid.message });
+      continue;
+    }
+    results.push({ status: 'created', id: next_id });
+    batch.push({ review: review, result: results.length - 1 });
+    next_id += 1;
+  }
+
+  if (batch.length > 0) {
+    try {
+      // Unordered: one bad document doesn't stop the rest of the batch
+      await Reviews.insertMany(batch.map((entry) => entry.review), { ordered: false });
+    } catch (error) {
+      console.error("Error inserting reviews:", error);
+      const failed = error.writeErrors ? error.writeErrors.map((writeError) => writeError.index) : batch.map((entry, index) => index);
+      for (const index of failed) {
+        results[batch[index].result] = { status: 'error', error: 'Error inserting review' };
+      }
+    }
+  }
+  res.status(201).json(results);
+});
+
 // Start the Express server
 app.listen(port, () => {
   console.log(`Server is running on http://localhost:${port}`);
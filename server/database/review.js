@@ -39,6 +39,11 @@ const reviews = new Schema({
     type: Number,
     required: true
   },
+  // Scored once when the review is written (see djangoapp add_review)
+  sentiment: {
+    type: String,
+    required: false
+  },
 });
 
 module.exports = mongoose.model('reviews', reviews);
@@ -3,3 +3,16 @@ from django.apps import AppConfig
 
 class DjangoappConfig(AppConfig):
     name = 'djangoapp'
+
+    def ready(self):
+        # Connect the cache-invalidation signal receivers
+        from . import signals  # noqa: F401
+
+        # Time ORM queries for the Server-Timing middleware
+        from django.db.backends.signals import connection_created
+        from .timing import install_db_timing
+        connection_created.connect(install_db_timing, dispatch_uid="djangoapp.install_db_timing")
+
+        # WAL and the other SQLite pragmas from settings
+        from .db import configure_connection
+        connection_created.connect(configure_connection, dispatch_uid="djangoapp.configure_connection")
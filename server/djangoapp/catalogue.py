@@ -0,0 +1,182 @@
+# server/djangoapp/catalogue.py
+
+import base64
+import binascii
+import hashlib
+import json
+from decimal import Decimal, InvalidOperation
+
+from .models import CarMake, CarModel
+from .populate import normalize_car_type
+
+# Page sizes for get_cars: hard cap, and the size above which pages are streamed.
+# Requests with neither limit nor cursor get the whole (filtered) catalogue.
+MAX_PAGE_SIZE = 5000
+STREAM_PAGE_SIZE = 500
+
+
+class CatalogueQueryError(ValueError):
+    """
+    Raised for malformed get_cars query parameters.
+    """
+
+
+# --- Cursors ---
+def encode_cursor(last_id):
+    """
+    Returns the opaque keyset cursor pointing just after the given CarModel id.
+    """
+    return base64.urlsafe_b64encode(str(last_id).encode()).decode().rstrip("=")
+
+
+def decode_cursor(cursor):
+    try:
+        padded = cursor + "=" * (-len(cursor) % 4)
+        return int(base64.urlsafe_b64decode(padded.encode()).decode())
+    except (binascii.Error, UnicodeDecodeError, ValueError):
+        raise CatalogueQueryError("Invalid cursor")
+
+
+# --- Query parsing ---
+def _int_param(params, name, minimum=None, maximum=None):
+    value = params.get(name)
+    if value in (None, ""):
+        return None
+    try:
+        value = int(value)
+    except ValueError:
+        raise CatalogueQueryError(f"{name} must be an integer")
+    if minimum is not None and value < minimum:
+        raise CatalogueQueryError(f"{name} must be at least {minimum}")
+    if maximum is not None and value > maximum:
+        raise CatalogueQueryError(f"{name} must be at most {maximum}")
+    return value
+
+
+def _decimal_param(params, name):
+    value = params.get(name)
+    if value in (None, ""):
+        return None
+    try:
+        return Decimal(value)
+    except InvalidOperation:
+        raise CatalogueQueryError(f"{name} must be a number")
+
+
+def parse_query(params):
+    """
+    Validates get_cars query parameters (a QueryDict or dict) into a normalized dict:
+    make, type, year_min, year_max, price_min, price_max, limit and after (the id
+    decoded from cursor). limit is None for an unpaged request (no limit and no
+    cursor); a cursor without a limit continues in pages of MAX_PAGE_SIZE.
+    Raises CatalogueQueryError on bad input.
+    """
+    car_type = params.get("type") or None
+    if car_type is not None:
+        car_type = normalize_car_type(car_type)
+        if car_type is None:
+            raise CatalogueQueryError("Unknown type")
+    cursor = params.get("cursor")
+    limit = _int_param(params, "limit", minimum=1, maximum=MAX_PAGE_SIZE)
+    return {
+        "make": params.get("make") or None,
+        "type": car_type,
+        "year_min": _int_param(params, "year_min"),
+        "year_max": _int_param(params, "year_max"),
+        "price_min": _decimal_param(params, "price_min"),
+        "price_max": _decimal_param(params, "price_max"),
+        "limit": limit or (MAX_PAGE_SIZE if cursor else None),
+        "after": decode_cursor(cursor) if cursor else None,
+    }
+
+
+def query_fingerprint(query):
+    """
+    Returns a short stable key for a parsed query, used to cache each page variant.
+    """
+    canonical = json.dumps({key: str(value) for key, value in query.items()}, sort_keys=True)
+    return hashlib.sha1(canonical.encode()).hexdigest()
+
+
+# --- Query building ---
+def build_queryset(query):
+    """
+    Returns the filtered CarModel queryset for one keyset page, ordered by id and
+    limited to limit + 1 rows (the extra row tells whether another page exists),
+    or every matching row when limit is None.
+    The filters line up with the composite indexes declared on CarModel.
+    """
+    queryset = CarModel.objects.all()
+    if query["make"]:
+        # Resolve the make name once so the model query filters on the indexed FK
+        make_ids = list(CarMake.objects.filter(name__iexact=query["make"]).values_list("id", flat=True))
+        queryset = queryset.filter(car_make_id__in=make_ids)
+    if query["type"]:
+        queryset = queryset.filter(type=query["type"])
+    if query["year_min"] is not None:
+        queryset = queryset.filter(year__gte=query["year_min"])
+    if query["year_max"] is not None:
+        queryset = queryset.filter(year__lte=query["year_max"])
+    if query["price_min"] is not None:
+        queryset = queryset.filter(price__gte=query["price_min"])
+    if query["price_max"] is not None:
+        queryset = queryset.filter(price__lte=query["price_max"])
+    if query["after"] is not None:
+        queryset = queryset.filter(id__gt=query["after"])
+
+    # values_list skips model instantiation; one JOIN pulls the make name
+    queryset = queryset.order_by("id").values_list(
+        "id", "name", "car_make__name", "year", "type", "price"
+    )
+    return queryset if query["limit"] is None else queryset[:query["limit"] + 1]
+
+
+def serialize_row(row):
+    car_id, name, make, year, car_type, price = row
+    return {
+        "CarModel": name,
+        "CarMake": make,
+        "Year": year,
+        "Type": car_type,
+        "Price": float(price) if price is not None else None,
+    }
+
+
+def build_page(query):
+    """
+    Runs one page query and returns the {"CarModels": [...], "next_cursor": ...} payload.
+    """
+    rows = list(build_queryset(query))
+    has_more = query["limit"] is not None and len(rows) > query["limit"]
+    rows = rows[:query["limit"]]
+    return {
+        "CarModels": [serialize_row(row) for row in rows],
+        "next_cursor": encode_cursor(rows[-1][0]) if has_more and rows else None,
+    }
+
+
+def stream_page(query, chunk_size=500):
+    """
+    Yields one page as JSON bytes, a chunk of rows at a time, so a large page is
+    never materialized in memory. Produces the same document as build_page().
+    """
+    limit = query["limit"]
+    yield b'{"CarModels": ['
+    count = 0
+    last_id = None
+    has_more = False
+    parts = []
+    for row in build_queryset(query).iterator(chunk_size=chunk_size):
+        if count == limit:
+            has_more = True
+            break
+        parts.append(json.dumps(serialize_row(row)))
+        count += 1
+        last_id = row[0]
+        if len(parts) == chunk_size:
+            yield (", " if count > chunk_size else "").encode() + ", ".join(parts).encode("utf-8")
+            parts = []
+    if parts:
+        yield (", " if count > len(parts) else "").encode() + ", ".join(parts).encode("utf-8")
+    next_cursor = encode_cursor(last_id) if has_more and last_id is not None else None
+    yield b'], "next_cursor": ' + json.dumps(next_cursor).encode("utf-8") + b"}"
@@ -0,0 +1,36 @@
+# server/djangoapp/db.py
+
+import logging
+
+from django.conf import settings
+
+logger = logging.getLogger(__name__)
+
+
+def sqlite_pragmas():
+    """
+    Returns the PRAGMA statements to run on a new SQLite connection.
+    """
+    pragmas = []
+    if settings.SQLITE_JOURNAL_MODE:
+        # WAL: readers (get_cars, session lookups) keep reading the last
+        # committed state while a login or admin edit writes
+        pragmas.append(f"PRAGMA journal_mode={settings.SQLITE_JOURNAL_MODE}")
+    if settings.SQLITE_SYNCHRONOUS:
+        # NORMAL is safe with WAL: a crash may lose the last commits, never corrupt
+        pragmas.append(f"PRAGMA synchronous={settings.SQLITE_SYNCHRONOUS}")
+    pragmas.append(f"PRAGMA mmap_size={int(settings.SQLITE_MMAP_SIZE)}")
+    return pragmas
+
+
+def configure_connection(sender, connection, **kwargs):
+    """
+    connection_created receiver: tunes each new SQLite connection. Other
+    database vendors are left as configured in settings.DATABASES.
+    """
+    if connection.vendor != "sqlite":
+        return
+    with connection.cursor() as cursor:
+        for pragma in sqlite_pragmas():
+            cursor.execute(pragma)
+    logger.debug("Configured SQLite connection to %s", connection.settings_dict["NAME"])
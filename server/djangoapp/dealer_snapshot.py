@@ -0,0 +1,124 @@
+# server/djangoapp/dealer_snapshot.py
+
+import logging
+import threading
+import time
+
+from .http_cache import serialize, strong_etag
+
+logger = logging.getLogger(__name__)
+
+
+class DealerSnapshot:
+    """
+    Immutable copy of every dealership with per-state and per-id lookup tables.
+    Response bodies (and their ETags) are serialized once per snapshot, on first use,
+    for the states and ids the snapshot holds.
+    """
+
+    def __init__(self, dealers):
+        self.dealers = dealers
+        self.created_at = time.monotonic()
+        self.by_state = {}
+        self.by_id = {}
+        for dealer in dealers:
+            self.by_state.setdefault(dealer.get("state"), []).append(dealer)
+            self.by_id[str(dealer.get("id"))] = dealer
+        self._bodies = {}
+
+    def age(self):
+        return time.monotonic() - self.created_at
+
+    def _envelope(self, key, field, value):
+        entry = self._bodies.get(key)
+        if entry is None:
+            body = serialize({"status": 200, field: value})
+            entry = self._bodies[key] = (body, strong_etag(body))
+        return entry
+
+    def dealers_body(self, state="All"):
+        """
+        Returns (body, etag) for get_dealerships: all dealers, or those in one state
+        (an empty list for unknown states, like the backend's /fetchDealers/<state>).
+        """
+        if state == "All":
+            return self._envelope("All", "dealers", self.dealers)
+        if state not in self.by_state:
+            # Not memoized: the state comes from the URL, and storing a body per
+            # unknown value would let arbitrary requests grow _bodies without bound
+            body = serialize({"status": 200, "dealers": []})
+            return body, strong_etag(body)
+        return self._envelope("state:" + state, "dealers", self.by_state[state])
+
+    def dealer_body(self, dealer_id):
+        """
+        Returns (body, etag) for get_dealer_details, or None when the id is unknown.
+        """
+        dealer = self.by_id.get(str(dealer_id))
+        if dealer is None:
+            return None
+        return self._envelope("id:" + str(dealer_id), "dealer", dealer)
+
+
+class DealerSnapshotStore:
+    """
+    Holds the current DealerSnapshot. The first get() that finds it older than
+    interval seconds starts a background refresh; no thread runs between
+    requests. A stale snapshot keeps being served while a refresh runs, and a
+    failed refresh leaves the previous snapshot in place (and sets failing until
+    a refresh succeeds again).
+    """
+
+    def __init__(self, load, interval=60):
+        self.load = load
+        self.interval = interval
+        self.snapshot = None
+        self.failing = False
+        self._refreshing = threading.Lock()
+
+    def get(self, wait=True):
+        """
+        Returns the current snapshot. The first call loads it synchronously unless
+        wait is False (then it returns None and the load runs in the background).
+        A snapshot older than the interval is returned as-is while a refresh starts.
+        """
+        snapshot = self.snapshot
+        if snapshot is None:
+            if wait:
+                self.refresh()
+            else:
+                self.refresh_in_background()
+            return self.snapshot
+        if snapshot.age() >= self.interval:
+            self.refresh_in_background()
+        return snapshot
+
+    def refresh(self):
+        """
+        Loads a fresh snapshot now; concurrent callers wait for the one in flight.
+        """
+        with self._refreshing:
+            if self.snapshot is not None and self.snapshot.age() < self.interval:
+                return  # Another thread just refreshed it
+            self._load()
+
+    def refresh_in_background(self):
+        if self._refreshing.acquire(blocking=False):
+            threading.Thread(target=self._load, kwargs={"release": True},
+                             name="dealer-snapshot", daemon=True).start()
+
+    def _load(self, release=False):
+        try:
+            dealers = self.load()
+            if isinstance(dealers, list):
+                self.snapshot = DealerSnapshot(dealers)
+                self.failing = False
+            else:
+                self.failing = True
+                logger.warning("Dealer snapshot refresh failed; serving the previous snapshot")
+        except Exception:
+            self.failing = True
+            logger.exception("Dealer snapshot refresh raised")
+        finally:
+            if release:
+                self._refreshing.release()
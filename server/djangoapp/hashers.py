@@ -0,0 +1,29 @@
+# server/djangoapp/hashers.py
+
+from django.conf import settings
+from django.contrib.auth import hashers
+
+
+class PBKDF2PasswordHasher(hashers.PBKDF2PasswordHasher):
+    """
+    Django's PBKDF2-SHA256 hasher with its work factor taken from
+    settings.PASSWORD_HASH_ITERATIONS, for non-production environments (load
+    tests, CI) where every login would otherwise burn hundreds of milliseconds
+    of CPU. The override only applies while settings.DEBUG is on; otherwise, or
+    when it is unset or 0, Django's default count is used.
+
+    Hashes keep the "pbkdf2_sha256" format and record their own iteration
+    count, so they stay valid under Django's stock hasher and vice versa. A
+    successful login re-encodes a hash made with fewer iterations than the
+    current count, never one made with more, so a lowered count can't weaken
+    passwords that were already stored.
+    """
+
+    @property
+    def iterations(self):
+        if settings.DEBUG and getattr(settings, "PASSWORD_HASH_ITERATIONS", 0):
+            return settings.PASSWORD_HASH_ITERATIONS
+        return hashers.PBKDF2PasswordHasher.iterations
+
+    def must_update(self, encoded):
+        return self.decode(encoded)["iterations"] < self.iterations
@@ -0,0 +1,238 @@
+# server/djangoapp/http_cache.py
+
+import hashlib
+import json
+import threading
+import time
+
+from django.conf import settings
+from django.core.cache import cache
+from django.core.serializers.json import DjangoJSONEncoder
+from django.db import transaction
+from django.db.models import F
+from django.http import HttpResponse, HttpResponseNotModified
+from django.utils.http import parse_etags
+
+from .models import CacheGeneration
+from .timing import timed
+
+
+def serialize(payload):
+    """
+    Encodes a payload exactly the way JsonResponse would, returning bytes.
+    """
+    with timed("serialize"):
+        return json.dumps(payload, cls=DjangoJSONEncoder).encode("utf-8")
+
+
+def splice_envelope(field, raw):
+    """
+    Wraps already-encoded JSON bytes in the {"status": 200, "<field>": ...} envelope
+    without decoding them. raw=None gives the same null the view would send.
+    """
+    return b'{"status": 200, "' + field.encode() + b'": ' + (raw.strip() if raw else b"null") + b"}"
+
+
+def strong_etag(body):
+    """
+    Returns a strong ETag (quoted SHA-256 of the body bytes).
+    """
+    return '"%s"' % hashlib.sha256(body).hexdigest()
+
+
+def mark_stale(body):
+    """
+    Adds "stale": true to an encoded JSON object envelope.
+    """
+    return b'{"stale": true, ' + body[1:] if body.startswith(b"{") and body != b"{}" else body
+
+
+def stale_entry(body):
+    """
+    Returns (body, etag) for the stale-marked variant of a cached body.
+    """
+    body = mark_stale(body)
+    return body, strong_etag(body)
+
+
+def cached_json(key, build, ttl=None, keep_stale=False):
+    """
+    Returns (body, etag, stale) for a cache key, calling build() on a miss.
+    build() returns (payload, cacheable), where payload is a dict to serialize or
+    already-encoded JSON bytes; payloads built from a failed upstream call are not
+    cacheable, so the next request retries.
+    With keep_stale, every cacheable entry is also kept for settings.STALE_TTL
+    under "stale:<key>"; when build() fails that copy is returned, marked stale.
+    """
+    ttl = settings.DEALER_CACHE_TTL if ttl is None else ttl
+    entry = cache.get(key) if ttl > 0 else None
+    if entry is not None:
+        return entry + (False,)
+
+    payload, cacheable = build()
+    body = payload if isinstance(payload, bytes) else serialize(payload)
+    entry = (body, strong_etag(body))
+    if cacheable and ttl > 0:
+        cache.set(key, entry, ttl)
+    if keep_stale:
+        if cacheable:
+            cache.set("stale:" + key, entry, settings.STALE_TTL)
+        else:
+            last_good = cache.get("stale:" + key)
+            if last_good is not None:
+                return stale_entry(last_good[0]) + (True,)
+    return entry + (False,)
+
+
+async def cached_json_async(key, build, ttl=None, keep_stale=False):
+    """
+    Async counterpart of cached_json(); build is a coroutine function.
+    """
+    ttl = settings.DEALER_CACHE_TTL if ttl is None else ttl
+    entry = await cache.aget(key) if ttl > 0 else None
+    if entry is not None:
+        return entry + (False,)
+
+    payload, cacheable = await build()
+    body = payload if isinstance(payload, bytes) else serialize(payload)
+    entry = (body, strong_etag(body))
+    if cacheable and ttl > 0:
+        await cache.aset(key, entry, ttl)
+    if keep_stale:
+        if cacheable:
+            await cache.aset("stale:" + key, entry, settings.STALE_TTL)
+        else:
+            last_good = await cache.aget("stale:" + key)
+            if last_good is not None:
+                return stale_entry(last_good[0]) + (True,)
+    return entry + (False,)
+
+
+class Uncached(Exception):
+    """
+    Raised by a build() callable to hand back a response that must not be cached,
+    such as a StreamingHttpResponse relaying a large upstream body.
+    """
+
+    def __init__(self, response):
+        super().__init__(response)
+        self.response = response
+
+
+def cached_response(request, key, build, ttl=None, keep_stale=False):
+    """
+    Serves a cached JSON payload: cached_json() followed by etag_response().
+    build() may raise Uncached(response) to bypass the cache for this request.
+    """
+    try:
+        body, etag, stale = cached_json(key, build, ttl, keep_stale)
+    except Uncached as bypass:
+        return bypass.response
+    return etag_response(request, body, etag, stale)
+
+
+async def cached_response_async(request, key, build, ttl=None, keep_stale=False):
+    """
+    Async counterpart of cached_response().
+    """
+    body, etag, stale = await cached_json_async(key, build, ttl, keep_stale)
+    return etag_response(request, body, etag, stale)
+
+
+def etag_matches(request, etag):
+    """
+    True when the request's If-None-Match header matches the ETag
+    (weak comparison, as RFC 9110 specifies for If-None-Match).
+    """
+    header = request.headers.get("If-None-Match")
+    if not header:
+        return False
+    candidates = parse_etags(header)
+    if "*" in candidates:
+        return True
+    return any(candidate.removeprefix("W/") == etag for candidate in candidates)
+
+
+def etag_response(request, body, etag, stale=False):
+    """
+    Builds the JSON response for a cached body: a bodiless 304 when the client
+    already holds this version, otherwise a 200 carrying the bytes and the ETag.
+    Stale bodies (served while the upstream is down) also get a Warning header.
+    """
+    if etag_matches(request, etag):
+        response = HttpResponseNotModified()
+    else:
+        response = HttpResponse(body, content_type="application/json")
+    response["ETag"] = etag
+    # Clients may keep the body but must revalidate it on every use
+    response["Cache-Control"] = "no-cache"
+    if stale:
+        mark_stale_response(response)
+    return response
+
+
+def mark_stale_response(response):
+    response["Warning"] = '110 - "Response is Stale"'
+    return response
+
+
+# --- Car catalogue (get_cars) ---
+# Every cached get_cars page is keyed under the current catalogue generation, so
+# bumping it invalidates all filter/page variants at once. The generation lives
+# in the database rather than the cache: with a per-process cache (locmem) a
+# cache-held token would only be replaced in the process that made the change.
+# Each process remembers the value it read for CATALOGUE_GENERATION_TTL seconds,
+# so a cache hit does no database work.
+CATALOGUE_GENERATION = "get_cars"
+
+_generation_lock = threading.Lock()
+_generation = (None, 0.0)  # (value, monotonic time it was read)
+
+
+def catalogue_generation():
+    """
+    Returns the current catalogue generation, read from the database at most once
+    per CATALOGUE_GENERATION_TTL seconds per process.
+    """
+    global _generation
+    value, read_at = _generation
+    if value is not None and time.monotonic() - read_at < settings.CATALOGUE_GENERATION_TTL:
+        return value
+    read_at = time.monotonic()
+    value = CacheGeneration.objects.filter(name=CATALOGUE_GENERATION).values_list("value", flat=True).first() or 0
+    with _generation_lock:
+        # Keep a fresher read made by another thread meanwhile
+        if _generation[1] <= read_at:
+            _generation = (value, read_at)
+    return value
+
+
+def forget_catalogue_generation():
+    """
+    Makes the next catalogue_generation() call in this process read the database.
+    """
+    global _generation
+    with _generation_lock:
+        # Stamped with the current time so a read that started earlier is not kept
+        _generation = (None, time.monotonic())
+
+
+def catalogue_cache_key(variant):
+    """
+    Returns the cache key for one get_cars page variant under the current generation.
+    """
+    return f"get_cars:{catalogue_generation()}:{variant}"
+
+
+def invalidate_catalogue():
+    """
+    Drops every pre-serialized get_cars page, in all processes. Called from the
+    CarMake/CarModel post_save/post_delete signals (djangoapp/signals.py) and
+    after bulk loads, which bypass signals. Inside a transaction the bump commits
+    (or rolls back) with the change that caused it; this process stops using its
+    remembered generation once it commits, the others within CATALOGUE_GENERATION_TTL.
+    """
+    with transaction.atomic():
+        CacheGeneration.objects.bulk_create([CacheGeneration(name=CATALOGUE_GENERATION)], ignore_conflicts=True)
+        CacheGeneration.objects.filter(name=CATALOGUE_GENERATION).update(value=F("value") + 1)
+        transaction.on_commit(forget_catalogue_generation)
@@ -0,0 +1,338 @@
+# server/djangoapp/inventory.py
+
+import heapq
+import logging
+import os
+import threading
+import time
+from bisect import bisect_left, bisect_right
+
+from .catalogue import CatalogueQueryError, decode_cursor, encode_cursor
+from .jsonstream import iter_json_array
+
+logger = logging.getLogger(__name__)
+
+# Page sizes for the inventory search: default and hard cap
+DEFAULT_PAGE_SIZE = 50
+MAX_PAGE_SIZE = 1000
+
+# Exact-match filters: query parameter -> record field (strings match case-insensitively)
+EQUALITY_FILTERS = {"dealer_id": "dealer_id", "make": "make", "model": "model", "body_type": "bodyType"}
+# Range filters: record field, bounded by <field>_min / <field>_max
+RANGE_FIELDS = ("year", "mileage")
+# ?sort= values; ties keep the order of the source file
+ORDERINGS = ("year", "-year", "mileage", "-mileage", "make", "-make")
+DEFAULT_ORDERING = "-year"
+
+# Record fields in output order (as in car_records.json), and the integer ones
+FIELDS = ("make", "model", "bodyType", "year", "dealer_id", "mileage")
+INT_FIELDS = ("dealer_id", "year", "mileage")
+
+
+class InventoryQueryError(ValueError):
+    """
+    Raised for malformed inventory query parameters.
+    """
+
+
+def _key(value):
+    return value.casefold() if isinstance(value, str) else value
+
+
+def _int_param(params, name, minimum=None, maximum=None):
+    value = params.get(name)
+    if value in (None, ""):
+        return None
+    try:
+        value = int(value)
+    except ValueError:
+        raise InventoryQueryError(f"{name} must be an integer")
+    if minimum is not None and value < minimum:
+        raise InventoryQueryError(f"{name} must be at least {minimum}")
+    if maximum is not None and value > maximum:
+        raise InventoryQueryError(f"{name} must be at most {maximum}")
+    return value
+
+
+def parse_query(params):
+    """
+    Validates inventory query parameters (a QueryDict or dict) into a dict with
+    "equal" ({field: value}), "ranges" ({field: (low, high)}, either end None),
+    "sort", "limit" and "after" (the sort rank decoded from cursor).
+    Raises InventoryQueryError on bad input.
+    """
+    equal = {}
+    for param, field in EQUALITY_FILTERS.items():
+        if field in INT_FIELDS:
+            value = _int_param(params, param)
+        else:
+            value = params.get(param) or None
+        if value is not None:
+            equal[field] = _key(value)
+
+    ranges = {}
+    for field in RANGE_FIELDS:
+        low, high = _int_param(params, f"{field}_min"), _int_param(params, f"{field}_max")
+        if low is not None or high is not None:
+            ranges[field] = (low, high)
+
+    sort = params.get("sort") or DEFAULT_ORDERING
+    if sort not in ORDERINGS:
+        raise InventoryQueryError(f"sort must be one of {', '.join(ORDERINGS)}")
+    cursor = params.get("cursor")
+    try:
+        after = decode_cursor(cursor) if cursor else None
+    except CatalogueQueryError as e:
+        raise InventoryQueryError(str(e))
+    return {
+        "equal": equal,
+        "ranges": ranges,
+        "sort": sort,
+        "limit": _int_param(params, "limit", minimum=1, maximum=MAX_PAGE_SIZE) or DEFAULT_PAGE_SIZE,
+        "after": after,
+    }
+
+
+class InventoryIndex:
+    """
+    Immutable in-memory index over inventory records (make, model, bodyType, year,
+    mileage, dealer_id). Rows are numbered in source order.
+
+    - Exact-match fields map each value to the ascending list of its rows, and to
+      the same rows as a bitmap (an int with bit `row` set).
+    - Range fields keep their values sorted next to the rows they belong to, so
+      the rows inside [low, high] are one contiguous slice found with bisect.
+      Bitmaps of every block-aligned prefix of that slice turn a range into a
+      bitmap with two lookups plus the few rows at its ragged ends.
+    - Each ordering is precomputed as the list of rows in that order.
+
+    Selective searches scan the smallest matching row list and filter it. When
+    every filter matches a large share of the rows, the filters' bitmaps are
+    ANDed instead (which also counts the matches) and the page is read off the
+    ordering from the cursor on, so broad queries cost about as much as narrow
+    ones even at hundreds of thousands of records.
+    Pages are keyset-paginated on the position in the ordering.
+    """
+    # Prefix bitmaps per range field (memory: blocks * rows / 8 bytes per field)
+    RANGE_BLOCKS = 64
+    # Use bitmaps once the smallest candidate list exceeds rows / SCAN_FRACTION
+    SCAN_FRACTION = 16
+
+    def __init__(self, records):
+        self.records = []
+        for record in records:
+            try:
+                row = {field: int(record[field]) if field in INT_FIELDS else str(record[field])
+                       for field in FIELDS}
+            except (KeyError, TypeError, ValueError):
+                continue  # Incomplete records can't be filtered consistently
+            self.records.append(row)
+        count = len(self.records)
+        self.bitmap_bytes = (count + 7) // 8
+        self.block = max(1, -(-count // self.RANGE_BLOCKS))
+
+        # Column of comparable keys per filtered field
+        self.columns = {field: [_key(row[field]) for row in self.records]
+                        for field in set(EQUALITY_FILTERS.values()) | set(RANGE_FIELDS)}
+
+        self.postings = {}
+        self.masks = {}
+        for field in EQUALITY_FILTERS.values():
+            postings = self.postings[field] = {}
+            for row, value in enumerate(self.columns[field]):
+                postings.setdefault(value, []).append(row)
+            self.masks[field] = {value: self._bitmap(rows) for value, rows in postings.items()}
+
+        self.sorted_ranges = {}
+        self.prefix_masks = {}
+        for field in RANGE_FIELDS:
+            column = self.columns[field]
+            rows = sorted(range(count), key=column.__getitem__)
+            self.sorted_ranges[field] = ([column[row] for row in rows], rows)
+            # prefix_masks[field][j] holds the rows at sorted positions [0, j * block)
+            bitmap = bytearray(self.bitmap_bytes)
+            prefixes = [0]
+            for position, row in enumerate(rows, 1):
+                bitmap[row >> 3] |= 1 << (row & 7)
+                if position % self.block == 0 or position == count:
+                    prefixes.append(int.from_bytes(bitmap, "little"))
+            self.prefix_masks[field] = prefixes
+
+        # sorted() stays stable with reverse=True, so ties keep source order both ways
+        self.orders = {ordering: sorted(range(count), key=self.columns[ordering.lstrip("-")].__getitem__,
+                                        reverse=ordering.startswith("-"))
+                       for ordering in ORDERINGS}
+        self.ranks = {}
+        for ordering, order in self.orders.items():
+            rank = self.ranks[ordering] = [0] * count
+            for position, row in enumerate(order):
+                rank[row] = position
+
+    def __len__(self):
+        return len(self.records)
+
+    def _bitmap(self, rows):
+        bitmap = bytearray(self.bitmap_bytes)
+        for row in rows:
+            bitmap[row >> 3] |= 1 << (row & 7)
+        return int.from_bytes(bitmap, "little")
+
+    def _range_slice(self, field, low, high):
+        values, rows = self.sorted_ranges[field]
+        start = bisect_left(values, low) if low is not None else 0
+        end = bisect_right(values, high) if high is not None else len(values)
+        return rows, start, max(start, end)
+
+    def _range_mask(self, field, start, end):
+        rows = self.sorted_ranges[field][1]
+        first_block, last_block = -(-start // self.block), end // self.block
+        if first_block >= last_block:
+            return self._bitmap(rows[start:end])
+        prefixes = self.prefix_masks[field]
+        return (prefixes[last_block] ^ prefixes[first_block]) | self._bitmap(
+            rows[start:first_block * self.block] + rows[last_block * self.block:end])
+
+    def search(self, query):
+        """
+        Returns (count, records, next_after): the number of records matching the
+        query's filters, the page after query["after"], and the position to pass
+        as the next cursor (None on the last page).
+        """
+        equal, ranges = query["equal"], query["ranges"]
+        limit, after = query["limit"], query["after"]
+        order = self.orders[query["sort"]]
+        start = after + 1 if after is not None else 0
+        if not equal and not ranges:
+            return self._page(len(order), range(start, min(start + limit + 1, len(order))), limit, order)
+
+        candidates = []
+        for field, value in equal.items():
+            rows = self.postings[field].get(value, [])
+            candidates.append((len(rows), field, rows, 0, len(rows)))
+        for field, (low, high) in ranges.items():
+            rows, first, end = self._range_slice(field, low, high)
+            candidates.append((end - first, field, rows, first, end))
+        smallest = min(candidates, key=lambda candidate: candidate[0])
+        if smallest[0] * self.SCAN_FRACTION <= len(order):
+            return self._scan(smallest, equal, ranges, limit, after, query["sort"])
+
+        # Broad filters: AND their bitmaps, count the bits and walk the ordering
+        mask = -1
+        for size, field, rows, first, end in candidates:
+            mask &= self.masks[field][equal[field]] if field in equal else self._range_mask(field, first, end)
+        count = mask.bit_count()
+        bitmap = mask.to_bytes(self.bitmap_bytes, "little")
+        if (limit + 1) * len(order) > count * smallest[0]:
+            # Matches too sparse for the walk below to find a page quickly
+            # (expected steps: limit * rows / count); collect them instead
+            _, _, rows, first, end = smallest
+            rank = self.ranks[query["sort"]]
+            positions = [rank[row] for row in rows[first:end] if bitmap[row >> 3] >> (row & 7) & 1]
+            if after is not None:
+                positions = [position for position in positions if position > after]
+            return self._page(count, heapq.nsmallest(limit + 1, positions), limit, order)
+        page = []
+        for position in range(start, len(order)):
+            if len(page) > limit:
+                break
+            row = order[position]
+            if bitmap[row >> 3] >> (row & 7) & 1:
+                page.append(position)
+        return self._page(count, page, limit, order)
+
+    def _scan(self, driver, equal, ranges, limit, after, sort):
+        _, driver_field, rows, start, end = driver
+        matches = rows[start:end]
+        # One pass per remaining filter, each a flat comprehension over the survivors
+        for field, value in equal.items():
+            if field != driver_field:
+                column = self.columns[field]
+                matches = [row for row in matches if column[row] == value]
+        for field, (low, high) in ranges.items():
+            if field != driver_field:
+                column = self.columns[field]
+                if low is not None:
+                    matches = [row for row in matches if column[row] >= low]
+                if high is not None:
+                    matches = [row for row in matches if column[row] <= high]
+
+        # Select the page on plain int positions (no key function)
+        rank = self.ranks[sort]
+        positions = [rank[row] for row in matches]
+        if after is not None:
+            positions = [position for position in positions if position > after]
+        return self._page(len(matches), heapq.nsmallest(limit + 1, positions), limit, self.orders[sort])
+
+    def _page(self, count, positions, limit, order):
+        positions = list(positions)
+        has_more = len(positions) > limit
+        positions = positions[:limit]
+        next_after = positions[-1] if has_more and positions else None
+        return count, [self.records[order[position]] for position in positions], next_after
+
+
+def search_payload(index, query):
+    """
+    Runs one search and returns the {"count", "cars", "next_cursor"} payload.
+    """
+    count, cars, next_after = index.search(query)
+    return {
+        "count": count,
+        "cars": cars,
+        "next_cursor": encode_cursor(next_after) if next_after is not None else None,
+    }
+
+
+def load_inventory(path):
+    """
+    Reads inventory records from a {"cars": [...]} JSON file (or a bare array),
+    one element at a time.
+    """
+    with open(path, encoding="utf-8") as f:
+        head = f.read(1)
+        while head.isspace():
+            head = f.read(1)
+        f.seek(0)
+        return list(iter_json_array(f, key=None if head == "[" else "cars"))
+
+
+class InventoryStore:
+    """
+    Lazily builds the InventoryIndex for a JSON file and rebuilds it when the
+    file's modification time changes (checked at most every check_interval
+    seconds). A failed rebuild keeps the previous index serving.
+    """
+
+    def __init__(self, path, check_interval=5):
+        self.path = path
+        self.check_interval = check_interval
+        self.index = None
+        self.mtime = None
+        self.checked_at = None
+        self._lock = threading.Lock()
+
+    def get(self):
+        """
+        Returns the current index, or None when the file can't be loaded.
+        """
+        now = time.monotonic()
+        if self.index is not None and now - self.checked_at < self.check_interval:
+            return self.index
+        with self._lock:
+            if self.index is None or now - self.checked_at >= self.check_interval:
+                self.checked_at = now
+                self._refresh()
+        return self.index
+
+    def _refresh(self):
+        try:
+            mtime = os.stat(self.path).st_mtime_ns
+            if mtime == self.mtime and self.index is not None:
+                return
+            index = InventoryIndex(load_inventory(self.path))
+        except (OSError, ValueError):
+            logger.exception("Could not load the inventory from %s", self.path)
+            return
+        self.index = index
+        self.mtime = mtime
+        logger.info("Indexed %d inventory records from %s", len(index), self.path)
@@ -0,0 +1,108 @@
+# server/djangoapp/jsonstream.py
+
+import json
+
+_decoder = json.JSONDecoder()
+_WHITESPACE = " \t\r\n"
+
+
+def iter_json_array(fp, key=None, chunk_size=65536):
+    """
+    Yields the elements of a JSON array one at a time without loading the whole
+    document. fp is a text file object holding either a top-level array or an
+    object whose `key` member is the array (e.g. {"cars": [...]}); the first
+    occurrence of "key" in the document is taken to be that member.
+    Only one element (plus one read chunk) is held in memory at a time.
+    """
+    buffer = ""
+    eof = False
+
+    def fill():
+        nonlocal buffer, eof
+        data = fp.read(chunk_size)
+        if isinstance(data, bytes):
+            data = data.decode("utf-8")
+        if not data:
+            eof = True
+        buffer += data
+
+    # 1. Find the opening '[' of the array
+    marker = None if key is None else json.dumps(key)
+    while True:
+        if marker is not None:
+            position = buffer.find(marker)
+            if position >= 0:
+                buffer = buffer[position + len(marker):]
+                marker = None
+                continue
+        else:
+            stripped = buffer.lstrip(_WHITESPACE + ":")
+            if stripped:
+                if stripped[0] != "[":
+                    raise ValueError("Expected a JSON array")
+                buffer = stripped[1:]
+                break
+            buffer = stripped
+        if eof:
+            raise ValueError("No JSON array found" if key is None else f"No {key!r} array found")
+        if marker is not None:
+            # Keep a tail in case the marker straddles two chunks
+            buffer = buffer[-len(marker):]
+        fill()
+
+    # 2. Decode one element at a time
+    expect_value = True
+    after_comma = False
+    while True:
+        buffer = buffer.lstrip(_WHITESPACE)
+        if not buffer:
+            if eof:
+                raise ValueError("Unterminated JSON array")
+            fill()
+            continue
+        if buffer[0] == "]":
+            if after_comma:
+                raise ValueError("Trailing ',' in JSON array")
+            return
+        if buffer[0] == ",":
+            if expect_value:
+                raise ValueError("Unexpected ',' in JSON array")
+            buffer = buffer[1:]
+            expect_value = after_comma = True
+            continue
+        if not expect_value:
+            raise ValueError("Expected ',' or ']' in JSON array")
+        try:
+            value, end = _decoder.raw_decode(buffer)
+        except json.JSONDecodeError:
+            # The element may be cut off at the end of the buffer; read more
+            if eof:
+                raise
+            fill()
+            continue
+        if end == len(buffer) and not eof:
+            # A number at the very end of the buffer might continue in the next chunk
+            fill()
+            continue
+        if end < len(buffer) and buffer[0] not in '{["' and buffer[end] not in _WHITESPACE + ",]":
+            # A scalar ends only at a delimiter: "2." or "1e" may be a number cut
+            # off at the end of a chunk, so decode it again with more input
+            if eof:
+                raise ValueError(f"Unexpected {buffer[end]!r} in JSON array")
+            fill()
+            continue
+        buffer = buffer[end:]
+        expect_value = after_comma = False
+        yield value
+
+
+def iter_ndjson(fp):
+    """
+    Yields one decoded value per non-blank line of newline-delimited JSON.
+    """
+    for line in fp:
+        if isinstance(line, bytes):
+            line = line.decode("utf-8")
+        line = line.strip()
+        if line:
+            yield json.loads(line)
@@ -0,0 +1,56 @@
+# server/djangoapp/management/commands/backfill_review_sentiment.py
+
+import json
+from pathlib import Path
+
+from django.conf import settings
+from django.core.management.base import BaseCommand, CommandError
+
+from djangoapp.restapis import enrich_reviews_sentiment, has_stored_sentiment
+
+
+class Command(BaseCommand):
+    """
+    Scores every review in the backend's seed file (database/data/reviews.json) and
+    writes the sentiment back into each record, so the Express backend loads reviews
+    that are already scored and the read path never calls the analyzer for them.
+    """
+    help = "Backfill the sentiment field of the reviews in database/data/reviews.json"
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--path",
+            default=str(Path(settings.BASE_DIR) / "database" / "data" / "reviews.json"),
+            help="Reviews JSON file ({\"reviews\": [...]}) to backfill in place",
+        )
+        parser.add_argument(
+            "--force", action="store_true",
+            help="Re-score reviews that already have a sentiment",
+        )
+        parser.add_argument(
+            "--dry-run", action="store_true",
+            help="Score the reviews but don't write the file",
+        )
+
+    def handle(self, *args, **options):
+        path = Path(options["path"])
+        try:
+            with open(path) as f:
+                document = json.load(f)
+        except (OSError, json.JSONDecodeError) as e:
+            raise CommandError(f"Could not read {path}: {e}")
+
+        reviews = document.get("reviews") if isinstance(document, dict) else None
+        if not isinstance(reviews, list):
+            raise CommandError(f"{path} has no \"reviews\" list")
+
+        scored = enrich_reviews_sentiment(reviews, force=options["force"])
+        failed = sum(1 for review in reviews if not has_stored_sentiment(review))
+        self.stdout.write(f"Scored {scored} of {len(reviews)} reviews ({failed} could not be scored)")
+
+        if options["dry_run"] or not scored:
+            return
+        with open(path, "w") as f:
+            json.dump(document, f, indent=2)
+            f.write("\n")
+        self.stdout.write(self.style.SUCCESS(f"Wrote {path}"))
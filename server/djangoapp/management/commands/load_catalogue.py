@@ -0,0 +1,79 @@
+# server/djangoapp/management/commands/load_catalogue.py
+
+import csv
+import time
+from pathlib import Path
+
+from django.core.management.base import BaseCommand, CommandError
+
+from djangoapp.jsonstream import iter_json_array, iter_ndjson
+from djangoapp.populate import initiate, load_catalogue
+
+
+class Command(BaseCommand):
+    """
+    Bulk-loads a car catalogue (CarMake + CarModel rows) from a JSON, NDJSON or CSV
+    file, streaming the input and inserting it in chunked transactions. Safe to
+    re-run: rows already in the database are skipped.
+
+        python manage.py load_catalogue database/data/car_records.json
+        python manage.py load_catalogue models.csv --chunk-size 5000
+        python manage.py load_catalogue --seed
+    """
+    help = "Bulk-load a car catalogue from a JSON/NDJSON/CSV file (or the sample data with --seed)"
+
+    def add_arguments(self, parser):
+        parser.add_argument("path", nargs="?", help="Catalogue file to load")
+        parser.add_argument(
+            "--format", choices=["json", "ndjson", "csv"],
+            help="Input format (default: guessed from the file extension)",
+        )
+        parser.add_argument(
+            "--key", default="cars",
+            help="Member holding the record array in a JSON object (default: cars); "
+                 "a top-level array is used when the file starts with '['",
+        )
+        parser.add_argument("--chunk-size", type=int, default=1000, help="Records per transaction")
+        parser.add_argument("--seed", action="store_true", help="Load the built-in sample catalogue")
+
+    def handle(self, *args, **options):
+        started = time.monotonic()
+        if options["seed"]:
+            stats = initiate()
+        elif options["path"]:
+            stats = self.load_file(Path(options["path"]), options)
+        else:
+            raise CommandError("Give a catalogue file path or --seed")
+
+        elapsed = time.monotonic() - started
+        self.stdout.write(self.style.SUCCESS(
+            f"Created {stats['makes_created']} makes and {stats['models_created']} models; "
+            f"skipped {stats['models_skipped']} existing and {stats['invalid']} invalid records "
+            f"in {elapsed:.2f}s"
+        ))
+
+    def load_file(self, path, options):
+        file_format = options["format"] or path.suffix.lstrip(".").lower()
+        if file_format == "jsonl":
+            file_format = "ndjson"
+        if file_format not in ("json", "ndjson", "csv"):
+            raise CommandError(f"Can't tell the format of {path}; pass --format")
+
+        try:
+            with open(path, newline="" if file_format == "csv" else None, encoding="utf-8") as f:
+                if file_format == "csv":
+                    records = csv.DictReader(f)
+                elif file_format == "ndjson":
+                    records = iter_ndjson(f)
+                else:
+                    # A top-level array needs no key; otherwise look for options["key"]
+                    head = f.read(1)
+                    while head and head.isspace():
+                        head = f.read(1)
+                    f.seek(0)
+                    records = iter_json_array(f, key=None if head == "[" else options["key"])
+                return load_catalogue(records, chunk_size=options["chunk_size"])
+        except OSError as e:
+            raise CommandError(f"Could not read {path}: {e}")
+        except ValueError as e:
+            raise CommandError(f"Malformed input in {path}: {e}")
@@ -0,0 +1,38 @@
+# server/djangoapp/management/commands/rebuild_sentiment_summary.py
+
+from django.core.management.base import BaseCommand, CommandError
+from django.utils import timezone
+
+from djangoapp.restapis import enrich_reviews_sentiment, get_request
+from djangoapp.sentiment_summary import rebuild_summaries
+
+
+class Command(BaseCommand):
+    """
+    Recomputes every DealerSentimentSummary from the backend's full review list,
+    e.g. after reviews were written without going through djangoapp or to
+    recover from a failed incremental update.
+    """
+    help = "Rebuild the per-dealer sentiment summaries from the backend's reviews"
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--no-score", action="store_true",
+            help="Don't score reviews without a stored sentiment (they count as unscored)",
+        )
+
+    def handle(self, *args, **options):
+        fetched_at = timezone.now()
+        reviews = get_request("/fetchReviews")
+        if not isinstance(reviews, list):
+            raise CommandError("Could not fetch the reviews from the backend")
+
+        if not options["no_score"]:
+            scored = enrich_reviews_sentiment(reviews)
+            self.stdout.write(f"Scored {scored} of {len(reviews)} reviews")
+
+        dealers, skipped = rebuild_summaries(reviews, fetched_at)
+        self.stdout.write(self.style.SUCCESS(f"Summarized {len(reviews)} reviews for {dealers} dealers"))
+        if skipped:
+            self.stdout.write(self.style.WARNING(
+                f"Left {skipped} dealers alone: their summaries changed during the rebuild; run it again to include them"))
@@ -1,9 +1,15 @@
-from flask import Flask
-from nltk.sentiment import SentimentIntensityAnalyzer
+from flask import Flask, request, jsonify
 import json
+import os
+from engine import BatchScorer, classify
 app = Flask("Sentiment Analyzer")
 
-sia = SentimentIntensityAnalyzer()
+# Scores the same as nltk's SentimentIntensityAnalyzer, but batches in one pass
+scorer = BatchScorer()
+
+# Upper bound on the number of texts accepted by one /analyze_batch call; batches
+# above engine.PARALLEL_THRESHOLD are scored across a process pool
+MAX_BATCH_SIZE = int(os.getenv("SENTIMENT_MAX_BATCH_SIZE", "10000"))
 
 
 @app.get('/')
@@ -15,20 +21,23 @@ def home():
 @app.get('/analyze/<input_txt>')
 def analyze_sentiment(input_txt):
 
-    scores = sia.polarity_scores(input_txt)
-    print(scores)
-    pos = float(scores['pos'])
-    neg = float(scores['neg'])
-    neu = float(scores['neu'])
-    res = "positive"
-    print("pos neg nue ", pos, neg, neu)
-    if (neg > pos and neg > neu):
-        res = "negative"
-    elif (neu > neg and neu > pos):
-        res = "neutral"
-    res = json.dumps({"sentiment": res})
-    print(res)
-    return res
+    scores = scorer.polarity_scores(input_txt)
+    return json.dumps({"sentiment": classify(scores)})
+
+
+@app.post('/analyze_batch')
+def analyze_sentiment_batch():
+    # Body is a JSON array of texts; the reply keeps the same order
+    texts = request.get_json(silent=True)
+    if not isinstance(texts, list):
+        return jsonify({"error": "Expected a JSON array of texts"}), 400
+    if len(texts) > MAX_BATCH_SIZE:
+        return jsonify({"error": f"Batch exceeds {MAX_BATCH_SIZE} texts"}), 413
+
+    texts = [str(text) if text is not None else "" for text in texts]
+    results = [{"sentiment": classify(scores), "scores": scores}
+               for scores in scorer.score_batch(texts)]
+    return jsonify(results)
 
 
 if __name__ == "__main__":
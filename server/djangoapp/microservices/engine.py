@@ -0,0 +1,451 @@
+"""
+Batch VADER scoring engine for the Sentiment Analyzer.
+
+Produces the same scores as nltk's SentimentIntensityAnalyzer.polarity_scores,
+but is built for scoring many texts at once:
+
+  * the lexicon and the rule word lists are compiled once into plain dicts and
+    frozensets, so each token costs a couple of hash lookups;
+  * each text is tokenized and turned into per-token valences in one pass, and
+    the valences of the whole batch are sifted, summed and normalized together
+    with NumPy arrays over one flat valence array;
+  * batches above PARALLEL_THRESHOLD texts are split across a process pool.
+
+Precompile the lexicon (done in the Dockerfile) with:
+
+    python engine.py --compile
+
+Check it against nltk on a corpus (one text per line) with:
+
+    python engine.py --verify reference_corpus.txt
+"""
+import marshal
+import math
+import os
+import re
+import string
+import sys
+import zipfile
+from concurrent.futures import ProcessPoolExecutor
+
+import numpy as np
+
+HERE = os.path.dirname(os.path.abspath(__file__))
+LEXICON_ZIP = os.path.join(HERE, "sentiment", "vader_lexicon.zip")
+LEXICON_MEMBER = "vader_lexicon/vader_lexicon.txt"
+# Precompiled lexicon written by `python engine.py --compile` (e.g. at image build
+# time); marshal output is tied to the Python version, so that is stored with it
+COMPILED_LEXICON = os.path.join(HERE, "sentiment", "vader_lexicon.marshal")
+COMPILED_FORMAT = 1
+
+# Batches with at least this many texts are spread across worker processes
+PARALLEL_THRESHOLD = int(os.getenv("SENTIMENT_PARALLEL_THRESHOLD", "2000"))
+PARALLEL_WORKERS = int(os.getenv("SENTIMENT_PARALLEL_WORKERS", str(os.cpu_count() or 1)))
+
+# --- VADER constants (as in nltk.sentiment.vader.VaderConstants) ---
+B_INCR = 0.293
+B_DECR = -0.293
+C_INCR = 0.733
+N_SCALAR = -0.74
+
+NEGATE = frozenset("""
+aint arent cannot cant couldnt darent didnt doesnt ain't aren't can't couldn't
+daren't didn't doesn't dont hadnt hasnt havent isnt mightnt mustnt neither
+don't hadn't hasn't haven't isn't mightn't mustn't neednt needn't never none
+nope nor not nothing nowhere oughtnt shant shouldnt uhuh wasnt werent oughtn't
+shan't shouldn't uh-uh wasn't weren't without wont wouldnt won't wouldn't
+rarely seldom despite
+""".split())
+
+BOOSTER_DICT = {word: B_INCR for word in """
+absolutely amazingly awfully completely considerably decidedly deeply effing
+enormously entirely especially exceptionally extremely fabulously flipping
+flippin fricking frickin frigging friggin fully fucking greatly hella highly
+hugely incredibly intensely majorly more most particularly purely quite really
+remarkably so substantially thoroughly totally tremendously uber unbelievably
+unusually utterly very
+""".split()}
+BOOSTER_DICT.update({word: B_DECR for word in [
+    "almost", "barely", "hardly", "just enough", "kind of", "kinda", "kindof",
+    "kind-of", "less", "little", "marginally", "occasionally", "partly", "scarcely",
+    "slightly", "somewhat", "sort of", "sorta", "sortof", "sort-of",
+]})
+
+SPECIAL_CASE_IDIOMS = {
+    "the shit": 3,
+    "the bomb": 3,
+    "bad ass": 1.5,
+    "yeah right": -2,
+    "cut the mustard": 2,
+    "kiss of death": -1.5,
+    "hand to mouth": -2,
+}
+
+PUNC_LIST = [".", "!", "?", ",", ";", ":", "-", "'", '"',
+             "!!", "!!!", "??", "???", "?!?", "!?!", "?!?!", "!?!?"]
+REGEX_REMOVE_PUNCTUATION = re.compile(f"[{re.escape(string.punctuation)}]")
+
+
+def load_lexicon(path=LEXICON_ZIP, compiled=COMPILED_LEXICON):
+    """
+    Returns the VADER lexicon (word -> mean valence). Uses the precompiled copy
+    when it is present and up to date, else parses the zip shipped in sentiment/.
+    """
+    lexicon = load_compiled_lexicon(path, compiled)
+    if lexicon is not None:
+        return lexicon
+    return parse_lexicon_zip(path)
+
+
+def parse_lexicon_zip(path=LEXICON_ZIP):
+    with zipfile.ZipFile(path) as archive:
+        text = archive.read(LEXICON_MEMBER).decode("utf-8")
+    lexicon = {}
+    for line in text.split("\n"):
+        fields = line.strip().split("\t")
+        if len(fields) >= 2:
+            lexicon[fields[0]] = float(fields[1])
+    return lexicon
+
+
+def _source_stamp(path):
+    stat = os.stat(path)
+    return (stat.st_size, int(stat.st_mtime))
+
+
+def compile_lexicon(path=LEXICON_ZIP, compiled=COMPILED_LEXICON):
+    """
+    Parses the lexicon zip and writes it out with marshal, which loads several
+    times faster than re-parsing the text. Returns the number of entries.
+    """
+    lexicon = parse_lexicon_zip(path)
+    header = (COMPILED_FORMAT, tuple(sys.version_info[:2]), _source_stamp(path))
+    tmp_path = compiled + ".tmp"
+    with open(tmp_path, "wb") as f:
+        marshal.dump((header, lexicon), f)
+    os.replace(tmp_path, compiled)
+    return len(lexicon)
+
+
+def load_compiled_lexicon(path=LEXICON_ZIP, compiled=COMPILED_LEXICON):
+    """
+    Returns the precompiled lexicon, or None when it is missing, was built by
+    another Python version, or predates the zip it was compiled from.
+    """
+    try:
+        with open(compiled, "rb") as f:
+            header, lexicon = marshal.loads(f.read())
+        expected = (COMPILED_FORMAT, tuple(sys.version_info[:2]), _source_stamp(path))
+    except (OSError, EOFError, ValueError, TypeError):
+        return None
+    return lexicon if header == expected else None
+
+
+# --- Per-text stage: tokens -> valences ---
+def tokenize(text):
+    """
+    Splits text into VADER tokens: whitespace-separated, single characters dropped,
+    and one leading or trailing PUNC_LIST mark stripped from words (emoticons kept).
+    """
+    words_only = {word for word in REGEX_REMOVE_PUNCTUATION.sub("", text).split() if len(word) > 1}
+    tokens = []
+    for token in text.split():
+        if len(token) <= 1:
+            continue
+        # nltk builds a {punc+word: word, word+punc: word} dict; probe it directly
+        stripped = None
+        for punc in PUNC_LIST:
+            if token.endswith(punc) and token[:-len(punc)] in words_only:
+                stripped = token[:-len(punc)]
+                break
+        if stripped is None:
+            for punc in PUNC_LIST:
+                if token.startswith(punc) and token[len(punc):] in words_only:
+                    stripped = token[len(punc):]
+                    break
+        tokens.append(stripped if stripped is not None else token)
+    return tokens
+
+
+def _negated(word):
+    word = word.lower()
+    return word in NEGATE or "n't" in word
+
+
+def _scalar_inc_dec(word, valence, is_cap_diff):
+    word_lower = word.lower()
+    scalar = BOOSTER_DICT.get(word_lower, 0.0)
+    if scalar:
+        if valence < 0:
+            scalar *= -1
+        if word.isupper() and is_cap_diff:
+            scalar += C_INCR if valence > 0 else -C_INCR
+    return scalar
+
+
+def _idioms(valence, words, i):
+    onezero = f"{words[i - 1]} {words[i]}"
+    twoonezero = f"{words[i - 2]} {words[i - 1]} {words[i]}"
+    twoone = f"{words[i - 2]} {words[i - 1]}"
+    threetwoone = f"{words[i - 3]} {words[i - 2]} {words[i - 1]}"
+    threetwo = f"{words[i - 3]} {words[i - 2]}"
+    for sequence in (onezero, twoonezero, twoone, threetwoone, threetwo):
+        if sequence in SPECIAL_CASE_IDIOMS:
+            valence = SPECIAL_CASE_IDIOMS[sequence]
+            break
+    if len(words) - 1 > i:
+        zeroone = f"{words[i]} {words[i + 1]}"
+        if zeroone in SPECIAL_CASE_IDIOMS:
+            valence = SPECIAL_CASE_IDIOMS[zeroone]
+    if len(words) - 1 > i + 1:
+        zeroonetwo = f"{words[i]} {words[i + 1]} {words[i + 2]}"
+        if zeroonetwo in SPECIAL_CASE_IDIOMS:
+            valence = SPECIAL_CASE_IDIOMS[zeroonetwo]
+    if threetwo in BOOSTER_DICT or twoone in BOOSTER_DICT:
+        valence = valence + B_DECR
+    return valence
+
+
+def _never(valence, words, start_i, i):
+    if start_i == 0:
+        if _negated(words[i - 1]):
+            valence = valence * N_SCALAR
+    elif start_i == 1:
+        if words[i - 2] == "never" and words[i - 1] in ("so", "this"):
+            valence = valence * 1.5
+        elif _negated(words[i - 2]):
+            valence = valence * N_SCALAR
+    else:
+        if (words[i - 3] == "never" and words[i - 2] in ("so", "this")) or words[i - 1] in ("so", "this"):
+            valence = valence * 1.25
+        elif _negated(words[i - 3]):
+            valence = valence * N_SCALAR
+    return valence
+
+
+def token_valences(words, lexicon):
+    """
+    Returns the per-token valences of one tokenized text, applying VADER's booster,
+    caps, negation, idiom, "least" and "but" rules exactly as nltk does (including
+    its use of a token's first position for repeated tokens).
+    """
+    lowered = [word.lower() for word in words]
+    allcaps = sum(1 for word in words if word.isupper())
+    is_cap_diff = 0 < len(words) - allcaps < len(words)
+    first_index = {}
+    for index, word in enumerate(words):
+        first_index.setdefault(word, index)
+
+    sentiments = []
+    last = len(words) - 1
+    for item in words:
+        i = first_index[item]
+        item_lower = item.lower()
+        if (i < last and item_lower == "kind" and lowered[i + 1] == "of") or item_lower in BOOSTER_DICT:
+            sentiments.append(0)
+            continue
+        valence = lexicon.get(item_lower)
+        if valence is None:
+            sentiments.append(0)
+            continue
+
+        if item.isupper() and is_cap_diff:
+            valence += C_INCR if valence > 0 else -C_INCR
+        for start_i in range(3):
+            if i > start_i and lowered[i - (start_i + 1)] not in lexicon:
+                s = _scalar_inc_dec(words[i - (start_i + 1)], valence, is_cap_diff)
+                if start_i == 1 and s != 0:
+                    s = s * 0.95
+                if start_i == 2 and s != 0:
+                    s = s * 0.9
+                valence = valence + s
+                valence = _never(valence, words, start_i, i)
+                if start_i == 2:
+                    valence = _idioms(valence, words, i)
+
+        # "least" check
+        if i > 1 and lowered[i - 1] not in lexicon and lowered[i - 1] == "least":
+            if lowered[i - 2] != "at" and lowered[i - 2] != "very":
+                valence = valence * N_SCALAR
+        elif i > 0 and lowered[i - 1] not in lexicon and lowered[i - 1] == "least":
+            valence = valence * N_SCALAR
+        sentiments.append(valence)
+
+    # "but" check: damp what comes before the first "but", boost what follows
+    if "but" in lowered:
+        bi = lowered.index("but")
+        for index, sentiment in enumerate(sentiments):
+            if index < bi:
+                sentiments[index] = sentiment * 0.5
+            elif index > bi:
+                sentiments[index] = sentiment * 1.5
+    return sentiments
+
+
+# --- Batch stage: valences -> scores, vectorized over the whole batch ---
+def _punctuation_amplifiers(texts):
+    ep = np.minimum(np.fromiter((text.count("!") for text in texts), float, len(texts)), 4) * 0.292
+    qm_count = np.fromiter((text.count("?") for text in texts), float, len(texts))
+    qm = np.where(qm_count > 1, np.where(qm_count <= 3, qm_count * 0.18, 0.96), 0.0)
+    return ep + qm
+
+
+def _segment_sums(values, starts, lengths):
+    """
+    Left-to-right sum of each segment values[start:start + length], vectorized
+    across segments. Adding one token position at a time (instead of
+    np.add.reduceat's pairwise summation) rounds exactly like nltk's loops.
+    """
+    order = np.argsort(-lengths, kind="stable")
+    sorted_starts, sorted_lengths = starts[order], lengths[order]
+    sums = np.zeros(len(starts))
+    for position in range(int(sorted_lengths[0]) if len(starts) else 0):
+        # Segments are sorted longest first, so the ones still going are a prefix
+        active = int(np.searchsorted(-sorted_lengths, -position, side="left"))
+        sums[:active] += values[sorted_starts[:active] + position]
+    result = np.empty_like(sums)
+    result[order] = sums
+    return result
+
+
+def score_valences(all_sentiments, texts):
+    """
+    Turns per-text valence lists into polarity score dicts. All texts are handled
+    together: the valences live in one flat array and the positive, negative and
+    neutral sums of every text are accumulated side by side.
+    """
+    count = len(all_sentiments)
+    lengths = np.fromiter((len(s) for s in all_sentiments), np.int64, count)
+    results = [{"neg": 0.0, "neu": 0.0, "pos": 0.0, "compound": 0.0} for _ in range(count)]
+    scored = np.flatnonzero(lengths)
+    if not len(scored):
+        return results
+
+    flat = np.fromiter((v for index in scored for v in all_sentiments[index]), float)
+    lengths = lengths[scored]
+    starts = np.concatenate(([0], np.cumsum(lengths)[:-1]))
+    amplifier = _punctuation_amplifiers([texts[index] for index in scored])
+
+    # The builtin sum() keeps the interpreter's own float summation, as nltk uses it
+    sum_s = np.fromiter((float(sum(all_sentiments[index])) for index in scored), float, len(scored))
+    sum_s = sum_s + np.sign(sum_s) * amplifier
+    compound = sum_s / np.sqrt(sum_s * sum_s + 15)
+
+    pos_sum = _segment_sums(np.where(flat > 0, flat + 1, 0.0), starts, lengths)
+    neg_sum = _segment_sums(np.where(flat < 0, flat - 1, 0.0), starts, lengths)
+    neu_count = np.add.reduceat((flat == 0).astype(float), starts)
+    pos_wins, neg_wins = pos_sum > -neg_sum, pos_sum < -neg_sum
+    pos_sum = np.where(pos_wins, pos_sum + amplifier, pos_sum)
+    neg_sum = np.where(neg_wins, neg_sum - amplifier, neg_sum)
+
+    total = pos_sum + np.abs(neg_sum) + neu_count
+    pos = np.abs(pos_sum / total)
+    neg = np.abs(neg_sum / total)
+    neu = np.abs(neu_count / total)
+
+    # Python's round() on each float keeps results identical to nltk's
+    for row, index in enumerate(scored):
+        results[index] = {
+            "neg": round(float(neg[row]), 3),
+            "neu": round(float(neu[row]), 3),
+            "pos": round(float(pos[row]), 3),
+            "compound": round(float(compound[row]), 4),
+        }
+    return results
+
+
+# --- Public API ---
+class BatchScorer:
+    """
+    Scores lists of texts with the compiled lexicon, fanning very large batches
+    out over a process pool.
+    """
+
+    def __init__(self, lexicon=None):
+        self.lexicon = lexicon if lexicon is not None else load_lexicon()
+        self._pool = None
+
+    def polarity_scores(self, text):
+        return self.score_serial([text])[0]
+
+    def score_serial(self, texts):
+        texts = [text if isinstance(text, str) else str(text) for text in texts]
+        lexicon = self.lexicon
+        all_sentiments = [token_valences(tokenize(text), lexicon) for text in texts]
+        return score_valences(all_sentiments, texts)
+
+    def score_batch(self, texts):
+        """
+        Returns one polarity score dict per text, in order.
+        """
+        texts = list(texts)
+        if len(texts) < PARALLEL_THRESHOLD or PARALLEL_WORKERS < 2:
+            return self.score_serial(texts)
+        size = math.ceil(len(texts) / PARALLEL_WORKERS)
+        chunks = [texts[start:start + size] for start in range(0, len(texts), size)]
+        results = []
+        for scored in self._get_pool().map(_score_chunk, chunks):
+            results.extend(scored)
+        return results
+
+    def _get_pool(self):
+        if self._pool is None:
+            global _worker_scorer
+            # Forked workers inherit this scorer (and its lexicon) from the parent
+            _worker_scorer = self
+            self._pool = ProcessPoolExecutor(max_workers=PARALLEL_WORKERS)
+        return self._pool
+
+
+_worker_scorer = None
+
+
+def _score_chunk(texts):
+    scorer = _worker_scorer or BatchScorer()
+    return scorer.score_serial(texts)
+
+
+def classify(scores):
+    """
+    Maps polarity scores to "positive" / "negative" / "neutral" the way the
+    analyzer's /analyze endpoint does.
+    """
+    pos, neg, neu = float(scores["pos"]), float(scores["neg"]), float(scores["neu"])
+    if neg > pos and neg > neu:
+        return "negative"
+    if neu > neg and neu > pos:
+        return "neutral"
+    return "positive"
+
+
+def verify(texts, scorer=None):
+    """
+    Compares the engine with nltk's SentimentIntensityAnalyzer on the given texts.
+    Returns the list of (text, expected, got) mismatches.
+    """
+    from nltk.sentiment import SentimentIntensityAnalyzer
+
+    scorer = scorer or BatchScorer()
+    reference = SentimentIntensityAnalyzer()
+    mismatches = []
+    for text, got in zip(texts, scorer.score_batch(texts)):
+        expected = reference.polarity_scores(text)
+        if expected != got:
+            mismatches.append((text, expected, got))
+    return mismatches
+
+
+if __name__ == "__main__":
+    if sys.argv[1:] == ["--compile"]:
+        print(f"Compiled {compile_lexicon()} lexicon entries to {COMPILED_LEXICON}")
+        sys.exit(0)
+    if len(sys.argv) == 3 and sys.argv[1] == "--verify":
+        with open(sys.argv[2], encoding="utf-8") as f:
+            corpus = [line.rstrip("\n") for line in f if line.strip()]
+        failures = verify(corpus)
+        for text, expected, got in failures:
+            print(f"MISMATCH {text!r}\n  nltk:   {expected}\n  engine: {got}")
+        print(f"{len(corpus) - len(failures)}/{len(corpus)} texts match nltk")
+        sys.exit(1 if failures else 0)
+    print("usage: python engine.py --compile | --verify CORPUS_FILE")
+    sys.exit(2)
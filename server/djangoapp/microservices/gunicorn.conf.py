@@ -0,0 +1,32 @@
+"""
+Production server settings for the Sentiment Analyzer:
+
+    gunicorn -c gunicorn.conf.py app:app
+
+The app (and with it the VADER lexicon) is imported once in the master before
+the workers are forked, so every worker shares the same lexicon pages
+copy-on-write instead of loading its own copy.
+"""
+import gc
+import multiprocessing
+import os
+
+bind = os.getenv("SENTIMENT_BIND", "0.0.0.0:5000")
+workers = int(os.getenv("SENTIMENT_WORKERS", str(multiprocessing.cpu_count() * 2 + 1)))
+threads = int(os.getenv("SENTIMENT_THREADS", "1"))
+timeout = int(os.getenv("SENTIMENT_TIMEOUT", "30"))
+keepalive = 5
+# Recycle workers now and then to bound memory growth; jitter avoids restarting them all at once
+max_requests = int(os.getenv("SENTIMENT_MAX_REQUESTS", "10000"))
+max_requests_jitter = max_requests // 10
+
+preload_app = True
+accesslog = "-"
+
+
+def when_ready(server):
+    # The app is loaded by now (preload_app). Move everything allocated so far
+    # into the permanent generation: the collector then never touches those
+    # objects, so workers don't dirty (and privately copy) the shared pages
+    gc.collect()
+    gc.freeze()
@@ -0,0 +1,29 @@
+# Generated by Django 5.2.18 on 2026-10-18 17:25
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('djangoapp', '0001_initial'),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='carmodel',
+            index=models.Index(fields=['car_make', 'id'], name='carmodel_make_id_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='carmodel',
+            index=models.Index(fields=['type', 'id'], name='carmodel_type_id_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='carmodel',
+            index=models.Index(fields=['car_make', 'type', 'year'], name='carmodel_make_type_year_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='carmodel',
+            index=models.Index(fields=['year', 'price'], name='carmodel_year_price_idx'),
+        ),
+    ]
@@ -0,0 +1,25 @@
+# Generated by Django 5.2.18 on 2026-10-18 17:49
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('djangoapp', '0002_carmodel_indexes'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='DealerSentimentSummary',
+            fields=[
+                ('dealer_id', models.PositiveIntegerField(primary_key=True, serialize=False)),
+                ('review_count', models.PositiveIntegerField(default=0)),
+                ('positive', models.PositiveIntegerField(default=0)),
+                ('neutral', models.PositiveIntegerField(default=0)),
+                ('negative', models.PositiveIntegerField(default=0)),
+                ('purchases', models.PositiveIntegerField(default=0)),
+                ('updated', models.DateTimeField(auto_now=True)),
+            ],
+        ),
+    ]
@@ -0,0 +1,49 @@
+# Generated by Django 5.2.18 on 2026-10-18 18:45
+
+import django.db.models.functions.text
+from django.db import migrations, models
+
+
+def merge_duplicates(apps, schema_editor):
+    """
+    Folds makes that differ only in case into the oldest one, then drops repeated
+    (make, name, year) models, so the unique constraints below can be added.
+    """
+    CarMake = apps.get_model('djangoapp', 'CarMake')
+    CarModel = apps.get_model('djangoapp', 'CarModel')
+
+    keep = {}
+    for make_id, name in CarMake.objects.order_by('id').values_list('id', 'name'):
+        kept = keep.setdefault(name.lower(), make_id)
+        if kept != make_id:
+            CarModel.objects.filter(car_make_id=make_id).update(car_make_id=kept)
+            CarMake.objects.filter(id=make_id).delete()
+
+    seen = set()
+    duplicates = []
+    for model_id, *key in CarModel.objects.order_by('id').values_list('id', 'car_make_id', 'name', 'year'):
+        key = tuple(key)
+        if key in seen:
+            duplicates.append(model_id)
+        seen.add(key)
+    if duplicates:
+        CarModel.objects.filter(id__in=duplicates).delete()
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('djangoapp', '0004_cachegeneration'),
+    ]
+
+    operations = [
+        migrations.RunPython(merge_duplicates, migrations.RunPython.noop),
+        migrations.AddConstraint(
+            model_name='carmake',
+            constraint=models.UniqueConstraint(django.db.models.functions.text.Lower('name'), name='carmake_name_ci_unique'),
+        ),
+        migrations.AddConstraint(
+            model_name='carmodel',
+            constraint=models.UniqueConstraint(fields=('car_make', 'name', 'year'), name='carmodel_make_name_year_unique'),
+        ),
+    ]
@@ -1,4 +1,5 @@
 from django.db import models
+from django.db.models.functions import Lower
 from django.utils.timezone import now
 from django.core.validators import MaxValueValidator, MinValueValidator
 
@@ -16,6 +17,13 @@ class CarMake(models.Model):
     # Optional: Add a field for the country of origin
     country = models.CharField(max_length=50, default="USA") 
 
+    class Meta:
+        # One row per make whatever its spelling ("NISSAN" / "Nissan"); also lets
+        # concurrent catalogue loads insert with ignore_conflicts
+        constraints = [
+            models.UniqueConstraint(Lower('name'), name='carmake_name_ci_unique'),
+        ]
+
     # __str__ method to print a car make object
     def __str__(self):
         return self.name
@@ -65,7 +73,52 @@ class CarModel(models.Model):
     # Optional: Date the model was added to the database
     added_date = models.DateTimeField(default=now)
 
+    class Meta:
+        # Composite indexes backing the get_cars filters and keyset (id) pagination
+        indexes = [
+            models.Index(fields=['car_make', 'id'], name='carmodel_make_id_idx'),
+            models.Index(fields=['type', 'id'], name='carmodel_type_id_idx'),
+            models.Index(fields=['car_make', 'type', 'year'], name='carmodel_make_type_year_idx'),
+            models.Index(fields=['year', 'price'], name='carmodel_year_price_idx'),
+        ]
+        constraints = [
+            models.UniqueConstraint(fields=['car_make', 'name', 'year'], name='carmodel_make_name_year_unique'),
+        ]
+
     # __str__ method to print the car make and car model object
     def __str__(self):
         # Accessing the related CarMake's name for a readable output
-        return f"{self.car_make.name} - {self.name} ({self.year})"
\ No newline at end of file
+        return f"{self.car_make.name} - {self.name} ({self.year})"
+
+class DealerSentimentSummary(models.Model):
+    """
+    Running review aggregates for one dealership (dealers themselves live in the
+    backend, so dealer_id is the backend's id). Kept up to date as reviews are
+    posted through djangoapp (see djangoapp.sentiment_summary) and rebuilt from
+    the backend with `python manage.py rebuild_sentiment_summary`.
+    """
+    dealer_id = models.PositiveIntegerField(primary_key=True)
+    review_count = models.PositiveIntegerField(default=0)
+    positive = models.PositiveIntegerField(default=0)
+    neutral = models.PositiveIntegerField(default=0)
+    negative = models.PositiveIntegerField(default=0)
+    # Reviews with a purchase=true flag, for the purchase rate
+    purchases = models.PositiveIntegerField(default=0)
+    updated = models.DateTimeField(auto_now=True)
+
+    def __str__(self):
+        return f"Dealer {self.dealer_id}: {self.review_count} reviews"
+
+
+class CacheGeneration(models.Model):
+    """
+    A named counter bumped whenever the data behind a family of cached payloads
+    changes (see djangoapp.http_cache). Cache keys embed the current value, so a
+    bump made by any process, such as an admin save or a `load_catalogue` run,
+    retires the entries of every worker, whatever cache backend they use.
+    """
+    name = models.CharField(max_length=64, primary_key=True)
+    value = models.PositiveBigIntegerField(default=0)
+
+    def __str__(self):
+        return f"{self.name}: {self.value}"
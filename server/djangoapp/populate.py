@@ -1,45 +1,169 @@
 # server/djangoapp/populate.py
 
-from .models import CarMake, CarModel
+import logging
+from itertools import islice
+
+from django.core.exceptions import ValidationError
+from django.db import transaction
+from django.db.models import Q
+from django.db.models.functions import Lower
+
+from .http_cache import invalidate_catalogue
+from .models import CarMake, CarModel, CAR_TYPES
+
+logger = logging.getLogger(__name__)
+
+# Body types used by catalogue feeds (e.g. database/data/car_records.json) that have
+# no CAR_TYPES choice of their own, mapped to the closest choice
+CAR_TYPE_ALIASES = {
+    "PICKUP": "TRUCK",
+    "MINIVAN": "WAGON",
+    "CONVERTIBLE": "COUPE",
+}
+
+# Sample catalogue loaded by initiate() / `manage.py load_catalogue --seed`
+SAMPLE_CAR_MAKES = [
+    {"name":"NISSAN", "description":"Great cars. Japanese technology"},
+    {"name":"Mercedes", "description":"Great cars. German technology"},
+    {"name":"Audi", "description":"Great cars. German technology"},
+    {"name":"Kia", "description":"Great cars. Korean technology"},
+    {"name":"Toyota", "description":"Great cars. Japanese technology"},
+]
+
+SAMPLE_CAR_MODELS = [
+    {"name":"Pathfinder", "type":"SUV", "year": 2023, "car_make":"NISSAN"},
+    {"name":"Qashqai", "type":"SUV", "year": 2023, "car_make":"NISSAN"},
+    {"name":"XTRAIL", "type":"SUV", "year": 2023, "car_make":"NISSAN"},
+    {"name":"A-Class", "type":"SUV", "year": 2023, "car_make":"Mercedes"},
+    {"name":"C-Class", "type":"SUV", "year": 2023, "car_make":"Mercedes"},
+    {"name":"E-Class", "type":"SUV", "year": 2023, "car_make":"Mercedes"},
+    {"name":"A4", "type":"SUV", "year": 2023, "car_make":"Audi"},
+    {"name":"A5", "type":"SUV", "year": 2023, "car_make":"Audi"},
+    {"name":"A6", "type":"SUV", "year": 2023, "car_make":"Audi"},
+    {"name":"Sorrento", "type":"SUV", "year": 2023, "car_make":"Kia"},
+    {"name":"Carnival", "type":"SUV", "year": 2023, "car_make":"Kia"},
+    {"name":"Cerato", "type":"Sedan", "year": 2023, "car_make":"Kia"},
+    {"name":"Corolla", "type":"Sedan", "year": 2023, "car_make":"Toyota"},
+    {"name":"Camry", "type":"Sedan", "year": 2023, "car_make":"Toyota"},
+    {"name":"Kluger", "type":"SUV", "year": 2023, "car_make":"Toyota"},
+]
+
 
 def initiate():
     """
-    Populates the database with initial CarMake and CarModel data.
-    This function is called by the get_cars view if no CarMake objects exist.
-    """
-    car_make_data = [
-        {"name":"NISSAN", "description":"Great cars. Japanese technology"},
-        {"name":"Mercedes", "description":"Great cars. German technology"},
-        {"name":"Audi", "description":"Great cars. German technology"},
-        {"name":"Kia", "description":"Great cars. Korean technology"},
-        {"name":"Toyota", "description":"Great cars. Japanese technology"},
-    ]
-
-    car_make_instances = []
-    for data in car_make_data:
-            car_make_instances.append(CarMake.objects.create(name=data['name'], description=data['description']))
-
-
-    # Create CarModel instances with the corresponding CarMake instances
-    car_model_data = [
-      {"name":"Pathfinder", "type":"SUV", "year": 2023, "car_make":car_make_instances[0]},
-      {"name":"Qashqai", "type":"SUV", "year": 2023, "car_make":car_make_instances[0]},
-      {"name":"XTRAIL", "type":"SUV", "year": 2023, "car_make":car_make_instances[0]},
-      {"name":"A-Class", "type":"SUV", "year": 2023, "car_make":car_make_instances[1]},
-      {"name":"C-Class", "type":"SUV", "year": 2023, "car_make":car_make_instances[1]},
-      {"name":"E-Class", "type":"SUV", "year": 2023, "car_make":car_make_instances[1]},
-      {"name":"A4", "type":"SUV", "year": 2023, "car_make":car_make_instances[2]},
-      {"name":"A5", "type":"SUV", "year": 2023, "car_make":car_make_instances[2]},
-      {"name":"A6", "type":"SUV", "year": 2023, "car_make":car_make_instances[2]},
-      {"name":"Sorrento", "type":"SUV", "year": 2023, "car_make":car_make_instances[3]},
-      {"name":"Carnival", "type":"SUV", "year": 2023, "car_make":car_make_instances[3]},
-      {"name":"Cerato", "type":"Sedan", "year": 2023, "car_make":car_make_instances[3]},
-      {"name":"Corolla", "type":"Sedan", "year": 2023, "car_make":car_make_instances[4]},
-      {"name":"Camry", "type":"Sedan", "year": 2023, "car_make":car_make_instances[4]},
-      {"name":"Kluger", "type":"SUV", "year": 2023, "car_make":car_make_instances[4]},
-    ]
-
-    for data in car_model_data:
-            CarModel.objects.create(name=data['name'], car_make=data['car_make'], type=data['type'], year=data['year'])
-
-    print("Database population complete.")
\ No newline at end of file
+    Populates the database with the sample CarMake and CarModel data.
+    Idempotent: rows that already exist are left alone.
+    """
+    descriptions = {data['name']: data['description'] for data in SAMPLE_CAR_MAKES}
+    records = (
+        {"make": data['car_make'], "description": descriptions[data['car_make']],
+         "model": data['name'], "type": data['type'], "year": data['year']}
+        for data in SAMPLE_CAR_MODELS
+    )
+    stats = load_catalogue(records)
+    logger.info("Database population complete.")
+    return stats
+
+
+# --- Bulk Catalogue Loader ---
+def normalize_car_type(value):
+    """
+    Maps a feed body type ("Sedan", "SUV", "Pickup", ...) onto a CAR_TYPES key.
+    Returns None for body types with no sensible match.
+    """
+    value = (value or "SUV").strip().upper()
+    for key, label in CAR_TYPES:
+        if value in (key, label.upper()):
+            return key
+    return CAR_TYPE_ALIASES.get(value)
+
+
+def parse_record(record):
+    """
+    Converts one catalogue record into CarMake/CarModel field values. Accepts both
+    the car_records.json shape (make, model, bodyType, year) and the CarModel field
+    names (car_make, name, type, year, price). Raises ValidationError when invalid.
+    """
+    make = (record.get("make") or record.get("car_make") or "").strip()
+    name = (record.get("model") or record.get("name") or "").strip()
+    if not make or not name:
+        raise ValidationError("make and model are required")
+
+    car_type = normalize_car_type(record.get("bodyType") or record.get("type"))
+    if car_type is None:
+        raise ValidationError(f"unknown body type {record.get('bodyType') or record.get('type')!r}")
+
+    model = CarModel(name=name, type=car_type)
+    model.year = int(record.get("year") or model.year)
+    price = record.get("price")
+    model.price = price if price not in (None, "") else None
+    # Run the field validators (year range, lengths) that bulk_create skips;
+    # clean_fields() does no per-row queries, unlike full_clean()
+    exclude = ["car_make", "added_date"] + (["price"] if model.price is None else [])
+    model.clean_fields(exclude=exclude)
+    return make, record.get("description") or "", model
+
+
+def chunked(iterable, size):
+    iterator = iter(iterable)
+    while True:
+        chunk = list(islice(iterator, size))
+        if not chunk:
+            return
+        yield chunk
+
+
+def load_catalogue(records, chunk_size=1000):
+    """
+    Loads an iterable of catalogue records with bulk_create, one transaction per
+    chunk of chunk_size records, so memory stays flat however long the input is.
+    Idempotent: makes are matched by name ignoring case and models by (make, name,
+    year), and existing rows are skipped. The unique constraints on both tables let
+    concurrent loads insert with ignore_conflicts, so they can't add duplicates
+    either (rows the other load got in first are then counted as created by both).
+    Returns counts of created, skipped and invalid rows.
+    """
+    stats = {"makes_created": 0, "models_created": 0, "models_skipped": 0, "invalid": 0}
+    makes = {make.name.lower(): make for make in CarMake.objects.all()}
+    existing = set(CarModel.objects.values_list("car_make_id", "name", "year"))
+
+    try:
+        for chunk in chunked(records, chunk_size):
+            parsed = []
+            for record in chunk:
+                try:
+                    parsed.append(parse_record(record))
+                except (ValidationError, ValueError, TypeError, AttributeError):
+                    stats["invalid"] += 1
+
+            with transaction.atomic():
+                new_makes = {}
+                for make, description, _ in parsed:
+                    if make.lower() not in makes and make.lower() not in new_makes:
+                        new_makes[make.lower()] = CarMake(name=make, description=description)
+                if new_makes:
+                    CarMake.objects.bulk_create(new_makes.values(), batch_size=chunk_size, ignore_conflicts=True)
+                    # Re-read so the makes carry primary keys on every backend, also
+                    # those another load inserted first under a different spelling
+                    added = CarMake.objects.annotate(key=Lower("name")).filter(
+                        Q(key__in=list(new_makes)) | Q(name__in=[make.name for make in new_makes.values()])
+                    )
+                    makes.update((make.name.lower(), make) for make in added)
+                    stats["makes_created"] += len(new_makes)
+
+                new_models = []
+                for make, _, model in parsed:
+                    model.car_make = makes[make.lower()]
+                    key = (model.car_make.id, model.name, model.year)
+                    if key in existing:
+                        stats["models_skipped"] += 1
+                        continue
+                    existing.add(key)
+                    new_models.append(model)
+                CarModel.objects.bulk_create(new_models, batch_size=chunk_size, ignore_conflicts=True)
+                stats["models_created"] += len(new_models)
+    finally:
+        # bulk_create doesn't send post_save, so retire the cached get_cars pages
+        # here; also when the input fails midway, as earlier chunks are committed
+        invalidate_catalogue()
+    return stats
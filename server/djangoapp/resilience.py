@@ -0,0 +1,120 @@
+# server/djangoapp/resilience.py
+
+import logging
+import threading
+import time
+from collections import OrderedDict, deque
+
+logger = logging.getLogger(__name__)
+
+
+class CircuitOpenError(Exception):
+    """
+    Raised instead of calling an upstream whose circuit is open.
+    """
+
+
+class CircuitBreaker:
+    """
+    Per-upstream circuit breaker over the outcomes of the last `window` calls.
+
+    closed:    calls go through; once at least min_calls outcomes are recorded and
+               the share of failures reaches failure_rate, the circuit opens.
+    open:      calls fail fast (allow() is False) for reset_timeout seconds.
+    half_open: a single probe call is let through; its success closes the
+               circuit, its failure opens it for another reset_timeout.
+    """
+    CLOSED = "closed"
+    OPEN = "open"
+    HALF_OPEN = "half_open"
+
+    def __init__(self, name, failure_rate=0.5, window=20, min_calls=10, reset_timeout=30):
+        self.name = name
+        self.failure_rate = failure_rate
+        self.min_calls = min_calls
+        self.reset_timeout = reset_timeout
+        self.state = self.CLOSED
+        self.opened_at = 0.0
+        self._outcomes = deque(maxlen=window)
+        self._probing = False
+        self._lock = threading.Lock()
+
+    def allow(self):
+        """
+        True when a call may go to the upstream now. Every allowed call must be
+        followed by record() or release().
+        """
+        with self._lock:
+            if self.state == self.CLOSED:
+                return True
+            if self.state == self.OPEN:
+                if time.monotonic() - self.opened_at < self.reset_timeout:
+                    return False
+                self.state = self.HALF_OPEN
+                self._probing = False
+            if self._probing:
+                return False  # One probe at a time
+            self._probing = True
+            return True
+
+    def release(self):
+        """
+        Ends an allowed call without recording an outcome, for calls that were
+        cancelled or failed for reasons that say nothing about the upstream.
+        """
+        with self._lock:
+            if self.state == self.HALF_OPEN:
+                self._probing = False  # Let the next call probe instead
+
+    def record(self, success):
+        with self._lock:
+            if self.state == self.HALF_OPEN:
+                self._probing = False
+                if success:
+                    self.state = self.CLOSED
+                    self._outcomes.clear()
+                    logger.warning("Circuit for %s closed; upstream recovered", self.name)
+                else:
+                    self._open()
+                return
+            if self.state == self.OPEN:
+                return  # A call allowed before the circuit opened finished late
+            self._outcomes.append(success)
+            failures = self._outcomes.count(False)
+            if (not success and len(self._outcomes) >= self.min_calls
+                    and failures / len(self._outcomes) >= self.failure_rate):
+                self._open()
+
+    def _open(self):
+        self.state = self.OPEN
+        self.opened_at = time.monotonic()
+        self._outcomes.clear()
+        logger.warning("Circuit for %s opened; failing fast for %ss", self.name, self.reset_timeout)
+
+
+class LastGoodStore:
+    """
+    Bounded LRU map of key -> last successful upstream body (bytes), used to
+    answer with stale data while an upstream is failing.
+    """
+
+    def __init__(self, max_entries=1000):
+        self.max_entries = max_entries
+        self._entries = OrderedDict()
+        self._lock = threading.Lock()
+
+    def put(self, key, body):
+        if self.max_entries <= 0:
+            return
+        with self._lock:
+            self._entries[key] = body
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+
+    def get(self, key):
+        with self._lock:
+            body = self._entries.get(key)
+            if body is not None:
+                self._entries.move_to_end(key)
+            return body
@@ -1,13 +1,25 @@
 import requests 
 import os
 import json
+import asyncio
+import logging
+import weakref
+import httpx
+from concurrent.futures import ThreadPoolExecutor, wait
 from dotenv import load_dotenv
+from requests.adapters import HTTPAdapter
+from urllib3.exceptions import ReadTimeoutError
+from urllib3.util.retry import Retry
 
-# Import the external data models (assuming CarDealer and DealerReview are defined in .models)
-from .models import CarDealer, DealerReview 
+from .sentiment_cache import cache_key, get_sentiment_cache
+from .singleflight import AsyncSingleFlight, SingleFlight
+from .resilience import CircuitBreaker, CircuitOpenError, LastGoodStore
+from .timing import timed
 
 load_dotenv()
 
+logger = logging.getLogger(__name__)
+
 # --- Environment Configuration ---
 backend_url = os.getenv(
     'backend_url', default="http://localhost:3030")
@@ -15,11 +27,206 @@ sentiment_analyzer_url = os.getenv(
     'sentiment_analyzer_url',
     default="http://localhost:5050/")
 
+# Connection pool sizes (max keep-alive connections held per upstream)
+backend_pool_size = int(os.getenv('backend_pool_size', default=10))
+sentiment_pool_size = int(os.getenv('sentiment_pool_size', default=10))
+
+# Per-call timeouts in seconds: (connect, read)
+http_connect_timeout = float(os.getenv('http_connect_timeout', default=3.05))
+http_read_timeout = float(os.getenv('http_read_timeout', default=10))
+
+# Bounded retries with exponential backoff (idempotent requests only)
+http_max_retries = int(os.getenv('http_max_retries', default=2))
+http_backoff_factor = float(os.getenv('http_backoff_factor', default=0.3))
+
+# Concurrent GETs for the same backend URL share one upstream call; bodies up to
+# http_coalesce_max_body bytes are buffered so they can be handed to every caller
+http_coalesce = os.getenv('http_coalesce', default='true').lower() in ('1', 'true', 'yes')
+http_coalesce_max_body = int(os.getenv('http_coalesce_max_body', default=1024 * 1024))
+
+# Circuit breakers (one per upstream): once circuit_failure_rate of the last
+# circuit_window calls failed (with at least circuit_min_calls recorded), calls
+# fail fast for circuit_reset_timeout seconds, then one probe call decides
+circuit_failure_rate = float(os.getenv('circuit_failure_rate', default=0.5))
+circuit_window = int(os.getenv('circuit_window', default=20))
+circuit_min_calls = int(os.getenv('circuit_min_calls', default=10))
+circuit_reset_timeout = float(os.getenv('circuit_reset_timeout', default=30))
+# Last good backend reply kept per URL (LRU), served marked stale while the backend fails
+stale_max_entries = int(os.getenv('stale_max_entries', default=1000))
+
+# Max texts sent per /analyze_batch call; keep it at or below the analyzer's
+# SENTIMENT_MAX_BATCH_SIZE (10000 by default), which rejects larger batches with 413
+sentiment_batch_size = int(os.getenv('sentiment_batch_size', default=100))
+
+# Reviews forwarded per /insert_reviews call by the bulk ingestion endpoint
+review_batch_size = int(os.getenv('review_batch_size', default=500))
+
+# How a list of reviews is scored: "batch" (one /analyze_batch call per chunk)
+# or "fanout" (concurrent per-text /analyze calls)
+sentiment_strategy = os.getenv('sentiment_strategy', default="batch")
+# Fan-out mode: max per-text calls in flight, and overall deadline in seconds
+sentiment_max_in_flight = int(os.getenv('sentiment_max_in_flight', default=8))
+sentiment_deadline = float(os.getenv('sentiment_deadline', default=5))
+
+
+# --- 0. Shared HTTP Client Layer ---
+def build_session(pool_size):
+    """
+    Creates a requests.Session backed by a keep-alive connection pool of the
+    given size, retrying idempotent calls on connection errors and 5xx replies.
+    """
+    retry = Retry(
+        total=http_max_retries,
+        connect=http_max_retries,
+        read=http_max_retries,
+        status=http_max_retries,
+        backoff_factor=http_backoff_factor,
+        status_forcelist=(502, 503, 504),
+        allowed_methods=frozenset(["GET", "HEAD"]), # Never replay POSTs
+        raise_on_status=False, # Hand the last response back instead of raising
+    )
+    adapter = HTTPAdapter(
+        pool_connections=1, pool_maxsize=pool_size, max_retries=retry, pool_block=False
+    )
+    session = requests.Session()
+    session.mount("http://", adapter)
+    session.mount("https://", adapter)
+    return session
+
+
+def default_timeout():
+    """
+    Returns the (connect, read) timeout tuple applied to every upstream call.
+    """
+    return (http_connect_timeout, http_read_timeout)
+
+
+# One pooled session per upstream, shared by all threads of the worker
+backend_session = build_session(backend_pool_size)
+sentiment_session = build_session(sentiment_pool_size)
+
+# In-flight backend GETs, keyed by URL (see singleflight.py)
+backend_flights = SingleFlight()
+backend_flights_async = AsyncSingleFlight()
+
+
+def coalesced(key, fetch):
+    """
+    Runs fetch(), or joins the identical call another thread already has in
+    flight. Returns (result, shared).
+    """
+    if not http_coalesce:
+        return fetch(), False
+    return backend_flights.do(key, fetch)
+
+
+async def coalesced_async(key, fetch):
+    """
+    Async counterpart of coalesced(); fetch is a coroutine function.
+    """
+    if not http_coalesce:
+        return await fetch(), False
+    return await backend_flights_async.do(key, fetch)
+
+
+class BufferedResponse:
+    """
+    A fully read upstream reply that can be handed to several callers at once.
+    Offers the parts of requests.Response that get_request_raw callers use.
+    """
+
+    def __init__(self, response):
+        self.status_code = response.status_code
+        self.headers = response.headers
+        try:
+            self.content = response.content
+        finally:
+            response.close()
+
+    def iter_content(self, chunk_size=64 * 1024):
+        for start in range(0, len(self.content), chunk_size):
+            yield self.content[start:start + chunk_size]
+
+    def close(self):
+        pass
+
+
+def build_breaker(name):
+    return CircuitBreaker(name, failure_rate=circuit_failure_rate, window=circuit_window,
+                          min_calls=circuit_min_calls, reset_timeout=circuit_reset_timeout)
+
+
+backend_breaker = build_breaker("backend")
+sentiment_breaker = build_breaker("sentiment")
+last_good = LastGoodStore(stale_max_entries)
+
+
+# Exceptions that show the upstream itself failing; anything else (a cancelled
+# task, a bug on our side) leaves the breaker's failure count alone
+UPSTREAM_ERRORS = (requests.RequestException, httpx.HTTPError)
+
+
+def is_read_timeout(error):
+    if isinstance(error, (requests.ReadTimeout, httpx.ReadTimeout)):
+        return True
+    # After the last retry, urllib3's read timeout reaches us wrapped in a ConnectionError
+    reason = getattr(error.args[0], "reason", None) if error.args else None
+    return isinstance(reason, ReadTimeoutError)
+
+
+def record_error(breaker, error, timeout):
+    # A read timeout shorter than http_read_timeout was clipped to a caller's
+    # deadline, so running into it says nothing about the upstream's health
+    if timeout is not None and timeout[1] < http_read_timeout and is_read_timeout(error):
+        breaker.release()
+    else:
+        breaker.record(False)
+
+
+def guarded(breaker, send, timeout=None):
+    """
+    Makes one upstream call through the upstream's circuit breaker: raises
+    CircuitOpenError without calling while the circuit is open, and records
+    network errors and 5xx replies as failures. timeout is the (connect, read)
+    tuple send() uses, when the caller shortened it.
+    """
+    if not breaker.allow():
+        raise CircuitOpenError(f"{breaker.name} circuit is open")
+    try:
+        response = send()
+    except UPSTREAM_ERRORS as error:
+        record_error(breaker, error, timeout)
+        raise
+    except BaseException:
+        breaker.release()
+        raise
+    breaker.record(response.status_code < 500)
+    return response
+
+
+async def guarded_async(breaker, send, timeout=None):
+    """
+    Async counterpart of guarded(); send is a coroutine function. Cancellation
+    (asyncio.CancelledError, e.g. at a fan-out deadline) is not a failure.
+    """
+    if not breaker.allow():
+        raise CircuitOpenError(f"{breaker.name} circuit is open")
+    try:
+        response = await send()
+    except UPSTREAM_ERRORS as error:
+        record_error(breaker, error, timeout)
+        raise
+    except BaseException:
+        breaker.release()
+        raise
+    breaker.record(response.status_code < 500)
+    return response
+
+
 # --- 1. Generic GET Request Handler ---
-def get_request(endpoint, **kwargs):
+def build_request_url(endpoint, **kwargs):
     """
-    Handles GET requests to the external backend API.
-    Constructs the URL with query parameters and returns JSON data.
+    Builds the full backend URL for an endpoint, appending kwargs as query parameters.
     """
     params = ""
     if(kwargs):
@@ -34,133 +241,662 @@ def get_request(endpoint, **kwargs):
     # Simple check to remove trailing '&' if it's the last character
     if request_url.endswith('&'):
         request_url = request_url[:-1]
+    return request_url
+
 
-    print("GET from {} ".format(request_url))
+def get_request(endpoint, timeout=None, **kwargs):
+    """
+    Handles GET requests to the external backend API.
+    Constructs the URL with query parameters and returns JSON data.
+    An optional (connect, read) timeout overrides the configured default.
+    """
+    return fetch_json(build_request_url(endpoint, **kwargs), timeout)[0]
+
+
+def get_request_or_stale(endpoint, timeout=None, **kwargs):
+    """
+    Like get_request(), but while the backend is down (network error, 5xx reply
+    or open circuit) answers with the last good reply for the same URL instead
+    of None. Returns (data, stale).
+    """
+    request_url = build_request_url(endpoint, **kwargs)
+    data, unavailable = fetch_json(request_url, timeout)
+    if data is None and unavailable:
+        body = last_good.get(request_url)
+        if body is not None:
+            logger.info("Serving stale reply for %s", request_url)
+            return json.loads(body), True
+    return data, False
+
+
+def fetch_json(request_url, timeout=None):
+    """
+    GETs a backend URL and returns (data, unavailable): the decoded JSON, or None
+    on failure, and whether the failure was the backend's (network error, 5xx,
+    open circuit) rather than a 4xx answer. Good replies are kept in last_good.
+    """
+    logger.debug("GET %s", request_url)
     
     try:
-        # Call get method of requests library with the full URL
-        response = requests.get(request_url)
+        # Call get on the pooled backend session with the full URL. Concurrent
+        # callers for the same URL share the response; .json() decodes a fresh
+        # copy for each of them, so callers can still mutate what they get.
+        with timed("upstream"):
+            response, _ = coalesced(("GET", request_url), lambda: guarded(
+                backend_breaker, lambda: backend_session.get(request_url, timeout=timeout or default_timeout())))
         
         # Check for success status (200 OK)
         if response.status_code == 200:
-            return response.json()
+            data = response.json()
+            last_good.put(request_url, response.content)
+            return data, False
         else:
-            print(f"Request failed with status code {response.status_code}")
-            return None
+            logger.warning("GET %s failed with status code %s", request_url, response.status_code)
+            return None, response.status_code >= 500
             
+    except CircuitOpenError:
+        logger.debug("GET %s skipped: backend circuit is open", request_url)
+        return None, True
     except requests.exceptions.RequestException as e:
         # Handle all network-related errors (DNS failure, connection refused, timeout, etc.)
-        print(f"Network exception occurred: {e}")
-        return None
-    except json.JSONDecodeError:
-        # Handle case where response is not valid JSON
-        print("Failed to decode JSON response")
-        return None
+        # (requests' JSONDecodeError is a RequestException too)
+        logger.warning("GET %s failed: %s", request_url, e)
+        return None, True
 
 
-# --- 2. Fetch Dealerships ---
-def get_dealers_from_api(endpoint="/api/dealership"):
+# --- 1b. Raw (passthrough) GET ---
+def get_request_raw(endpoint, timeout=None, **kwargs):
     """
-    Fetches all dealerships from the external Express API and converts them 
-    into a list of CarDealer objects.
+    Opens a streamed GET to the backend and returns the requests.Response when it
+    is a 200 JSON reply, else None. The body is not read or decoded here: callers
+    take response.content or relay response.iter_content(), and must close it.
+    Concurrent callers for the same URL share one fetch when the body is small
+    enough to buffer (a BufferedResponse); larger bodies stay streamed, and only
+    to the caller that fetched them.
     """
-    json_result = get_request(endpoint)
-    dealers = []
+    request_url = build_request_url(endpoint, **kwargs)
+    logger.debug("GET (raw) %s", request_url)
 
-    if json_result:
-        # Assuming the external API returns the list directly or under a specific key
-        dealer_data = json_result if isinstance(json_result, list) else json_result.get("dealerships", [])
-        
-        # Iterate over API results and convert them to CarDealer objects
-        for data in dealer_data:
-            dealer = CarDealer(
-                address=data.get("address"), city=data.get("city"), full_name=data.get("full_name"),
-                id=data.get("id"), lat=data.get("lat"), long=data.get("long"), 
-                st=data.get("st"), zip=data.get("zip")
-            )
-            dealers.append(dealer)
-            
-    return dealers
+    def fetch():
+        response = guarded(backend_breaker, lambda: backend_session.get(
+            request_url, timeout=timeout or default_timeout(), stream=True))
+        size = response.headers.get("Content-Length")
+        if size is not None and int(size) <= http_coalesce_max_body:
+            return BufferedResponse(response)
+        return response
+
+    try:
+        # Times the wait for the response headers; a streamed body is read by the caller
+        with timed("upstream"):
+            response, shared = coalesced(("GET raw", request_url), fetch)
+            if shared and not isinstance(response, BufferedResponse):
+                # The other caller's stream can't be shared; fetch our own
+                response = fetch()
+    except CircuitOpenError:
+        logger.debug("GET %s skipped: backend circuit is open", request_url)
+        return None
+    except requests.exceptions.RequestException as e:
+        logger.warning("GET %s failed: %s", request_url, e)
+        return None
 
+    if response.status_code == 200 and "json" in response.headers.get("Content-Type", "json"):
+        return response
+    logger.warning("GET %s failed with status code %s", request_url, response.status_code)
+    response.close()
+    return None
 
-# --- 3. Fetch Dealer Reviews ---
-def get_dealer_reviews_from_api(dealer_id):
+
+# --- 2. Analyze Sentiment Microservice Consumer ---
+def analyze_review_sentiments(text, timeout=None):
     """
-    Fetches reviews for a specific dealer from the external API (using dealerId).
-    Returns a list of DealerReview objects.
+    Calls the external Sentiment Analyzer microservice to get the sentiment for a given text.
+    Results are served from the content-addressed sentiment cache when possible.
     """
-    # The API endpoint likely accepts dealerId as a query parameter
-    json_result = get_request("/api/review", dealerId=dealer_id)
-    reviews = []
-
-    if json_result:
-        # Assuming the API returns the list directly or under a specific key
-        review_data = json_result if isinstance(json_result, list) else json_result.get("reviews", [])
-        
-        for data in review_data:
-            review_obj = DealerReview(
-                dealership=data.get("dealership"), name=data.get("name"), purchase=data.get("purchase"), 
-                review=data.get("review"), purchase_date=data.get("purchase_date"), car_make=data.get("car_make"),
-                car_model=data.get("car_model"), car_year=data.get("car_year"), 
-                sentiment=data.get("sentiment", "N/A"), id=data.get("id", "N/A") 
-            )
-            reviews.append(review_obj)
+    cache = get_sentiment_cache()
+    cached = cache.get(text)
+    if cached is not None:
+        return cached
 
-    return reviews
+    result = request_review_sentiment(text, timeout)
+    if is_scored(result):
+        cache.set(text, result)
+    return result
 
 
-# --- 4. Analyze Sentiment Microservice Consumer ---
-def analyze_review_sentiments(text):
+def request_review_sentiment(text, timeout=None):
     """
-    Calls the external Sentiment Analyzer microservice to get the sentiment for a given text.
+    Scores one text with the analyzer's GET /analyze endpoint, bypassing the cache.
     """
     # URL is constructed using the base URL from .env and the endpoint path
     request_url = sentiment_analyzer_url + "analyze/" + text
     
-    print(f"GET from {request_url}")
+    logger.debug("GET %s", request_url)
     
     try:
-        # Call get method of requests library with URL
-        response = requests.get(request_url)
+        # Call get on the pooled sentiment session with URL
+        with timed("upstream"):
+            response = guarded(sentiment_breaker, lambda: sentiment_session.get(
+                request_url, timeout=timeout or default_timeout()), timeout=timeout)
         
         # Check for success status (200 OK)
         if response.status_code == 200:
             return response.json()
         else:
-            print(f"Sentiment Analyzer request failed with status code {response.status_code}")
+            logger.warning("Sentiment Analyzer request failed with status code %s", response.status_code)
             return {"sentiment": "N/A"} # Return a default structure on non-200 status
             
+    except CircuitOpenError:
+        return {"sentiment": "N/A"} # Analyzer is down; don't wait on it
     except Exception as err:
         # Catch network or other general exceptions
-        print(f"Unexpected {err=}, {type(err)=}")
-        print("Network exception occurred")
+        logger.warning("Sentiment Analyzer request failed: %r", err)
         return {"sentiment": "N/A"} # Return a default structure on error
 
 
-# --- 5. Post Review ---
-def post_review(data_dict):
+def is_scored(result):
+    """
+    True when an analyzer result holds a real sentiment (failures are never cached).
+    """
+    return isinstance(result, dict) and result.get("sentiment", "N/A") != "N/A"
+
+
+def score_with_cache(texts, score_misses):
+    """
+    Looks texts up in the sentiment cache and calls score_misses(list_of_texts) only
+    for the ones it doesn't hold. Fresh results are cached; returns one dict per text.
+    """
+    cache = get_sentiment_cache()
+    results = cache.get_many(texts)
+    # Texts that normalize to the same cache key are scored once
+    misses = {}
+    for index, result in enumerate(results):
+        if result is None:
+            misses.setdefault(cache_key(texts[index]), []).append(index)
+    if misses:
+        first = [indexes[0] for indexes in misses.values()]
+        scored = score_misses([texts[index] for index in first])
+        for indexes, result in zip(misses.values(), scored):
+            for index in indexes:
+                results[index] = result
+        cache.set_many((texts[index], results[index]) for index in first if is_scored(results[index]))
+    return results
+
+
+# --- 2b. Batch Sentiment Consumer ---
+def analyze_review_sentiments_batch(texts, timeout=None):
+    """
+    Scores many texts through the analyzer's POST /analyze_batch endpoint.
+    Returns one {"sentiment": ..., "scores": ...} dict per text, in input order;
+    texts in a chunk that fails to score come back as {"sentiment": "N/A"}.
+    Only texts missing from the sentiment cache are sent to the analyzer.
+    """
+    texts = [text or "" for text in texts]
+    return score_with_cache(texts, lambda misses: request_review_sentiments_batch(misses, timeout))
+
+
+def request_review_sentiments_batch(texts, timeout=None):
+    """
+    Sends texts to POST /analyze_batch in chunks, bypassing the cache.
+    """
+    request_url = sentiment_analyzer_url + "analyze_batch"
+    results = []
+
+    # Send the texts in chunks so one call never exceeds the analyzer's batch cap
+    for start in range(0, len(texts), sentiment_batch_size):
+        chunk = texts[start:start + sentiment_batch_size]
+        logger.debug("POST %d texts to %s", len(chunk), request_url)
+        try:
+            with timed("upstream"):
+                response = guarded(sentiment_breaker, lambda: sentiment_session.post(
+                    request_url, json=chunk, timeout=timeout or default_timeout()))
+            if response.status_code == 200:
+                scored = response.json()
+                if isinstance(scored, list) and len(scored) == len(chunk):
+                    results.extend(scored)
+                    continue
+                logger.warning("Sentiment Analyzer returned a malformed batch")
+            else:
+                logger.warning("Sentiment Analyzer batch failed with status code %s", response.status_code)
+        except CircuitOpenError:
+            pass # Analyzer is down; the chunk comes back unscored
+        except Exception as err:
+            logger.warning("Sentiment Analyzer batch failed: %s", err)
+        results.extend({"sentiment": "N/A"} for _ in chunk)
+
+    return results
+
+
+# --- 2c. Concurrent Sentiment Fan-out ---
+def analyze_review_sentiments_concurrent(texts, max_in_flight=None, deadline=None):
+    """
+    Scores texts with concurrent per-text /analyze calls on a bounded thread pool.
+    At most max_in_flight calls run at once, and the whole fan-out is cut off after
+    deadline seconds; texts not scored by then come back as {"sentiment": "N/A"}.
+    Texts held in the sentiment cache are not sent at all.
+    """
+    texts = [text or "" for text in texts]
+    return score_with_cache(
+        texts, lambda misses: request_review_sentiments_concurrent(misses, max_in_flight, deadline))
+
+
+def request_review_sentiments_concurrent(texts, max_in_flight=None, deadline=None):
+    """
+    Fans texts out over concurrent GET /analyze calls, bypassing the cache.
+    """
+    max_in_flight = max_in_flight or sentiment_max_in_flight
+    deadline = sentiment_deadline if deadline is None else deadline
+    results = [{"sentiment": "N/A"} for _ in texts]
+    if not texts:
+        return results
+
+    executor = ThreadPoolExecutor(
+        max_workers=min(max_in_flight, len(texts)), thread_name_prefix="sentiment"
+    )
+    # Per-call read timeout never outlives the overall deadline
+    timeout = (http_connect_timeout, min(http_read_timeout, deadline))
+    futures = {
+        executor.submit(request_review_sentiment, text, timeout): index
+        for index, text in enumerate(texts)
+    }
+    # The calls run on pool threads, outside the request's timing context, so
+    # the whole fan-out is recorded as one upstream wait
+    with timed("upstream"):
+        done, not_done = wait(futures, timeout=deadline)
+    # Don't block on stragglers; queued calls are dropped, running ones time out
+    executor.shutdown(wait=False, cancel_futures=True)
+
+    for future in done:
+        if future.exception() is None:
+            results[futures[future]] = future.result()
+    if not_done:
+        logger.warning("Sentiment fan-out deadline hit: %d of %d texts unscored", len(not_done), len(texts))
+
+    return results
+
+
+# --- 2d. Score Many Reviews ---
+def analyze_review_sentiments_many(texts):
+    """
+    Scores a list of review texts using the configured sentiment_strategy.
+    Returns one sentiment dict per text, in input order.
+    """
+    if sentiment_strategy == "fanout":
+        return analyze_review_sentiments_concurrent(texts)
+    return analyze_review_sentiments_batch(texts)
+
+
+# --- 2e. Review Sentiment Enrichment ---
+def has_stored_sentiment(review):
+    """
+    True when a review record already carries a sentiment computed at write time.
+    """
+    return review.get('sentiment', 'N/A') not in (None, '', 'N/A')
+
+
+def enrich_reviews_sentiment(reviews, force=False):
+    """
+    Sets review['sentiment'] on every review dict that doesn't have one yet
+    (or on all of them when force is set). Returns the number of reviews scored.
+    """
+    pending = [review for review in reviews if force or not has_stored_sentiment(review)]
+    if pending:
+        responses = analyze_review_sentiments_many([review.get('review', '') for review in pending])
+        for review, response in zip(pending, responses):
+            review['sentiment'] = response.get('sentiment', 'N/A')
+    return len(pending)
+
+
+# --- 3. Post Review ---
+def post_review(data_dict, timeout=None):
     """
     Handles POST requests for submitting a new review to the external backend API.
+    POSTs are not retried, so a slow upstream cannot cause duplicate reviews.
     """
-    request_url = backend_url + "/api/review"
-    print(f"POST to {request_url}")
+    request_url = backend_url + "/insert_review"
+    logger.debug("POST %s", request_url)
 
     try:
-        # Call post method of requests library with URL and JSON payload
-        response = requests.post(request_url, json=data_dict)
+        # Call post on the pooled backend session with URL and JSON payload
+        with timed("upstream"):
+            response = guarded(backend_breaker, lambda: backend_session.post(
+                request_url, json=data_dict, timeout=timeout or default_timeout()))
+    except CircuitOpenError:
+        return {"error": "Backend unavailable"}
     except Exception as e:
-        print(f"Network exception occurred during POST: {e}")
+        logger.warning("POST %s failed: %s", request_url, e)
         return {"error": "Network connection failed"}
 
     status_code = response.status_code
-    print(f"With status {status_code}")
 
-    if status_code in [201, 202]: # Typical success codes for POST/creation
+    if status_code in [200, 201]: # /insert_review answers 200 with the stored review
         return {"status": "success", "data": response.json()}
     else:
-        print(f"POST failed with status code {status_code}. Response: {response.text}")
+        logger.warning("POST %s failed with status code %s: %s", request_url, status_code, response.text)
         # Assuming the backend returns an error message in the JSON body if available
         try:
             return {"status": "error", "message": response.json()}
         except:
-            return {"status": "error", "message": f"Failed with status code {status_code}"}
\ No newline at end of file
+            return {"status": "error", "message": f"Failed with status code {status_code}"}
+
+
+def post_reviews_batch(reviews, timeout=None):
+    """
+    Submits a list of reviews to the backend's /insert_reviews route in one call.
+    Returns {"status": "success", "data": [per-review result, ...]} in input order,
+    where each result is {"status": "created", "id": ...} or {"status": "error",
+    "error": ...}, or an error dict like post_review(). Not retried.
+    """
+    request_url = backend_url + "/insert_reviews"
+    logger.debug("POST %s (%d reviews)", request_url, len(reviews))
+
+    try:
+        with timed("upstream"):
+            response = guarded(backend_breaker, lambda: backend_session.post(
+                request_url, json=reviews, timeout=timeout or default_timeout()))
+    except CircuitOpenError:
+        return {"error": "Backend unavailable"}
+    except Exception as e:
+        logger.warning("POST %s failed: %s", request_url, e)
+        return {"error": "Network connection failed"}
+
+    status_code = response.status_code
+    if status_code in [200, 201]:
+        return {"status": "success", "data": response.json()}
+    logger.warning("POST %s failed with status code %s: %s", request_url, status_code, response.text)
+    try:
+        return {"status": "error", "message": response.json()}
+    except ValueError:
+        return {"status": "error", "message": f"Failed with status code {status_code}"}
+
+
+# --- 4. Async Client Layer (used by the async views under ASGI) ---
+# httpx clients are bound to the event loop that created them, so keep one
+# pooled client per upstream per running loop.
+_async_clients = weakref.WeakKeyDictionary()
+
+
+def get_async_client(upstream, pool_size):
+    """
+    Returns the httpx.AsyncClient for an upstream on the running event loop, with a
+    keep-alive pool of the given size, the default timeouts and connect retries.
+    """
+    loop = asyncio.get_running_loop()
+    clients = _async_clients.setdefault(loop, {})
+    client = clients.get(upstream)
+    if client is None or client.is_closed:
+        client = httpx.AsyncClient(
+            # httpx only retries failed connects; 5xx replies are returned as-is
+            transport=httpx.AsyncHTTPTransport(
+                retries=http_max_retries,
+                limits=httpx.Limits(max_connections=pool_size, max_keepalive_connections=pool_size),
+            ),
+            timeout=async_timeout(),
+        )
+        clients[upstream] = client
+    return client
+
+
+def async_timeout(timeout=None):
+    """
+    Converts a (connect, read) tuple, or the configured default, into an httpx.Timeout.
+    """
+    connect, read = timeout or default_timeout()
+    return httpx.Timeout(read, connect=connect)
+
+
+def get_backend_client():
+    return get_async_client("backend", backend_pool_size)
+
+
+def get_sentiment_client():
+    return get_async_client("sentiment", sentiment_pool_size)
+
+
+async def get_request_async(endpoint, timeout=None, **kwargs):
+    """
+    Async counterpart of get_request(): returns the decoded JSON, or None on failure.
+    """
+    return (await fetch_json_async(build_request_url(endpoint, **kwargs), timeout))[0]
+
+
+async def get_request_or_stale_async(endpoint, timeout=None, **kwargs):
+    """
+    Async counterpart of get_request_or_stale().
+    """
+    request_url = build_request_url(endpoint, **kwargs)
+    data, unavailable = await fetch_json_async(request_url, timeout)
+    if data is None and unavailable:
+        body = last_good.get(request_url)
+        if body is not None:
+            logger.info("Serving stale reply for %s", request_url)
+            return json.loads(body), True
+    return data, False
+
+
+async def fetch_json_async(request_url, timeout=None):
+    """
+    Async counterpart of fetch_json().
+    """
+    logger.debug("GET %s", request_url)
+
+    try:
+        with timed("upstream"):
+            response, _ = await coalesced_async(("GET", request_url), lambda: guarded_async(
+                backend_breaker, lambda: get_backend_client().get(request_url, timeout=async_timeout(timeout))))
+        if response.status_code == 200:
+            data = response.json()
+            last_good.put(request_url, response.content)
+            return data, False
+        logger.warning("GET %s failed with status code %s", request_url, response.status_code)
+        return None, response.status_code >= 500
+    except CircuitOpenError:
+        logger.debug("GET %s skipped: backend circuit is open", request_url)
+        return None, True
+    except httpx.HTTPError as e:
+        logger.warning("GET %s failed: %s", request_url, e)
+        return None, True
+    except json.JSONDecodeError:
+        logger.warning("GET %s returned invalid JSON", request_url)
+        return None, True
+
+
+async def get_request_raw_async(endpoint, timeout=None, **kwargs):
+    """
+    Async counterpart of get_request_raw(), returning the undecoded body bytes
+    of a 200 JSON reply, or None.
+    """
+    request_url = build_request_url(endpoint, **kwargs)
+    logger.debug("GET (raw) %s", request_url)
+
+    try:
+        # httpx reads the whole body here, so the reply is always shareable
+        with timed("upstream"):
+            response, _ = await coalesced_async(("GET", request_url), lambda: guarded_async(
+                backend_breaker, lambda: get_backend_client().get(request_url, timeout=async_timeout(timeout))))
+    except CircuitOpenError:
+        logger.debug("GET %s skipped: backend circuit is open", request_url)
+        return None
+    except httpx.HTTPError as e:
+        logger.warning("GET %s failed: %s", request_url, e)
+        return None
+    if response.status_code == 200 and "json" in response.headers.get("Content-Type", "json"):
+        return response.content
+    logger.warning("GET %s failed with status code %s", request_url, response.status_code)
+    return None
+
+
+async def score_with_cache_async(texts, score_misses):
+    """
+    Async counterpart of score_with_cache(); score_misses is a coroutine function.
+    The cache is a local in-memory/SQLite lookup, cheap enough to run on the loop.
+    """
+    cache = get_sentiment_cache()
+    results = cache.get_many(texts)
+    # Texts that normalize to the same cache key are scored once
+    misses = {}
+    for index, result in enumerate(results):
+        if result is None:
+            misses.setdefault(cache_key(texts[index]), []).append(index)
+    if misses:
+        first = [indexes[0] for indexes in misses.values()]
+        scored = await score_misses([texts[index] for index in first])
+        for indexes, result in zip(misses.values(), scored):
+            for index in indexes:
+                results[index] = result
+        cache.set_many((texts[index], results[index]) for index in first if is_scored(results[index]))
+    return results
+
+
+async def analyze_review_sentiments_async(text, timeout=None):
+    """
+    Async counterpart of analyze_review_sentiments().
+    """
+    async def score_one(misses):
+        return [await request_review_sentiment_async(misses[0], timeout)]
+
+    return (await score_with_cache_async([text], score_one))[0]
+
+
+async def request_review_sentiment_async(text, timeout=None):
+    """
+    Async counterpart of request_review_sentiment().
+    """
+    request_url = sentiment_analyzer_url + "analyze/" + text
+    logger.debug("GET %s", request_url)
+
+    try:
+        with timed("upstream"):
+            response = await guarded_async(sentiment_breaker, lambda: get_sentiment_client().get(
+                request_url, timeout=async_timeout(timeout)), timeout=timeout)
+        if response.status_code == 200:
+            return response.json()
+        logger.warning("Sentiment Analyzer request failed with status code %s", response.status_code)
+    except CircuitOpenError:
+        pass # Analyzer is down; don't wait on it
+    except Exception as err:
+        logger.warning("Sentiment Analyzer request failed: %r", err)
+    return {"sentiment": "N/A"}
+
+
+async def analyze_review_sentiments_batch_async(texts, timeout=None):
+    """
+    Async counterpart of analyze_review_sentiments_batch().
+    """
+    texts = [text or "" for text in texts]
+    return await score_with_cache_async(
+        texts, lambda misses: request_review_sentiments_batch_async(misses, timeout))
+
+
+async def request_review_sentiments_batch_async(texts, timeout=None):
+    """
+    Async counterpart of request_review_sentiments_batch(); chunks are sent concurrently.
+    """
+    request_url = sentiment_analyzer_url + "analyze_batch"
+
+    async def score_chunk(chunk):
+        logger.debug("POST %d texts to %s", len(chunk), request_url)
+        try:
+            with timed("upstream"):
+                response = await guarded_async(sentiment_breaker, lambda: get_sentiment_client().post(
+                    request_url, json=chunk, timeout=async_timeout(timeout)))
+            if response.status_code == 200:
+                scored = response.json()
+                if isinstance(scored, list) and len(scored) == len(chunk):
+                    return scored
+                logger.warning("Sentiment Analyzer returned a malformed batch")
+            else:
+                logger.warning("Sentiment Analyzer batch failed with status code %s", response.status_code)
+        except CircuitOpenError:
+            pass # Analyzer is down; the chunk comes back unscored
+        except Exception as err:
+            logger.warning("Sentiment Analyzer batch failed: %s", err)
+        return [{"sentiment": "N/A"} for _ in chunk]
+
+    chunks = [texts[start:start + sentiment_batch_size] for start in range(0, len(texts), sentiment_batch_size)]
+    results = []
+    for scored in await asyncio.gather(*(score_chunk(chunk) for chunk in chunks)):
+        results.extend(scored)
+    return results
+
+
+async def analyze_review_sentiments_concurrent_async(texts, max_in_flight=None, deadline=None):
+    """
+    Async counterpart of analyze_review_sentiments_concurrent().
+    """
+    texts = [text or "" for text in texts]
+    return await score_with_cache_async(
+        texts, lambda misses: request_review_sentiments_concurrent_async(misses, max_in_flight, deadline))
+
+
+async def request_review_sentiments_concurrent_async(texts, max_in_flight=None, deadline=None):
+    """
+    Async counterpart of request_review_sentiments_concurrent(): a semaphore bounds
+    the calls in flight and texts not scored by the deadline come back as N/A.
+    """
+    max_in_flight = max_in_flight or sentiment_max_in_flight
+    deadline = sentiment_deadline if deadline is None else deadline
+    results = [{"sentiment": "N/A"} for _ in texts]
+    semaphore = asyncio.Semaphore(max_in_flight)
+
+    async def score(index, text):
+        async with semaphore:
+            results[index] = await request_review_sentiment_async(text)
+
+    tasks = [asyncio.ensure_future(score(index, text)) for index, text in enumerate(texts)]
+    if tasks:
+        done, pending = await asyncio.wait(tasks, timeout=deadline)
+        for task in pending:
+            task.cancel()
+        if pending:
+            logger.warning("Sentiment fan-out deadline hit: %d of %d texts unscored", len(pending), len(texts))
+    return results
+
+
+async def analyze_review_sentiments_many_async(texts):
+    """
+    Async counterpart of analyze_review_sentiments_many().
+    """
+    if sentiment_strategy == "fanout":
+        return await analyze_review_sentiments_concurrent_async(texts)
+    return await analyze_review_sentiments_batch_async(texts)
+
+
+async def enrich_reviews_sentiment_async(reviews, force=False):
+    """
+    Async counterpart of enrich_reviews_sentiment().
+    """
+    pending = [review for review in reviews if force or not has_stored_sentiment(review)]
+    if pending:
+        responses = await analyze_review_sentiments_many_async([review.get('review', '') for review in pending])
+        for review, response in zip(pending, responses):
+            review['sentiment'] = response.get('sentiment', 'N/A')
+    return len(pending)
+
+
+async def post_review_async(data_dict, timeout=None):
+    """
+    Async counterpart of post_review(). Like the sync version, POSTs are never retried
+    on a bad status (httpx only retries connects that never reached the server).
+    """
+    request_url = backend_url + "/insert_review"
+    logger.debug("POST %s", request_url)
+
+    try:
+        with timed("upstream"):
+            response = await guarded_async(backend_breaker, lambda: get_backend_client().post(
+                request_url, json=data_dict, timeout=async_timeout(timeout)))
+    except CircuitOpenError:
+        return {"error": "Backend unavailable"}
+    except Exception as e:
+        logger.warning("POST %s failed: %s", request_url, e)
+        return {"error": "Network connection failed"}
+
+    status_code = response.status_code
+
+    if status_code in [200, 201]:
+        return {"status": "success", "data": response.json()}
+    logger.warning("POST %s failed with status code %s: %s", request_url, status_code, response.text)
+    try:
+        return {"status": "error", "message": response.json()}
+    except ValueError:
+        return {"status": "error", "message": f"Failed with status code {status_code}"}
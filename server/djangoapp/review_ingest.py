@@ -0,0 +1,117 @@
+# server/djangoapp/review_ingest.py
+
+import json
+from itertools import islice
+
+from .restapis import enrich_reviews_sentiment, post_reviews_batch
+
+# Field -> accepted type(s) of a review record, as required by database/review.js
+REVIEW_FIELDS = {
+    "name": str,
+    "dealership": int,
+    "review": str,
+    "purchase": bool,
+    "purchase_date": str,
+    "car_make": str,
+    "car_model": str,
+    "car_year": int,
+}
+
+
+def validate_review(record):
+    """
+    Returns the list of problems with one review record (empty when it is valid).
+    """
+    if not isinstance(record, dict):
+        return ["Expected a JSON object"]
+    errors = []
+    for field, expected in REVIEW_FIELDS.items():
+        value = record.get(field)
+        if value is None or value == "":
+            errors.append(f"{field} is required")
+        elif not isinstance(value, expected) or (expected is int and isinstance(value, bool)):
+            errors.append(f"{field} must be of type {expected.__name__}")
+    return errors
+
+
+def chunked(iterable, size):
+    iterator = iter(iterable)
+    while chunk := list(islice(iterator, size)):
+        yield chunk
+
+
+def ingest_reviews(records, batch_size, on_stored=None):
+    """
+    Validates review records and forwards the valid ones to the backend in
+    batches of batch_size, scoring each batch's sentiment on the way.
+    Yields one status dict per record, in input order:
+    {"index", "status": "created", "id"} | {"index", "status": "invalid", "errors"}
+    | {"index", "status": "failed", "message"}.
+    At most one batch of records is held at a time, so records can be a lazy
+    parser over an upload of any size. on_stored(reviews) is called with the
+    reviews of each batch the backend stored.
+    """
+    for batch in chunked(enumerate(records), batch_size):
+        statuses = {}
+        valid = []
+        for index, record in batch:
+            errors = validate_review(record)
+            if errors:
+                statuses[index] = {"index": index, "status": "invalid", "errors": errors}
+                continue
+            review = {field: record[field] for field in REVIEW_FIELDS}
+            if record.get("sentiment"):
+                review["sentiment"] = record["sentiment"]
+            valid.append((index, review))
+
+        if valid:
+            reviews = [review for _, review in valid]
+            # Write-time enrichment, one analyzer batch call per chunk
+            enrich_reviews_sentiment(reviews)
+            response = post_reviews_batch(reviews)
+            results = response.get("data") if response.get("status") == "success" else None
+            if not isinstance(results, list) or len(results) != len(valid):
+                message = response.get("message") or response.get("error") or "Unexpected backend reply"
+                results = [{"status": "error", "error": message}] * len(valid)
+            stored = []
+            for (index, review), result in zip(valid, results):
+                if result.get("status") == "created":
+                    statuses[index] = {"index": index, "status": "created", "id": result.get("id")}
+                    stored.append(dict(review, id=result.get("id")))
+                else:
+                    statuses[index] = {"index": index, "status": "failed",
+                                       "message": str(result.get("error", "Not stored"))}
+            if stored and on_stored is not None:
+                on_stored(stored)
+
+        for index, _ in batch:
+            yield statuses[index]
+
+
+def stream_ingest_response(records, batch_size, on_stored=None):
+    """
+    Encodes ingest_reviews() as one JSON document, written out as it goes:
+    {"status": 200, "results": [...], "received": n, "created": n, "invalid": n, "failed": n}.
+    A malformed upload ends the results early and adds an "error" member.
+    """
+    counts = {"created": 0, "invalid": 0, "failed": 0}
+    received = 0
+    errors = []
+
+    def parsed():
+        # Stop at a malformed record (ValueError from the JSON/NDJSON parser), but
+        # still forward the records read before it
+        try:
+            yield from records
+        except ValueError as e:
+            errors.append(e)
+
+    yield b'{"status": 200, "results": ['
+    for status in ingest_reviews(parsed(), batch_size, on_stored):
+        yield (b", " if received else b"") + json.dumps(status).encode("utf-8")
+        received += 1
+        counts[status["status"]] += 1
+    tail = {"received": received, **counts}
+    if errors:
+        tail["error"] = f"Malformed input after {received} records: {errors[0]}"
+    yield b"], " + json.dumps(tail).encode("utf-8")[1:]
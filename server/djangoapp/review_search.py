@@ -0,0 +1,280 @@
+# server/djangoapp/review_search.py
+
+import heapq
+import logging
+import math
+import re
+import threading
+import time
+
+logger = logging.getLogger(__name__)
+
+# BM25 parameters: term-frequency saturation and document-length normalization
+BM25_K1 = 1.2
+BM25_B = 0.75
+
+MAX_RESULTS = 100
+
+# Renumber the documents once replaced reviews leave more than this many dead
+# slots per live document
+COMPACT_FRACTION = 0.25
+
+_TOKEN = re.compile(r"[a-z0-9]+(?:'[a-z]+)?")
+STOPWORDS = frozenset("""
+a an and are as at be but by for from had has have he her his i if in into is it its
+me my not of on or our she so that the their them they this to was we were will with
+you your
+""".split())
+
+
+def tokenize(text):
+    """
+    Lowercased word tokens of a text, without stopwords and possessive/contraction
+    endings ("dealer's" -> "dealer").
+    """
+    tokens = []
+    for token in _TOKEN.findall(text.lower() if isinstance(text, str) else ""):
+        token = token.split("'", 1)[0]
+        if token and token not in STOPWORDS:
+            tokens.append(token)
+    return tokens
+
+
+def _key(value):
+    return value.casefold() if isinstance(value, str) else value
+
+
+class ReviewIndex:
+    """
+    In-memory inverted index over review dicts with BM25 ranking.
+
+    Each term maps to its postings, {document: impact}, where the impact is the
+    BM25 term-frequency component tf * (k1 + 1) / (tf + k1 * (1 - b + b * len / avg)),
+    computed when the document is indexed; a search then only multiplies by the
+    term's idf and sums. avg is the mean review length of the first batch
+    indexed, so scores stay comparable as reviews are added one by one (a
+    periodic rebuild refreshes it).
+
+    Documents are numbered as they are added; adding a review whose "id" is
+    already indexed replaces the old document, whose postings are removed so
+    that document frequencies (and idf) only count live reviews. The freed slots
+    are reclaimed by renumbering the documents once they exceed COMPACT_FRACTION
+    of the live ones. Dealer, car make and sentiment map to the sets of their
+    documents, for filtering.
+    Writers hold a lock; searches read a consistent state under the same lock.
+    """
+
+    FILTERS = ("dealership", "car_make", "sentiment")
+
+    def __init__(self, reviews=()):
+        self.documents = []
+        self.postings = {}
+        self.filters = {field: {} for field in self.FILTERS}
+        self.by_id = {}
+        self.live = 0
+        self.average_length = None
+        self._lock = threading.Lock()
+        self.add(reviews)
+
+    def __len__(self):
+        return self.live
+
+    def add(self, reviews):
+        """
+        Indexes review dicts (new ones, or new versions of indexed ones).
+        """
+        batch = [(review, tokenize(review.get("review"))) for review in reviews if isinstance(review, dict)]
+        if not batch:
+            return
+        with self._lock:
+            if self.average_length is None:
+                self.average_length = max(1.0, sum(len(tokens) for _, tokens in batch) / len(batch))
+            for review, tokens in batch:
+                document = len(self.documents)
+                review_id = review.get("id")
+                if review_id is not None:
+                    previous = self.by_id.get(review_id)
+                    if previous is not None:
+                        self._remove(previous)
+                    self.by_id[review_id] = document
+                self.documents.append(review)
+                self.live += 1
+
+                norm = BM25_K1 * (1 - BM25_B + BM25_B * len(tokens) / self.average_length)
+                frequencies = {}
+                for token in tokens:
+                    frequencies[token] = frequencies.get(token, 0) + 1
+                for token, frequency in frequencies.items():
+                    self.postings.setdefault(token, {})[document] = frequency * (BM25_K1 + 1) / (frequency + norm)
+                for field in self.FILTERS:
+                    value = review.get(field)
+                    if value is not None:
+                        self.filters[field].setdefault(_key(value), set()).add(document)
+            if len(self.documents) - self.live > self.live * COMPACT_FRACTION:
+                self._compact()
+
+    def _remove(self, document):
+        review = self.documents[document]
+        for token in set(tokenize(review.get("review"))):
+            postings = self.postings.get(token)
+            if postings is not None:
+                postings.pop(document, None)
+                if not postings:
+                    del self.postings[token]
+        for field in self.FILTERS:
+            value = _key(review.get(field))
+            documents = self.filters[field].get(value)
+            if documents is not None:
+                documents.discard(document)
+                if not documents:
+                    del self.filters[field][value]
+        self.documents[document] = None
+        self.live -= 1
+
+    def _compact(self):
+        # Renumber the live documents in order, dropping the dead slots
+        numbers = {}
+        documents = []
+        for document, review in enumerate(self.documents):
+            if review is not None:
+                numbers[document] = len(documents)
+                documents.append(review)
+        self.documents = documents
+        self.postings = {
+            token: {numbers[document]: impact for document, impact in postings.items()}
+            for token, postings in self.postings.items()
+        }
+        for field in self.FILTERS:
+            self.filters[field] = {
+                value: {numbers[document] for document in members}
+                for value, members in self.filters[field].items()
+            }
+        self.by_id = {review_id: numbers[document] for review_id, document in self.by_id.items()}
+
+    def search(self, text, limit=20, offset=0, **filters):
+        """
+        Returns (count, [(score, review), ...]): the number of matching reviews
+        and the requested slice of them, best BM25 score first. A review matches
+        when it contains at least one query term and passes every filter given
+        (dealership, car_make, sentiment; None means any).
+        """
+        terms = list(dict.fromkeys(tokenize(text)))
+        with self._lock:
+            allowed = None
+            for field, value in filters.items():
+                if value is None:
+                    continue
+                documents = self.filters[field].get(_key(value), set())
+                allowed = documents if allowed is None else allowed & documents
+
+            alive = len(self)
+            if not terms or not alive or allowed is not None and not allowed:
+                return 0, []
+            scores = {}
+            for term in terms:
+                postings = self.postings.get(term)
+                if not postings:
+                    continue
+                frequency = len(postings)
+                idf = math.log(1 + (alive - frequency + 0.5) / (frequency + 0.5))
+                if allowed is None:
+                    matches = postings
+                elif len(allowed) < len(postings):
+                    matches = {document: postings[document] for document in allowed if document in postings}
+                else:
+                    matches = {document: impact for document, impact in postings.items() if document in allowed}
+                if not scores:
+                    scores = {document: idf * impact for document, impact in matches.items()}
+                else:
+                    for document, impact in matches.items():
+                        scores[document] = scores.get(document, 0.0) + idf * impact
+
+            best = heapq.nlargest(offset + limit, scores, key=scores.__getitem__)
+            return len(scores), [(scores[document], self.documents[document]) for document in best[offset:]]
+
+
+class ReviewSearchStore:
+    """
+    Holds the ReviewIndex built from load() (a callable returning every review,
+    or None on failure). The index is built in the background, on first use and
+    again once it is older than max_age seconds; the previous index keeps
+    serving meanwhile, so searches never wait on the backend. New
+    reviews are added in between with add(). A failed rebuild keeps the
+    previous index serving.
+    """
+
+    def __init__(self, load, max_age=600):
+        self.load = load
+        self.max_age = max_age
+        self.index = None
+        self.built_at = 0.0
+        # Reviews added while a rebuild is loading, replayed into the new index
+        self._pending = None
+        self._rebuilding = threading.Lock()
+
+    def get(self, wait=False):
+        """
+        Returns the current index, or None until one has been built: the first
+        call starts the build in the background (see warming) unless wait is
+        True, when it builds the index and waits for it.
+        """
+        index = self.index
+        if index is None:
+            if not wait:
+                self.rebuild_in_background()
+                return self.index
+            with self._rebuilding:
+                if self.index is None:
+                    self._rebuild()
+            return self.index
+        if time.monotonic() - self.built_at >= self.max_age:
+            self.rebuild_in_background()
+        return index
+
+    @property
+    def warming(self):
+        """
+        True while the first index is being built.
+        """
+        return self.index is None and self._rebuilding.locked()
+
+    def rebuild_in_background(self):
+        if self._rebuilding.acquire(blocking=False):
+            threading.Thread(target=self._rebuild, kwargs={"release": True},
+                             name="review-search-index", daemon=True).start()
+
+    def _rebuild(self, release=False):
+        started = time.perf_counter()
+        pending = self._pending = []
+        try:
+            reviews = self.load()
+        except Exception:
+            logger.exception("Review search index rebuild raised")
+            reviews = None
+        try:
+            # Retry after another max_age either way
+            self.built_at = time.monotonic()
+            if not isinstance(reviews, list):
+                self._pending = None
+                logger.warning("Review search index rebuild failed; keeping the previous index")
+                return
+            index = self.index = ReviewIndex(reviews)
+            # add() calls from here on reach the new index directly; replay the
+            # earlier ones (a review added twice just replaces itself)
+            self._pending = None
+            index.add(pending)
+            logger.info("Indexed %d reviews in %.1f ms", len(index), (time.perf_counter() - started) * 1000)
+        finally:
+            if release:
+                self._rebuilding.release()
+
+    def add(self, reviews):
+        """
+        Adds freshly stored reviews to the index, if one has been built (the next
+        build fetches them from the backend anyway).
+        """
+        pending = self._pending
+        if pending is not None:
+            pending.extend(reviews)
+        if self.index is not None:
+            self.index.add(reviews)
@@ -0,0 +1,251 @@
+# server/djangoapp/sentiment_cache.py
+
+import hashlib
+import json
+import os
+import sqlite3
+import threading
+import time
+import unicodedata
+from collections import OrderedDict
+from pathlib import Path
+
+from dotenv import load_dotenv
+
+load_dotenv()
+
+# --- Environment Configuration ---
+# Entries held in the in-process LRU tier
+sentiment_cache_memory_size = int(os.getenv('sentiment_cache_memory_size', default=10000))
+# Rows kept in the persistent SQLite tier (oldest-accessed rows are evicted first)
+sentiment_cache_disk_size = int(os.getenv('sentiment_cache_disk_size', default=1000000))
+# Disk hits whose access time is written back in one batch, and the longest a
+# pending access time waits (seconds) before the next cache operation flushes it
+sentiment_cache_touch_batch = int(os.getenv('sentiment_cache_touch_batch', default=500))
+sentiment_cache_touch_interval = float(os.getenv('sentiment_cache_touch_interval', default=60))
+# SQLite file for the persistent tier; set it to an empty value to keep the cache in memory only
+sentiment_cache_path = os.getenv(
+    'sentiment_cache_path',
+    default=str(Path(__file__).resolve().parent.parent / 'sentiment_cache.sqlite3'))
+
+# Bump when the analyzer's scoring changes so old results are no longer served
+CACHE_KEY_VERSION = "v1"
+
+
+def normalize_text(text):
+    """
+    Normalizes review text before hashing: Unicode NFC, whitespace collapsed and
+    trimmed. Case is kept, because VADER scores ALL-CAPS words differently.
+    """
+    return " ".join(unicodedata.normalize("NFC", text or "").split())
+
+
+def cache_key(text):
+    """
+    Returns the content address (SHA-256 hex digest) of a review text.
+    """
+    payload = CACHE_KEY_VERSION + "\0" + normalize_text(text)
+    return hashlib.sha256(payload.encode("utf-8")).hexdigest()
+
+
+class SentimentCache:
+    """
+    Two-tier cache of sentiment results keyed by the hash of the normalized text:
+    an in-process LRU in front of a persistent SQLite table that survives restarts.
+    Both tiers evict by size. Safe to share between threads, and the SQLite file
+    can be shared by several worker processes: disk hits only record their
+    access time in memory and write it back in batches, so reads don't contend
+    for the write lock, and the disk bound is checked against SELECT COUNT(*),
+    which sees every process's rows.
+    """
+
+    def __init__(self, path=None, memory_size=None, disk_size=None):
+        self.memory_size = memory_size or sentiment_cache_memory_size
+        self.disk_size = disk_size or sentiment_cache_disk_size
+        self._memory = OrderedDict()
+        self._lock = threading.Lock()
+        self._connection = None
+        # Last row count read from the table, and rows this process inserted since
+        self._disk_rows = 0
+        self._inserted = 0
+        # Rows inserted between two counts (about 1% of the bound)
+        self.count_every = max(1, self.disk_size // 100)
+        # key -> access time of disk hits not written back yet
+        self._touched = {}
+        self._touched_since = None
+        self.hits_memory = 0
+        self.hits_disk = 0
+        self.misses = 0
+        self.evictions = 0
+        if path:
+            self._open(path)
+
+    def _open(self, path):
+        self._connection = sqlite3.connect(path, timeout=5, check_same_thread=False, isolation_level=None)
+        # WAL lets several worker processes read the file while one writes
+        self._connection.execute("PRAGMA journal_mode=WAL")
+        self._connection.execute("PRAGMA synchronous=NORMAL")
+        self._connection.execute(
+            "CREATE TABLE IF NOT EXISTS sentiment_cache ("
+            " key TEXT PRIMARY KEY, result TEXT NOT NULL, accessed REAL NOT NULL)")
+        self._connection.execute(
+            "CREATE INDEX IF NOT EXISTS sentiment_cache_accessed ON sentiment_cache (accessed)")
+        self._disk_rows = self._connection.execute("SELECT COUNT(*) FROM sentiment_cache").fetchone()[0]
+
+    # --- Lookups ---
+    def get(self, text):
+        """
+        Returns the cached result for a text, or None on a miss.
+        """
+        return self.get_many([text])[0]
+
+    def get_many(self, texts):
+        """
+        Returns the cached result (or None) for each text, in order.
+        """
+        keys = [cache_key(text) for text in texts]
+        results = [None] * len(keys)
+        with self._lock:
+            missing = {}
+            for index, key in enumerate(keys):
+                result = self._memory.get(key)
+                if result is not None:
+                    self._memory.move_to_end(key)
+                    self.hits_memory += 1
+                    results[index] = result
+                else:
+                    missing.setdefault(key, []).append(index)
+
+            if missing and self._connection is not None:
+                found = self._load(list(missing))
+                for key, result in found.items():
+                    self._remember(key, result)
+                    for index in missing.pop(key):
+                        results[index] = result
+                        self.hits_disk += 1
+
+            self.misses += sum(len(indexes) for indexes in missing.values())
+        return results
+
+    def _load(self, keys):
+        found = {}
+        # Stay under SQLite's bound-parameter limit
+        for start in range(0, len(keys), 500):
+            chunk = keys[start:start + 500]
+            placeholders = ",".join("?" * len(chunk))
+            rows = self._connection.execute(
+                f"SELECT key, result FROM sentiment_cache WHERE key IN ({placeholders})", chunk).fetchall()
+            for key, result in rows:
+                found[key] = json.loads(result)
+        if found:
+            # Refresh the access time so hot rows survive disk eviction, in batches
+            now = time.time()
+            self._touched.update(dict.fromkeys(found, now))
+            if self._touched_since is None:
+                self._touched_since = now
+            if (len(self._touched) >= sentiment_cache_touch_batch
+                    or now - self._touched_since >= sentiment_cache_touch_interval):
+                self._connection.execute("BEGIN IMMEDIATE")
+                self._flush_touched()
+                self._connection.execute("COMMIT")
+        return found
+
+    def _flush_touched(self):
+        # Runs inside the caller's write transaction
+        if self._touched:
+            self._connection.executemany(
+                "UPDATE sentiment_cache SET accessed = ? WHERE key = ?",
+                [(accessed, key) for key, accessed in self._touched.items()])
+        self._touched = {}
+        self._touched_since = None
+
+    # --- Updates ---
+    def set(self, text, result):
+        self.set_many([(text, result)])
+
+    def set_many(self, items):
+        """
+        Stores (text, result) pairs in both tiers.
+        """
+        entries = {cache_key(text): result for text, result in items}
+        if not entries:
+            return
+        with self._lock:
+            for key, result in entries.items():
+                self._remember(key, result)
+            if self._connection is not None:
+                now = time.time()
+                self._connection.execute("BEGIN IMMEDIATE")
+                # Piggyback pending access times on this write
+                self._flush_touched()
+                before = self._connection.total_changes
+                self._connection.executemany(
+                    "INSERT OR IGNORE INTO sentiment_cache (key, result, accessed) VALUES (?, ?, ?)",
+                    [(key, json.dumps(result), now) for key, result in entries.items()])
+                inserted = self._connection.total_changes - before
+                self._disk_rows += inserted
+                self._inserted += inserted
+                if self._inserted >= self.count_every or self._disk_rows > self.disk_size:
+                    self._inserted = 0
+                    # Other processes insert into the same file, so count the table
+                    self._disk_rows = self._connection.execute("SELECT COUNT(*) FROM sentiment_cache").fetchone()[0]
+                    if self._disk_rows > self.disk_size:
+                        self._evict_disk()
+                self._connection.execute("COMMIT")
+
+    def _remember(self, key, result):
+        self._memory[key] = result
+        self._memory.move_to_end(key)
+        while len(self._memory) > self.memory_size:
+            self._memory.popitem(last=False)
+            self.evictions += 1
+
+    def _evict_disk(self):
+        # Trim to 90% of the cap so eviction runs once per batch of inserts, not per insert
+        excess = self._disk_rows - int(self.disk_size * 0.9)
+        evicted = self._connection.execute(
+            "DELETE FROM sentiment_cache WHERE key IN ("
+            " SELECT key FROM sentiment_cache ORDER BY accessed LIMIT ?)", (excess,)).rowcount
+        self._disk_rows -= evicted
+        self.evictions += evicted
+
+    def clear(self):
+        with self._lock:
+            self._memory.clear()
+            if self._connection is not None:
+                self._connection.execute("DELETE FROM sentiment_cache")
+                self._disk_rows = 0
+                self._touched = {}
+                self._touched_since = None
+
+    def stats(self):
+        """
+        Returns the hit/miss counters and current tier sizes.
+        """
+        with self._lock:
+            lookups = self.hits_memory + self.hits_disk + self.misses
+            return {
+                "hits_memory": self.hits_memory,
+                "hits_disk": self.hits_disk,
+                "misses": self.misses,
+                "hit_rate": (self.hits_memory + self.hits_disk) / lookups if lookups else 0.0,
+                "evictions": self.evictions,
+                "memory_entries": len(self._memory),
+                "disk_entries": self._disk_rows,
+            }
+
+
+_cache = None
+_cache_lock = threading.Lock()
+
+
+def get_sentiment_cache():
+    """
+    Returns the process-wide SentimentCache, opening it on first use.
+    """
+    global _cache
+    if _cache is None:
+        with _cache_lock:
+            if _cache is None:
+                _cache = SentimentCache(path=sentiment_cache_path or None)
+    return _cache
@@ -0,0 +1,95 @@
+# server/djangoapp/sentiment_summary.py
+
+import logging
+from collections import Counter, defaultdict
+
+from django.db import connection, transaction
+from django.utils import timezone
+
+from .models import DealerSentimentSummary
+
+logger = logging.getLogger(__name__)
+
+SENTIMENTS = ("positive", "neutral", "negative")
+COUNTERS = ("review_count",) + SENTIMENTS + ("purchases",)
+
+
+def review_counts(reviews):
+    """
+    Tallies review dicts per dealer: {dealer_id: Counter(review_count, positive,
+    neutral, negative, purchases)}. Reviews without a valid dealership are skipped;
+    a sentiment other than the three labels (e.g. "N/A") only counts as a review.
+    """
+    counts = defaultdict(Counter)
+    for review in reviews:
+        try:
+            dealer_id = int(review.get("dealership"))
+        except (TypeError, ValueError):
+            continue
+        tally = counts[dealer_id]
+        tally["review_count"] += 1
+        if review.get("sentiment") in SENTIMENTS:
+            tally[review["sentiment"]] += 1
+        if review.get("purchase") is True:
+            tally["purchases"] += 1
+    return counts
+
+
+def record_reviews(reviews):
+    """
+    Adds newly stored reviews to their dealers' summaries with in-database
+    increments (col = col + n), so concurrent writers never overwrite each
+    other's counts. A batch of reviews is applied in one transaction, with one
+    executemany() for all of its dealers.
+    """
+    counts = review_counts(reviews)
+    if not counts:
+        return
+    table = connection.ops.quote_name(DealerSentimentSummary._meta.db_table)
+    # Raw SQL skips the field's conversion, so adapt the value like the ORM would
+    updated = connection.ops.adapt_datetimefield_value(timezone.now())
+    assignments = ", ".join(f"{field} = {field} + %s" for field in COUNTERS)
+    with transaction.atomic():
+        DealerSentimentSummary.objects.bulk_create(
+            [DealerSentimentSummary(dealer_id=dealer_id) for dealer_id in counts], ignore_conflicts=True)
+        with connection.cursor() as cursor:
+            cursor.executemany(
+                f"UPDATE {table} SET {assignments}, updated = %s WHERE dealer_id = %s",
+                [[tally[field] for field in COUNTERS] + [updated, dealer_id]
+                 for dealer_id, tally in counts.items()])
+
+
+def rebuild_summaries(reviews, fetched_at=None):
+    """
+    Sets every summary to the aggregates computed from the full list of reviews,
+    in one transaction: rows are upserted in place and those of dealers without
+    reviews deleted, so readers never see the table empty. fetched_at is when the
+    review list was read; a summary incremented since then is left alone, as the
+    list may predate those reviews. Returns (dealers summarized, dealers skipped).
+    """
+    counts = review_counts(reviews)
+    with transaction.atomic():
+        # Lock the rows so no increment lands between the check and the upsert
+        updated = dict(DealerSentimentSummary.objects.select_for_update().values_list("dealer_id", "updated"))
+        skipped = {dealer_id for dealer_id, at in updated.items() if fetched_at is not None and at >= fetched_at}
+        DealerSentimentSummary.objects.bulk_create(
+            [DealerSentimentSummary(dealer_id=dealer_id, **tally)
+             for dealer_id, tally in counts.items() if dealer_id not in skipped],
+            update_conflicts=True, unique_fields=["dealer_id"], update_fields=COUNTERS + ("updated",))
+        DealerSentimentSummary.objects.filter(dealer_id__in=set(updated) - set(counts) - skipped).delete()
+    return len(counts) - len(skipped & set(counts)), len(skipped)
+
+
+def summary_payload(dealer_id, summary=None):
+    """
+    JSON-ready view of a dealer's summary (all zeros for a dealer without reviews).
+    """
+    summary = summary or DealerSentimentSummary(dealer_id=dealer_id)
+    total = summary.review_count
+    return {
+        "dealer_id": dealer_id,
+        "review_count": total,
+        "sentiments": {sentiment: getattr(summary, sentiment) for sentiment in SENTIMENTS},
+        "positive_share": round(summary.positive / total, 4) if total else None,
+        "purchase_rate": round(summary.purchases / total, 4) if total else None,
+    }
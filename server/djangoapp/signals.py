@@ -0,0 +1,19 @@
+# server/djangoapp/signals.py
+
+from django.db.models.signals import post_delete, post_save
+from django.dispatch import receiver
+
+from .http_cache import invalidate_catalogue
+from .models import CarMake, CarModel
+
+
+@receiver(post_save, sender=CarMake)
+@receiver(post_delete, sender=CarMake)
+@receiver(post_save, sender=CarModel)
+@receiver(post_delete, sender=CarModel)
+def car_catalogue_changed(sender, **kwargs):
+    """
+    Drops the cached get_cars payload whenever a make or model is saved or
+    deleted, including edits made through the admin.
+    """
+    invalidate_catalogue()
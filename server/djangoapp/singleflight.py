@@ -0,0 +1,78 @@
+# server/djangoapp/singleflight.py
+
+import asyncio
+import threading
+import weakref
+
+
+class _Call:
+    def __init__(self):
+        self.done = threading.Event()
+        self.result = None
+        self.error = None
+
+
+class SingleFlight:
+    """
+    Coalesces concurrent calls by key across threads: while one call for a key is
+    running, other callers for the same key wait for it and get its result (or
+    its exception) instead of running their own. Nothing is cached afterwards;
+    the next call after it finishes runs again.
+    """
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._calls = {}
+
+    def do(self, key, fn):
+        """
+        Returns (result, shared): fn()'s result, and whether it came from a call
+        started by another thread.
+        """
+        with self._lock:
+            call = self._calls.get(key)
+            leader = call is None
+            if leader:
+                call = self._calls[key] = _Call()
+
+        if not leader:
+            call.done.wait()
+            if call.error is not None:
+                raise call.error
+            return call.result, True
+
+        try:
+            call.result = fn()
+        except BaseException as e:
+            call.error = e
+            raise
+        finally:
+            with self._lock:
+                del self._calls[key]
+            call.done.set()
+        return call.result, False
+
+    def in_flight(self):
+        with self._lock:
+            return len(self._calls)
+
+
+class AsyncSingleFlight:
+    """
+    SingleFlight for coroutines: concurrent tasks on the same event loop share
+    one in-flight call per key. A caller being cancelled doesn't cancel the
+    shared call for the others.
+    """
+
+    def __init__(self):
+        # Futures are bound to their loop, so keep one table per running loop
+        self._calls = weakref.WeakKeyDictionary()
+
+    async def do(self, key, coro_fn):
+        calls = self._calls.setdefault(asyncio.get_running_loop(), {})
+        task = calls.get(key)
+        shared = task is not None
+        if not shared:
+            task = calls[key] = asyncio.ensure_future(coro_fn())
+            task.add_done_callback(lambda done: calls.pop(key) if calls.get(key) is done else None)
+        return await asyncio.shield(task), shared
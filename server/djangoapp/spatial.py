@@ -0,0 +1,199 @@
+# server/djangoapp/spatial.py
+
+import hashlib
+import heapq
+import json
+import math
+import threading
+import time
+
+EARTH_RADIUS_KM = 6371.0088
+
+
+def haversine_km(lat1, lon1, lat2, lon2):
+    """
+    Great-circle distance in kilometres between two (lat, long) points in degrees.
+    """
+    phi1, phi2 = math.radians(lat1), math.radians(lat2)
+    dphi = phi2 - phi1
+    dlambda = math.radians(lon2 - lon1)
+    a = math.sin(dphi / 2) ** 2 + math.cos(phi1) * math.cos(phi2) * math.sin(dlambda / 2) ** 2
+    return 2 * EARTH_RADIUS_KM * math.asin(min(1.0, math.sqrt(a)))
+
+
+class GridIndex:
+    """
+    Uniform lat/long grid over a set of records carrying "lat" and "long".
+    nearest() walks rings of cells outward from the query point and stops as soon
+    as no unvisited cell can hold anything closer than the current k-th result.
+    Rings only cover their perimeter, clipped to the rows that hold data, and a
+    query far from all the data (where the rings would stay empty for a long way)
+    falls back to a linear scan once it has looked at a few cells per point, so
+    no query costs much more than computing every distance once.
+    """
+    # Cells a query may look at per point before nearest() switches to a scan (a
+    # cell lookup costs about a tenth of a distance computation)
+    CELLS_PER_POINT = 8
+    # Allowance of cells on top of CELLS_PER_POINT * len(points)
+    MIN_CELLS = 64
+
+    def __init__(self, records, cell_degrees=1.0):
+        self.cell_degrees = cell_degrees
+        self.columns = int(math.ceil(360 / cell_degrees))
+        self.cells = {}
+        self.points = []
+        self.max_abs_lat = 0.0
+        for record in records:
+            try:
+                lat, lon = float(record["lat"]), float(record["long"])
+            except (KeyError, TypeError, ValueError):
+                continue  # Records without usable coordinates can't be located
+            self.points.append((lat, lon, record))
+            self.cells.setdefault(self._cell(lat, lon), []).append(len(self.points) - 1)
+            self.max_abs_lat = max(self.max_abs_lat, abs(lat))
+        self.max_ring = int(math.ceil(180 / cell_degrees))
+        # Range of rows holding data; rings skip the rows outside it
+        rows = [row for row, _ in self.cells]
+        self.min_row, self.max_row = (min(rows), max(rows)) if rows else (0, -1)
+        self.max_cells = self.CELLS_PER_POINT * len(self.points) + self.MIN_CELLS
+
+    def __len__(self):
+        return len(self.points)
+
+    def _cell(self, lat, lon):
+        return (int(math.floor(lat / self.cell_degrees)),
+                int(math.floor((lon + 180) / self.cell_degrees)) % self.columns)
+
+    def _ring(self, row, column, ring):
+        """
+        Yields the cells at Chebyshev distance ring from (row, column): the top and
+        bottom rows of the square plus its two side columns, leaving out rows that
+        hold no data and columns already covered after wrapping around the globe.
+        """
+        if ring == 0:
+            yield row, column
+            return
+        for edge_row in (row - ring, row + ring):
+            if self.min_row <= edge_row <= self.max_row:
+                if 2 * ring + 1 >= self.columns:
+                    edge_columns = range(self.columns)
+                else:
+                    edge_columns = ((column + d_column) % self.columns for d_column in range(-ring, ring + 1))
+                for edge_column in edge_columns:
+                    yield edge_row, edge_column
+        # Past half the globe the side columns wrap onto cells of earlier rings
+        if 2 * ring > self.columns:
+            return
+        side_columns = {(column - ring) % self.columns, (column + ring) % self.columns}
+        for side_row in range(max(row - ring + 1, self.min_row), min(row + ring - 1, self.max_row) + 1):
+            for side_column in side_columns:
+                yield side_row, side_column
+
+    def _scan(self, lat, lon, k, radius_km):
+        distances = ((haversine_km(lat, lon, point_lat, point_lon), index)
+                     for index, (point_lat, point_lon, _) in enumerate(self.points))
+        if radius_km is not None:
+            distances = (entry for entry in distances if entry[0] <= radius_km)
+        return [(distance, self.points[index][2]) for distance, index in heapq.nsmallest(k, distances)]
+
+    def nearest(self, lat, lon, k=5, radius_km=None):
+        """
+        Returns up to k (distance_km, record) pairs nearest to (lat, lon), closest
+        first, optionally limited to radius_km.
+        """
+        if not self.points or k <= 0:
+            return []
+        row, column = self._cell(lat, lon)
+        # Every cell n rings away is at least n - 1 cells away in latitude or in
+        # longitude. A latitude gap bounds the distance by itself; a longitude gap
+        # does so through the haversine formula, with both points no further from
+        # the equator than L: sin(d / 2R) >= cos(L) * sin(dlon / 2)
+        cos_widest = math.cos(math.radians(min(90.0, max(self.max_abs_lat, abs(lat)))))
+        best = []  # max-heap of (-distance, index) holding the k closest so far
+        visited = 0
+        cells_seen = 0
+        for ring in range(self.max_ring + 1):
+            # Nothing in this ring (or beyond) can be closer than this
+            gap = math.radians(min(max(ring - 1, 0) * self.cell_degrees, 180.0))
+            floor_km = EARTH_RADIUS_KM * min(gap, 2 * math.asin(cos_widest * math.sin(gap / 2)))
+            if radius_km is not None and floor_km > radius_km:
+                break
+            if len(best) == k and floor_km > -best[0][0]:
+                break
+            if visited == len(self.points):
+                break
+            # Rings are counted too, as walking through empty ones isn't free either
+            cells_seen += 1
+            if cells_seen > self.max_cells:
+                return self._scan(lat, lon, k, radius_km)
+            for cell in self._ring(row, column, ring):
+                cells_seen += 1
+                for index in self.cells.get(cell, ()):
+                    visited += 1
+                    point_lat, point_lon, _ = self.points[index]
+                    distance = haversine_km(lat, lon, point_lat, point_lon)
+                    if radius_km is not None and distance > radius_km:
+                        continue
+                    if len(best) < k:
+                        heapq.heappush(best, (-distance, index))
+                    elif distance < -best[0][0]:
+                        heapq.heapreplace(best, (-distance, index))
+        # Closest first, ties in source order (as _scan() returns them)
+        best.sort(key=lambda entry: (-entry[0], entry[1]))
+        return [(-negative, self.points[index][2]) for negative, index in best]
+
+
+def fingerprint(records):
+    """
+    Content hash of a dealer list, used to skip rebuilding an unchanged index.
+    """
+    return hashlib.sha256(json.dumps(records, sort_keys=True, default=str).encode()).hexdigest()
+
+
+class DealerLocator:
+    """
+    Keeps a GridIndex of all dealerships, fetched through load() (a callable that
+    returns the dealer list or None). The dealer list is re-fetched once it is
+    older than max_age seconds, and the index is rebuilt only if it changed.
+    """
+
+    def __init__(self, load, max_age=300, cell_degrees=1.0):
+        self.load = load
+        self.max_age = max_age
+        self.cell_degrees = cell_degrees
+        self.index = None
+        self.fingerprint = None
+        self.loaded_at = 0.0
+        self._lock = threading.Lock()
+
+    def get_index(self):
+        """
+        Returns the current index, refreshing it first when it is stale. If the
+        refresh fails the previous index keeps serving.
+        """
+        if self.index is not None and time.monotonic() - self.loaded_at < self.max_age:
+            return self.index
+        with self._lock:
+            # Another thread may have refreshed while we waited for the lock
+            if self.index is None or time.monotonic() - self.loaded_at >= self.max_age:
+                self.rebuild(self.load())
+        return self.index
+
+    def rebuild(self, records):
+        """
+        Swaps in an index for a new dealer list (no-op if the content is unchanged).
+        """
+        if not isinstance(records, list):
+            if self.index is not None:
+                # Keep serving the old index; retry after another max_age
+                self.loaded_at = time.monotonic()
+            return
+        self.loaded_at = time.monotonic()
+        digest = fingerprint(records)
+        if digest != self.fingerprint:
+            self.index = GridIndex(records, self.cell_degrees)
+            self.fingerprint = digest
+
+    def nearest(self, lat, lon, k=5, radius_km=None):
+        index = self.get_index()
+        return index.nearest(lat, lon, k, radius_km) if index is not None else None
@@ -0,0 +1,64 @@
+import json
+from unittest import mock
+
+from django.core.cache import cache
+from django.test import TestCase
+
+from djangoapp import http_cache
+from djangoapp.populate import load_catalogue
+
+MAKES = ["Nissan", "Kia", "Audi"]
+
+
+def records(count):
+    return [
+        {"make": MAKES[i % len(MAKES)], "model": f"Model {i}", "bodyType": "Sedan", "year": 2015 + i % 9, "price": 20000 + i}
+        for i in range(count)
+    ]
+
+
+class GetCarsTests(TestCase):
+    def setUp(self):
+        cache.clear()
+        http_cache.forget_catalogue_generation()
+        self.addCleanup(cache.clear)
+        self.addCleanup(http_cache.forget_catalogue_generation)
+        load_catalogue(records(250))
+
+    def get(self, **params):
+        response = self.client.get("/djangoapp/get_cars", params)
+        self.assertEqual(response.status_code, 200)
+        content = b"".join(response.streaming_content) if response.streaming else response.content
+        return json.loads(content)
+
+    def test_without_paging_params_returns_every_model(self):
+        payload = self.get()
+        self.assertEqual(len(payload["CarModels"]), 250)
+        self.assertIsNone(payload["next_cursor"])
+
+    def test_unpaged_filters_still_apply(self):
+        payload = self.get(make="kia")
+        self.assertEqual(len(payload["CarModels"]), 83)
+        self.assertEqual({car["CarMake"] for car in payload["CarModels"]}, {"Kia"})
+
+    def test_unpaged_catalogue_larger_than_a_cached_page_is_streamed(self):
+        with mock.patch("djangoapp.views.STREAM_PAGE_SIZE", 100):
+            response = self.client.get("/djangoapp/get_cars")
+        self.assertTrue(response.streaming)
+        payload = json.loads(b"".join(response.streaming_content))
+        self.assertEqual(len(payload["CarModels"]), 250)
+        self.assertIsNone(payload["next_cursor"])
+
+    def test_cursor_pages_cover_the_catalogue_once(self):
+        names, cursor = [], None
+        while True:
+            payload = self.get(limit=40, **({"cursor": cursor} if cursor else {}))
+            names += [car["CarModel"] for car in payload["CarModels"]]
+            cursor = payload["next_cursor"]
+            if cursor is None:
+                break
+        self.assertEqual(names, [f"Model {i}" for i in range(250)])
+
+    def test_bad_parameters_are_rejected(self):
+        for params in ({"limit": "0"}, {"limit": "x"}, {"cursor": "!!"}, {"type": "Tractor"}):
+            self.assertEqual(self.get(**params)["status"], 400)
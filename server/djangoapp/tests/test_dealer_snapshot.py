@@ -0,0 +1,45 @@
+import threading
+from unittest import mock
+
+from django.test import SimpleTestCase, override_settings
+
+from djangoapp import views
+from djangoapp.dealer_snapshot import DealerSnapshotStore
+
+DEALERS = [
+    {"id": 1, "state": "Texas", "full_name": "A"},
+    {"id": 2, "state": "Kansas", "full_name": "B"},
+]
+
+
+class DealerSnapshotStoreTests(SimpleTestCase):
+    def test_nothing_runs_until_first_use(self):
+        load = mock.Mock(return_value=DEALERS)
+        threads = threading.active_count()
+        store = DealerSnapshotStore(load, interval=60)
+        self.assertEqual(threading.active_count(), threads)
+        load.assert_not_called()
+        self.assertEqual(store.get().by_state["Texas"], [DEALERS[0]])
+        self.assertEqual(load.call_count, 1)
+
+    def test_failed_refresh_keeps_the_previous_snapshot(self):
+        load = mock.Mock(return_value=DEALERS)
+        store = DealerSnapshotStore(load, interval=0)
+        first = store.get()
+        load.return_value = None
+        store.refresh()
+        self.assertIs(store.snapshot, first)
+        self.assertTrue(store.failing)
+
+    def test_unknown_states_and_ids(self):
+        snapshot = DealerSnapshotStore(lambda: DEALERS).get()
+        self.assertEqual(snapshot.dealers_body("Ohio")[0], b'{"status": 200, "dealers": []}')
+        self.assertIsNone(snapshot.dealer_body(99))
+
+
+class SnapshotSettingTests(SimpleTestCase):
+    @override_settings(DEALER_SNAPSHOT=False)
+    def test_disabled_snapshot_is_never_loaded(self):
+        with mock.patch.object(views.dealer_snapshot, "get") as get:
+            self.assertIsNone(views.current_dealer_snapshot())
+        get.assert_not_called()
@@ -0,0 +1,35 @@
+from django.contrib.auth import hashers as django_hashers
+from django.test import SimpleTestCase, override_settings
+
+from djangoapp.hashers import PBKDF2PasswordHasher
+
+DEFAULT = django_hashers.PBKDF2PasswordHasher.iterations
+
+
+class PBKDF2PasswordHasherTests(SimpleTestCase):
+    def setUp(self):
+        self.hasher = PBKDF2PasswordHasher()
+
+    def encode(self, iterations):
+        return self.hasher.encode("secret", self.hasher.salt(), iterations)
+
+    @override_settings(DEBUG=True, PASSWORD_HASH_ITERATIONS=1000)
+    def test_override_applies_in_debug(self):
+        self.assertEqual(self.hasher.iterations, 1000)
+        self.assertTrue(self.hasher.verify("secret", self.hasher.encode("secret", self.hasher.salt())))
+
+    @override_settings(DEBUG=False, PASSWORD_HASH_ITERATIONS=1000)
+    def test_override_is_ignored_outside_debug(self):
+        self.assertEqual(self.hasher.iterations, DEFAULT)
+
+    @override_settings(DEBUG=True, PASSWORD_HASH_ITERATIONS=1000)
+    def test_lowered_count_never_downgrades_stored_hashes(self):
+        self.assertFalse(self.hasher.must_update(self.encode(DEFAULT)))
+        self.assertFalse(self.hasher.must_update(self.encode(1000)))
+        self.assertTrue(self.hasher.must_update(self.encode(500)))
+
+    @override_settings(DEBUG=False)
+    def test_weaker_hashes_are_upgraded_and_stay_readable_by_django(self):
+        encoded = self.encode(1000)
+        self.assertTrue(self.hasher.must_update(encoded))
+        self.assertTrue(django_hashers.PBKDF2PasswordHasher().verify("secret", encoded))
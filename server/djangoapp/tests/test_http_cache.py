@@ -0,0 +1,30 @@
+from django.test import TestCase, override_settings
+
+from djangoapp import http_cache
+from djangoapp.models import CacheGeneration
+
+
+@override_settings(CATALOGUE_GENERATION_TTL=60)
+class CatalogueCacheKeyTests(TestCase):
+    def setUp(self):
+        http_cache.forget_catalogue_generation()
+        self.addCleanup(http_cache.forget_catalogue_generation)
+
+    def test_repeated_keys_do_not_query_the_database(self):
+        with self.assertNumQueries(1):
+            first = http_cache.catalogue_cache_key("all")
+            second = http_cache.catalogue_cache_key("all")
+        self.assertEqual(first, second)
+
+    def test_local_invalidation_takes_effect_on_commit(self):
+        before = http_cache.catalogue_cache_key("all")
+        with self.captureOnCommitCallbacks(execute=True):
+            http_cache.invalidate_catalogue()
+        self.assertNotEqual(http_cache.catalogue_cache_key("all"), before)
+
+    def test_other_processes_changes_show_after_the_ttl(self):
+        before = http_cache.catalogue_cache_key("all")
+        CacheGeneration.objects.create(name=http_cache.CATALOGUE_GENERATION, value=5)
+        self.assertEqual(http_cache.catalogue_cache_key("all"), before)
+        with override_settings(CATALOGUE_GENERATION_TTL=0):
+            self.assertEqual(http_cache.catalogue_cache_key("all"), "get_cars:5:all")
@@ -0,0 +1,94 @@
+import random
+
+from django.test import SimpleTestCase
+
+from djangoapp.inventory import (
+    InventoryIndex, InventoryQueryError, ORDERINGS, parse_query, search_payload,
+)
+
+MAKES = ["Audi", "Kia", "Nissan", "Toyota", "Ford"]
+BODY_TYPES = ["Sedan", "SUV", "Pickup"]
+
+
+def inventory(count, seed=3):
+    generator = random.Random(seed)
+    return [
+        {"make": generator.choice(MAKES), "model": f"M{generator.randrange(20)}",
+         "bodyType": generator.choice(BODY_TYPES), "year": generator.randrange(2015, 2024),
+         "dealer_id": generator.randrange(1, 51), "mileage": generator.randrange(0, 100000), "id": number}
+        for number in range(count)
+    ]
+
+
+def expected(records, params):
+    query = parse_query(params)
+    field = query["sort"].lstrip("-")
+    matches = []
+    for record in records:
+        values = {key: value.casefold() if isinstance(value, str) else value for key, value in record.items()}
+        if any(values[key] != value for key, value in query["equal"].items()):
+            continue
+        if any(low is not None and values[key] < low or high is not None and values[key] > high
+               for key, (low, high) in query["ranges"].items()):
+            continue
+        matches.append(record)
+    key = (lambda record: record[field].casefold()) if field == "make" else (lambda record: record[field])
+    return sorted(matches, key=key, reverse=query["sort"].startswith("-"))
+
+
+class InventoryIndexTests(SimpleTestCase):
+    @classmethod
+    def setUpClass(cls):
+        super().setUpClass()
+        cls.records = inventory(2000)
+        cls.index = InventoryIndex(cls.records)
+
+    def pages(self, params):
+        """
+        Follows next_cursor to the end, returning (counts seen, records).
+        """
+        counts, cars, cursor = set(), [], None
+        while True:
+            payload = search_payload(self.index, parse_query(dict(params, **({"cursor": cursor} if cursor else {}))))
+            counts.add(payload["count"])
+            cars += payload["cars"]
+            cursor = payload["next_cursor"]
+            if cursor is None:
+                return counts, cars
+
+    def test_pages_match_a_filtered_sort(self):
+        queries = [
+            {},  # No filters
+            {"make": "kia"},  # Broad: bitmap walk
+            {"make": "Audi", "body_type": "suv", "year_min": "2016"},
+            {"dealer_id": "7"},  # Selective: scan
+            {"dealer_id": "7", "mileage_max": "50000"},
+            {"year_min": "2022", "mileage_min": "99000"},  # Sparse bitmap matches
+            {"model": "M3", "make": "Ford", "year_max": "2019"},
+            {"make": "Lada"},  # No matches
+        ]
+        for params in queries:
+            for sort in ORDERINGS:
+                for limit in ("7", "1000"):
+                    query = dict(params, sort=sort, limit=limit)
+                    with self.subTest(**query):
+                        wanted = expected(self.records, query)
+                        counts, cars = self.pages(query)
+                        self.assertEqual(counts, {len(wanted)})
+                        self.assertEqual([car["year"] for car in cars], [car["year"] for car in wanted])
+                        self.assertEqual([car["mileage"] for car in cars], [car["mileage"] for car in wanted])
+
+    def test_ties_keep_source_order_both_ways(self):
+        index = InventoryIndex([dict(record, year=2020) for record in self.records[:30]])
+        for sort in ("year", "-year"):
+            count, cars, _ = index.search(parse_query({"sort": sort, "limit": "30"}))
+            self.assertEqual([car["mileage"] for car in cars], [record["mileage"] for record in self.records[:30]])
+
+    def test_incomplete_records_are_skipped(self):
+        index = InventoryIndex([{"make": "Kia"}, dict(self.records[0], year="unknown"), self.records[1]])
+        self.assertEqual(len(index), 1)
+
+    def test_bad_parameters(self):
+        for params in ({"sort": "price"}, {"limit": "0"}, {"year_min": "new"}, {"cursor": "!"}):
+            with self.subTest(params=params), self.assertRaises(InventoryQueryError):
+                parse_query(params)
@@ -0,0 +1,45 @@
+import io
+import json
+
+from django.test import SimpleTestCase
+
+from djangoapp.jsonstream import iter_json_array, iter_ndjson
+
+
+def parse(text, chunk_size=65536, **kwargs):
+    return list(iter_json_array(io.StringIO(text), chunk_size=chunk_size, **kwargs))
+
+
+class IterJsonArrayTests(SimpleTestCase):
+    DOCUMENT = '{"meta": {"count": 9}, "cars": [1, 2.5, -3e2, "a,]", true, null, {"x": [1, 2]}, [], 12345.678e-2]}'
+
+    def test_every_chunk_size_gives_the_same_elements(self):
+        expected = json.loads(self.DOCUMENT)["cars"]
+        for chunk_size in range(1, len(self.DOCUMENT) + 1):
+            with self.subTest(chunk_size=chunk_size):
+                self.assertEqual(parse(self.DOCUMENT, chunk_size, key="cars"), expected)
+
+    def test_numbers_split_across_chunks_are_not_cut_short(self):
+        for text in ("[2.5]", "[1e5]", "[12 ,-7.25E+3 ]", "[0.125]"):
+            for chunk_size in range(1, len(text) + 1):
+                with self.subTest(text=text, chunk_size=chunk_size):
+                    self.assertEqual(parse(text, chunk_size), json.loads(text))
+
+    def test_top_level_array_and_bytes_input(self):
+        self.assertEqual(list(iter_json_array(io.BytesIO(b' [ {"a": "\xc3\xa9"} ] '))), [{"a": "é"}])
+        self.assertEqual(parse("[]"), [])
+
+    def test_malformed_arrays_are_rejected(self):
+        for text in ("[1,]", "[1 2]", "[,1]", "[1,,2]", "[2.]", "[1", "{}", "[tru]"):
+            for chunk_size in (1, 2, 65536):
+                with self.subTest(text=text, chunk_size=chunk_size), self.assertRaises(ValueError):
+                    parse(text, chunk_size)
+
+    def test_missing_key(self):
+        with self.assertRaises(ValueError):
+            parse('{"dealers": []}', key="cars")
+
+
+class IterNdjsonTests(SimpleTestCase):
+    def test_skips_blank_lines(self):
+        self.assertEqual(list(iter_ndjson(io.StringIO('{"a": 1}\n\n[2]\n'))), [{"a": 1}, [2]])
@@ -0,0 +1,36 @@
+from django.test import TestCase
+
+from djangoapp.models import CarMake, CarModel
+from djangoapp.populate import initiate, load_catalogue
+
+
+class LoadCatalogueTests(TestCase):
+    def test_makes_match_whatever_their_case(self):
+        initiate()
+        stats = load_catalogue([
+            {"make": "Nissan", "model": "Altima", "bodyType": "Sedan", "year": 2020},
+            {"make": "nissan", "model": "Pathfinder", "bodyType": "SUV", "year": 2023},
+            {"make": "Ford", "model": "F-150", "bodyType": "Pickup", "year": 2021},
+            {"make": "FORD", "model": "Ranger", "bodyType": "Pickup", "year": 2021},
+        ])
+        self.assertEqual(stats, {"makes_created": 1, "models_created": 3, "models_skipped": 1, "invalid": 0})
+        self.assertEqual(list(CarMake.objects.filter(name__iexact="nissan").values_list("name", flat=True)), ["NISSAN"])
+        self.assertEqual(CarModel.objects.filter(car_make__name="NISSAN").count(), 4)
+        self.assertEqual(CarModel.objects.filter(car_make__name="Ford").count(), 2)
+
+    def test_reloading_adds_nothing(self):
+        initiate()
+        makes, models = CarMake.objects.count(), CarModel.objects.count()
+        stats = initiate()
+        self.assertEqual(stats["models_created"], 0)
+        self.assertEqual(stats["models_skipped"], models)
+        self.assertEqual((CarMake.objects.count(), CarModel.objects.count()), (makes, models))
+
+    def test_invalid_records_are_counted_not_loaded(self):
+        stats = load_catalogue([
+            {"make": "Kia", "model": "", "year": 2020},
+            {"make": "Kia", "model": "Rio", "bodyType": "Tractor", "year": 2020},
+            {"make": "Kia", "model": "Rio", "bodyType": "Sedan", "year": 1999},
+        ])
+        self.assertEqual(stats["invalid"], 3)
+        self.assertFalse(CarModel.objects.exists())
@@ -0,0 +1,106 @@
+import asyncio
+from unittest import mock
+
+import requests
+from django.test import SimpleTestCase
+from urllib3.exceptions import MaxRetryError, ReadTimeoutError
+
+from djangoapp import restapis
+from djangoapp.resilience import CircuitBreaker, CircuitOpenError
+
+
+def breaker(**kwargs):
+    return CircuitBreaker("test", **dict({"failure_rate": 0.5, "window": 4, "min_calls": 2, "reset_timeout": 30}, **kwargs))
+
+
+def reply(status):
+    return mock.Mock(status_code=status)
+
+
+def fail(error):
+    def send():
+        raise error
+    return send
+
+
+class CircuitBreakerTests(SimpleTestCase):
+    def test_opens_on_failure_rate_and_fails_fast(self):
+        circuit = breaker()
+        for _ in range(2):
+            self.assertTrue(circuit.allow())
+            circuit.record(False)
+        self.assertEqual(circuit.state, CircuitBreaker.OPEN)
+        self.assertFalse(circuit.allow())
+
+    def test_half_open_lets_one_probe_through(self):
+        circuit = breaker(reset_timeout=0)
+        circuit._open()
+        self.assertTrue(circuit.allow())
+        self.assertFalse(circuit.allow())
+        circuit.record(True)
+        self.assertEqual(circuit.state, CircuitBreaker.CLOSED)
+
+    def test_released_probe_frees_the_slot(self):
+        circuit = breaker(reset_timeout=0)
+        circuit._open()
+        self.assertTrue(circuit.allow())
+        circuit.release()
+        self.assertEqual(circuit.state, CircuitBreaker.HALF_OPEN)
+        self.assertTrue(circuit.allow())
+
+
+class GuardedTests(SimpleTestCase):
+    def outcomes(self, circuit):
+        return list(circuit._outcomes)
+
+    def test_network_errors_and_5xx_are_failures(self):
+        circuit = breaker(min_calls=10)
+        with self.assertRaises(requests.ConnectionError):
+            restapis.guarded(circuit, fail(requests.ConnectionError()))
+        restapis.guarded(circuit, lambda: reply(503))
+        restapis.guarded(circuit, lambda: reply(404))
+        self.assertEqual(self.outcomes(circuit), [False, False, True])
+
+    def test_local_errors_are_not_counted(self):
+        circuit = breaker()
+        with self.assertRaises(ValueError):
+            restapis.guarded(circuit, fail(ValueError("bad url")))
+        self.assertEqual(self.outcomes(circuit), [])
+
+    def test_read_timeouts_clipped_to_a_deadline_are_not_counted(self):
+        circuit = breaker(min_calls=10)
+        clipped = (restapis.http_connect_timeout, restapis.http_read_timeout / 2)
+        retried = requests.ConnectionError(MaxRetryError(None, "/analyze", ReadTimeoutError(None, "/analyze", "timed out")))
+        for error in (requests.ReadTimeout(), retried):
+            with self.assertRaises(requests.RequestException):
+                restapis.guarded(circuit, fail(error), timeout=clipped)
+        self.assertEqual(self.outcomes(circuit), [])
+        with self.assertRaises(requests.ReadTimeout):
+            restapis.guarded(circuit, fail(requests.ReadTimeout()))
+        self.assertEqual(self.outcomes(circuit), [False])
+
+    def test_cancellation_is_not_a_failure(self):
+        circuit = breaker(reset_timeout=0)
+        circuit._open()
+
+        async def hang():
+            await asyncio.sleep(10)
+
+        async def cancel_probe():
+            task = asyncio.ensure_future(restapis.guarded_async(circuit, hang))
+            await asyncio.sleep(0)
+            task.cancel()
+            with self.assertRaises(asyncio.CancelledError):
+                await task
+
+        asyncio.run(cancel_probe())
+        self.assertEqual(circuit.state, CircuitBreaker.HALF_OPEN)
+        self.assertTrue(circuit.allow())
+
+    def test_open_circuit_does_not_call(self):
+        circuit = breaker()
+        circuit._open()
+        send = mock.Mock()
+        with self.assertRaises(CircuitOpenError):
+            restapis.guarded(circuit, send)
+        send.assert_not_called()
@@ -0,0 +1,78 @@
+import threading
+
+from django.test import SimpleTestCase
+
+from djangoapp.review_search import ReviewIndex, ReviewSearchStore, tokenize
+
+REVIEWS = [
+    {"id": 1, "review": "Great service and a great price", "dealership": 15, "car_make": "Audi", "sentiment": "positive"},
+    {"id": 2, "review": "Terrible service, never again", "dealership": 15, "car_make": "Kia", "sentiment": "negative"},
+    {"id": 3, "review": "The price was fair", "dealership": 7, "car_make": "audi", "sentiment": "neutral"},
+    {"id": 4, "review": "Friendly staff", "dealership": 7, "car_make": "Kia", "sentiment": "positive"},
+]
+
+
+def ids(results):
+    return [review["id"] for _, review in results]
+
+
+class ReviewIndexTests(SimpleTestCase):
+    def test_tokenize_drops_stopwords_and_possessives(self):
+        self.assertEqual(tokenize("The dealer's staff WAS great!"), ["dealer", "staff", "great"])
+
+    def test_ranks_by_bm25(self):
+        count, results = ReviewIndex(REVIEWS).search("great price")
+        self.assertEqual(count, 2)
+        self.assertEqual(ids(results), [1, 3])
+        self.assertGreater(results[0][0], results[1][0])
+
+    def test_filters_ignore_case_and_combine(self):
+        index = ReviewIndex(REVIEWS)
+        self.assertEqual(sorted(ids(index.search("price", car_make="AUDI")[1])), [1, 3])
+        self.assertEqual(ids(index.search("price", car_make="audi", dealership=7)[1]), [3])
+        self.assertEqual(index.search("service", sentiment="neutral"), (0, []))
+
+    def test_replacing_a_review_drops_its_old_terms(self):
+        index = ReviewIndex(REVIEWS)
+        index.add([dict(REVIEWS[1], review="Friendly service after all", sentiment="positive")])
+        self.assertEqual(len(index), 4)
+        self.assertEqual(ids(index.search("terrible")[1]), [])
+        # The shorter review ranks first
+        self.assertEqual(ids(index.search("friendly", sentiment="positive")[1]), [4, 2])
+
+    def test_dead_slots_are_compacted(self):
+        index = ReviewIndex(REVIEWS)
+        for round_ in range(10):
+            index.add([dict(review, review=f"{review['review']} visit {round_}") for review in REVIEWS[:2]])
+        self.assertLessEqual(len(index.documents) - len(index), len(index) * 0.25)
+        self.assertEqual(len(index), 4)
+        # Same answers as an index built from the current reviews in one go
+        fresh = ReviewIndex([index.documents[number] for number in sorted(index.by_id.values())])
+        for query in ("great", "service visit", "price", "friendly"):
+            self.assertEqual(ids(index.search(query)[1]), ids(fresh.search(query)[1]))
+        self.assertEqual(sorted(ids(index.search("visit", dealership=15)[1])), [1, 2])
+        self.assertEqual(sorted(index.by_id), [1, 2, 3, 4])
+
+
+class ReviewSearchStoreTests(SimpleTestCase):
+    def test_first_search_does_not_wait_for_the_build(self):
+        release = threading.Event()
+
+        def load():
+            release.wait(5)
+            return REVIEWS
+
+        store = ReviewSearchStore(load)
+        self.assertIsNone(store.get())
+        self.assertTrue(store.warming)
+        store.add([{"id": 9, "review": "Added while warming"}])
+        release.set()
+        with store._rebuilding:
+            pass  # Wait for the background build
+        self.assertFalse(store.warming)
+        self.assertEqual(ids(store.get().search("warming")[1]), [9])
+
+    def test_failed_build_is_not_warming(self):
+        store = ReviewSearchStore(lambda: None)
+        self.assertIsNone(store.get(wait=True))
+        self.assertFalse(store.warming)
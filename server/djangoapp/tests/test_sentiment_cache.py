@@ -0,0 +1,51 @@
+import os
+import sqlite3
+import tempfile
+from unittest import mock
+
+from django.test import SimpleTestCase
+
+from djangoapp import sentiment_cache
+from djangoapp.sentiment_cache import SentimentCache, cache_key
+
+
+class SentimentCacheTests(SimpleTestCase):
+    def setUp(self):
+        directory = tempfile.TemporaryDirectory()
+        self.addCleanup(directory.cleanup)
+        self.path = os.path.join(directory.name, "cache.sqlite3")
+
+    def rows(self):
+        with sqlite3.connect(self.path) as connection:
+            return dict(connection.execute("SELECT key, accessed FROM sentiment_cache"))
+
+    def test_keys_ignore_whitespace_but_not_case(self):
+        self.assertEqual(cache_key(" great  service\n"), cache_key("great service"))
+        self.assertNotEqual(cache_key("GREAT service"), cache_key("great service"))
+
+    def test_disk_tier_survives_a_restart(self):
+        SentimentCache(self.path).set("good", {"sentiment": "positive"})
+        cache = SentimentCache(self.path)
+        self.assertEqual(cache.get("good"), {"sentiment": "positive"})
+        self.assertEqual(cache.stats()["hits_disk"], 1)
+
+    def test_disk_hits_write_access_times_in_batches(self):
+        SentimentCache(self.path).set_many([("a", {"s": 1}), ("b", {"s": 2})])
+        before = self.rows()
+        with mock.patch.object(sentiment_cache, "sentiment_cache_touch_batch", 2):
+            cache = SentimentCache(self.path)
+            cache.get("a")
+            self.assertEqual(self.rows(), before)  # One pending access time, nothing written
+            cache.get("b")
+        after = self.rows()
+        self.assertGreaterEqual(after[cache_key("a")], before[cache_key("a")])
+        self.assertGreater(after[cache_key("b")], before[cache_key("b")])
+
+    def test_eviction_counts_rows_written_by_other_processes(self):
+        # Two caches on one file stand in for two worker processes
+        first = SentimentCache(self.path, disk_size=10)
+        second = SentimentCache(self.path, disk_size=10)
+        first.set_many([(f"first {i}", {"i": i}) for i in range(6)])
+        second.set_many([(f"second {i}", {"i": i}) for i in range(6)])
+        self.assertLessEqual(len(self.rows()), 10)
+        self.assertEqual(second.stats()["disk_entries"], len(self.rows()))
@@ -0,0 +1,54 @@
+from datetime import timedelta
+
+from django.test import TestCase
+from django.utils import timezone
+
+from djangoapp.models import DealerSentimentSummary
+from djangoapp.sentiment_summary import rebuild_summaries, record_reviews, summary_payload
+
+
+def review(dealer, sentiment="positive", purchase=False):
+    return {"dealership": dealer, "sentiment": sentiment, "purchase": purchase}
+
+
+class SentimentSummaryTests(TestCase):
+    def counts(self, dealer_id):
+        summary = DealerSentimentSummary.objects.get(dealer_id=dealer_id)
+        return summary.review_count, summary.positive, summary.neutral, summary.negative, summary.purchases
+
+    def test_record_reviews_adds_to_existing_counts(self):
+        record_reviews([review(1), review(1, "negative", True), review("x"), review(2, "N/A")])
+        record_reviews([review(1, "neutral")])
+        self.assertEqual(self.counts(1), (3, 1, 1, 1, 1))
+        self.assertEqual(self.counts(2), (1, 0, 0, 0, 0))
+        self.assertEqual(DealerSentimentSummary.objects.count(), 2)
+
+    def test_record_reviews_stores_an_aware_timestamp(self):
+        before = timezone.now()
+        record_reviews([review(1)])
+        updated = DealerSentimentSummary.objects.get(dealer_id=1).updated
+        self.assertTrue(timezone.is_aware(updated))
+        self.assertGreaterEqual(updated, before - timedelta(seconds=1))
+
+    def test_rebuild_replaces_counts_and_drops_dealers_without_reviews(self):
+        record_reviews([review(1), review(1), review(3)])
+        self.assertEqual(rebuild_summaries([review(1, "negative"), review(2)]), (2, 0))
+        self.assertEqual(self.counts(1), (1, 0, 0, 1, 0))
+        self.assertEqual(self.counts(2), (1, 1, 0, 0, 0))
+        self.assertFalse(DealerSentimentSummary.objects.filter(dealer_id=3).exists())
+
+    def test_rebuild_keeps_summaries_incremented_after_the_fetch(self):
+        record_reviews([review(1), review(3)])
+        fetched_at = timezone.now()
+        fetched = [review(1), review(3)]
+        record_reviews([review(1, "negative")])  # Posted while the rebuild was fetching
+        DealerSentimentSummary.objects.filter(dealer_id=3).update(updated=fetched_at - timedelta(minutes=1))
+        self.assertEqual(rebuild_summaries(fetched, fetched_at), (1, 1))
+        self.assertEqual(self.counts(1), (2, 1, 0, 1, 0))
+        self.assertEqual(self.counts(3), (1, 1, 0, 0, 0))
+
+    def test_payload_shares(self):
+        record_reviews([review(1), review(1, "negative", True)])
+        payload = summary_payload(1, DealerSentimentSummary.objects.get(dealer_id=1))
+        self.assertEqual((payload["positive_share"], payload["purchase_rate"]), (0.5, 0.5))
+        self.assertIsNone(summary_payload(9)["positive_share"])
@@ -0,0 +1,49 @@
+import random
+
+from django.test import SimpleTestCase
+
+from djangoapp.spatial import GridIndex, haversine_km
+
+
+def brute_force(records, lat, lon, k, radius_km=None):
+    distances = [(haversine_km(lat, lon, record["lat"], record["long"]), number) for number, record in enumerate(records)]
+    if radius_km is not None:
+        distances = [entry for entry in distances if entry[0] <= radius_km]
+    return [(distance, records[number]) for distance, number in sorted(distances)[:k]]
+
+
+class GridIndexTests(SimpleTestCase):
+    def assertSameNeighbours(self, index, records, lat, lon, k, radius_km=None):
+        got = index.nearest(lat, lon, k, radius_km)
+        expected = brute_force(records, lat, lon, k, radius_km)
+        self.assertEqual([record["id"] for _, record in got], [record["id"] for _, record in expected])
+        for (got_distance, _), (distance, _) in zip(got, expected):
+            self.assertAlmostEqual(got_distance, distance)
+
+    def test_matches_a_linear_scan(self):
+        generator = random.Random(7)
+        records = [{"id": i, "lat": generator.uniform(25, 49), "long": generator.uniform(-124, -67)} for i in range(300)]
+        for cell_degrees in (0.5, 1.0, 5.0):
+            index = GridIndex(records, cell_degrees)
+            for _ in range(40):
+                lat, lon = generator.uniform(-90, 90), generator.uniform(-180, 180)
+                k = generator.choice((1, 5, 50))
+                radius = generator.choice((None, 100, 2000))
+                with self.subTest(cell_degrees=cell_degrees, lat=lat, lon=lon, k=k, radius=radius):
+                    self.assertSameNeighbours(index, records, lat, lon, k, radius)
+
+    def test_antimeridian_and_poles(self):
+        records = [
+            {"id": 1, "lat": 10, "long": 179.9}, {"id": 2, "lat": 10, "long": -179.9},
+            {"id": 3, "lat": 89.5, "long": 0}, {"id": 4, "lat": 89.5, "long": 180}, {"id": 5, "lat": -60, "long": 20},
+        ]
+        index = GridIndex(records)
+        for lat, lon in ((10, -179.5), (10, 179.5), (89.9, 90), (-89, -170), (0, 0)):
+            with self.subTest(lat=lat, lon=lon):
+                self.assertSameNeighbours(index, records, lat, lon, 3)
+
+    def test_records_without_coordinates_are_skipped(self):
+        index = GridIndex([{"id": 1, "lat": "x", "long": 1}, {"id": 2}, {"id": 3, "lat": "40.1", "long": "-75"}])
+        self.assertEqual(len(index), 1)
+        self.assertEqual(index.nearest(40, -75, 5)[0][1]["id"], 3)
+        self.assertEqual(GridIndex([]).nearest(0, 0), [])
@@ -0,0 +1,155 @@
+# server/djangoapp/timing.py
+
+import logging
+import threading
+import time
+from contextlib import contextmanager
+from contextvars import ContextVar
+
+from asgiref.sync import iscoroutinefunction, markcoroutinefunction
+from django.conf import settings
+from django.http import JsonResponse
+
+logger = logging.getLogger(__name__)
+
+# Order of the metrics in the Server-Timing header and the log line
+METRICS = ("upstream", "db", "serialize")
+
+_current = ContextVar("djangoapp_request_timings", default=None)
+
+
+class RequestTimings:
+    """
+    Time spent per metric (upstream calls, ORM queries, JSON serialization) while
+    serving one request. Durations are summed, so concurrent upstream calls can
+    add up to more than the request's wall time.
+    """
+
+    def __init__(self):
+        self.started = time.perf_counter()
+        self.durations = dict.fromkeys(METRICS, 0.0)
+        self.counts = dict.fromkeys(METRICS, 0)
+        self._lock = threading.Lock()  # Fan-out helpers may report from several threads
+
+    def add(self, metric, seconds):
+        with self._lock:
+            self.durations[metric] = self.durations.get(metric, 0.0) + seconds
+            self.counts[metric] = self.counts.get(metric, 0) + 1
+
+    def total(self):
+        return time.perf_counter() - self.started
+
+    def server_timing(self, total):
+        """
+        Renders the Server-Timing header value, durations in milliseconds.
+        """
+        parts = []
+        for metric, count in self.counts.items():
+            if count:
+                calls = "1 call" if count == 1 else f"{count} calls"
+                parts.append(f'{metric};dur={self.durations[metric] * 1000:.1f};desc="{calls}"')
+        parts.append(f"total;dur={total * 1000:.1f}")
+        return ", ".join(parts)
+
+
+def current_timings():
+    """
+    Returns the RequestTimings of the request being served, or None outside one.
+    """
+    return _current.get()
+
+
+@contextmanager
+def timed(metric):
+    """
+    Adds the time spent in the with-block to the current request's metric.
+    A no-op (beyond reading the clock) outside a request.
+    """
+    started = time.perf_counter()
+    try:
+        yield
+    finally:
+        timings = _current.get()
+        if timings is not None:
+            timings.add(metric, time.perf_counter() - started)
+
+
+def json_response(data, **kwargs):
+    """
+    JsonResponse whose encoding is timed under the "serialize" metric.
+    """
+    with timed("serialize"):
+        return JsonResponse(data, **kwargs)
+
+
+def db_timing_wrapper(execute, sql, params, many, context):
+    """
+    connection.execute_wrapper hook timing every ORM query under the "db" metric.
+    """
+    if _current.get() is None:
+        return execute(sql, params, many, context)
+    with timed("db"):
+        return execute(sql, params, many, context)
+
+
+def install_db_timing(sender, connection, **kwargs):
+    """
+    connection_created receiver: attaches db_timing_wrapper to each new database
+    connection, in whichever thread opens it (sync_to_async threads included).
+    """
+    if db_timing_wrapper not in connection.execute_wrappers:
+        connection.execute_wrappers.append(db_timing_wrapper)
+
+
+class ServerTimingMiddleware:
+    """
+    Measures each request (see RequestTimings), adds a Server-Timing header and
+    writes one structured log line to the djangoapp.timing logger at INFO.
+    Works under both WSGI and ASGI. For streamed responses the total covers the
+    view only, not sending the body.
+    """
+    sync_capable = True
+    async_capable = True
+
+    def __init__(self, get_response):
+        self.get_response = get_response
+        self.async_mode = iscoroutinefunction(get_response)
+        if self.async_mode:
+            markcoroutinefunction(self)
+
+    def __call__(self, request):
+        if self.async_mode:
+            return self.__acall__(request)
+        timings = RequestTimings()
+        token = _current.set(timings)
+        try:
+            response = self.get_response(request)
+        finally:
+            _current.reset(token)
+        return self.finish(request, response, timings)
+
+    async def __acall__(self, request):
+        timings = RequestTimings()
+        token = _current.set(timings)
+        try:
+            response = await self.get_response(request)
+        finally:
+            _current.reset(token)
+        return self.finish(request, response, timings)
+
+    def finish(self, request, response, timings):
+        total = timings.total()
+        if settings.SERVER_TIMING_HEADER:
+            response["Server-Timing"] = timings.server_timing(total)
+        if logger.isEnabledFor(logging.INFO):
+            fields = {
+                "method": request.method,
+                "path": request.path,
+                "status": response.status_code,
+                "total_ms": round(total * 1000, 1),
+            }
+            for metric in METRICS:
+                fields[f"{metric}_ms"] = round(timings.durations[metric] * 1000, 1)
+                fields[f"{metric}_calls"] = timings.counts[metric]
+            logger.info(" ".join(f"{key}={value}" for key, value in fields.items()), extra={"timing": fields})
+        return response
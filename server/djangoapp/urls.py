@@ -6,6 +6,19 @@ from django.conf import settings
 from . import views
 
 app_name = 'djangoapp'
+
+# Under ASGI the dealer/review proxy routes can be served by native async views
+if settings.ASYNC_PROXY_VIEWS:
+    get_dealerships_view = views.get_dealerships_async
+    get_dealer_details_view = views.get_dealer_details_async
+    get_dealer_reviews_view = views.get_dealer_reviews_async
+    add_review_view = views.add_review_async
+else:
+    get_dealerships_view = views.get_dealerships
+    get_dealer_details_view = views.get_dealer_details
+    get_dealer_reviews_view = views.get_dealer_reviews
+    add_review_view = views.add_review
+
 urlpatterns = [
     # --- USER AUTHENTICATION ROUTES ---
     path(route='registration', view=views.registration, name='registration'),
@@ -15,21 +28,36 @@ urlpatterns = [
     # --- CAR INVENTORY (Django ORM) ---
     path(route='get_cars', view=views.get_cars, name='getcars'),
     
+    # --- DEALER INVENTORY SEARCH (in-memory index over car_records.json) ---
+    path(route='inventory', view=views.search_inventory, name='inventory'),
+
     # --- DEALERSHIP PROXY ROUTES (GET requests) ---
     # GET all dealers
-    path(route='get_dealers', view=views.get_dealerships, name='get_dealers'),
+    path(route='get_dealers', view=get_dealerships_view, name='get_dealers'),
     # GET dealers by state
-    path(route='get_dealers/<str:state>', view=views.get_dealerships, name='get_dealers_by_state'),
+    path(route='get_dealers/<str:state>', view=get_dealerships_view, name='get_dealers_by_state'),
+
+    # GET the k dealers nearest to a point (?lat=&long=&k=&radius_km=)
+    path(route='dealers/nearby', view=views.get_nearby_dealers, name='nearby_dealers'),
 
     # GET dealer details by ID
-    path(route='dealer/<int:dealer_id>', view=views.get_dealer_details, name='dealer_details'),
+    path(route='dealer/<int:dealer_id>', view=get_dealer_details_view, name='dealer_details'),
+
+    # GET a dealer's review/sentiment aggregates, or those of many dealers (?ids=)
+    path(route='dealer/<int:dealer_id>/sentiment_summary', view=views.get_dealer_sentiment_summary, name='dealer_sentiment_summary'),
+    path(route='dealers/sentiment_summary', view=views.get_dealers_sentiment_summary, name='dealers_sentiment_summary'),
 
     # --- REVIEW PROXY ROUTES ---
     # GET reviews for a specific dealer (includes Sentiment Analysis)
-    path(route='reviews/dealer/<int:dealer_id>', view=views.get_dealer_reviews, name='dealer_reviews'),
+    path(route='reviews/dealer/<int:dealer_id>', view=get_dealer_reviews_view, name='dealer_reviews'),
     
+    # GET a full-text search over all reviews (?q=&dealer_id=&car_make=&sentiment=)
+    path(route='reviews/search', view=views.search_reviews, name='review_search'),
+
     # POST a new review
-    path(route='add_review', view=views.add_review, name='add_review'),
+    path(route='add_review', view=add_review_view, name='add_review'),
+    # POST many reviews at once (JSON array or NDJSON), with a per-record status
+    path(route='add_reviews', view=views.add_reviews, name='add_reviews'),
 
 # Serve static files and media files (if needed) during development
 ] + static(settings.STATIC_URL, document_root=settings.STATIC_ROOT) \
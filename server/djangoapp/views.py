@@ -7,18 +7,47 @@ from django.contrib.auth import logout
 from django.contrib import messages
 from datetime import datetime
 from django.db.models import F # Needed for ORM operations if used
+from django.db import IntegrityError, transaction
 from .models import CarMake, CarModel # Import the models for the get_cars view
 
 # from django.http import JsonResponse
 from django.contrib.auth import login, authenticate
 import logging
 import json
+import codecs
 from django.views.decorators.csrf import csrf_exempt
 
 # --- CRITICAL IMPORTS ---
-from .populate import initiate 
 # Import all required restapi functions: 
-from .restapis import get_request, get_dealers_from_api, get_dealer_reviews_from_api, analyze_review_sentiments, post_review 
+from .restapis import get_request, analyze_review_sentiments, enrich_reviews_sentiment, post_review
+# Async counterparts used by the ASGI proxy views
+from .restapis import get_request_async, enrich_reviews_sentiment_async, post_review_async
+# Passthrough (no decode/re-encode) fetches for the dealer proxy views
+from .restapis import get_request_raw, get_request_raw_async
+# Fall back to the last good backend reply while the backend is down
+from .restapis import get_request_or_stale, get_request_or_stale_async
+# TTL cache + ETag helpers for the dealer proxy views
+from .http_cache import cached_response, cached_response_async, catalogue_cache_key, etag_response, splice_envelope, stale_entry, mark_stale_response, Uncached
+from .dealer_snapshot import DealerSnapshotStore
+from django.conf import settings
+from django.http import StreamingHttpResponse
+from .spatial import DealerLocator
+from .catalogue import CatalogueQueryError, STREAM_PAGE_SIZE, build_page, parse_query, query_fingerprint, stream_page
+# Per-request timing of upstream calls, queries and serialization (Server-Timing)
+from .timing import json_response
+# Bulk review ingestion
+from .restapis import review_batch_size
+from .jsonstream import iter_json_array, iter_ndjson
+from .review_ingest import stream_ingest_response
+# Per-dealer sentiment aggregates
+from .models import DealerSentimentSummary
+from .sentiment_summary import record_reviews, summary_payload
+from django.db import DatabaseError
+from asgiref.sync import sync_to_async
+# In-memory inventory search over car_records.json
+from .inventory import InventoryQueryError, InventoryStore, parse_query as parse_inventory_query, search_payload
+# Full-text review search
+from .review_search import MAX_RESULTS as MAX_REVIEW_RESULTS, ReviewSearchStore
 
 
 # Get an instance of a logger
@@ -60,22 +89,21 @@ def registration(request):
     last_name = data['lastName']
     email = data['email']
 
-    # Check if user already exists
-    username_exist = False
+    # Create the user in a single insert; the unique username constraint catches
+    # existing users (and concurrent sign-ups racing for the same name). The
+    # password is hashed first: PBKDF2 takes hundreds of milliseconds, and SQLite's
+    # IMMEDIATE transactions hold the database write lock from BEGIN.
+    user = User(username=User.normalize_username(username), first_name=first_name, last_name=last_name,
+                email=User.objects.normalize_email(email))
+    user.set_password(password)
     try:
-        User.objects.get(username=username)
-        username_exist = True
-    except User.DoesNotExist:
-        # If not, simply log the exception
-        logger.debug(f"{username} is a new user.")
-
-    # If user exists, return failure
-    if username_exist:
+        with transaction.atomic():
+            user.save(force_insert=True)
+    except IntegrityError:
         data = {"userName": username, "error": "Already Registered"}
         return JsonResponse(data)
-    
-    # Otherwise, create the user and login
-    user = User.objects.create_user(username=username, password=password, first_name=first_name, last_name=last_name, email=email)
+
+    logger.debug("%s is a new user.", username)
     login(request, user)
     data = {"userName": username, "status": "Authenticated"}
     return JsonResponse(data)
@@ -84,91 +112,295 @@ def registration(request):
 # --- VIEW FOR CARS ---
 def get_cars(request):
     """
-    Fetches the list of all CarModels and their associated CarMakes.
-    If the database is empty, it calls initiate() to populate it.
-    """
-    count = CarMake.objects.filter().count()
-    print(f"Total Car Makes in DB: {count}")
-    
-    if count == 0:
-        initiate() 
-
-    # Use select_related to efficiently fetch CarModel and its related CarMake in one query
-    car_models = CarModel.objects.select_related('car_make').all()
-    cars = []
-    
-    for car_model in car_models:
-        cars.append({
-            "CarModel": car_model.name, 
-            "CarMake": car_model.car_make.name,
-            "Year": car_model.year,
-            "Type": car_model.type
-        })
-        
-    return JsonResponse({"CarModels": cars})
+    Returns the CarModels with their CarMakes.
+    Optional filters: make, type, year_min/year_max, price_min/price_max.
+    Without limit or cursor every matching model is returned (next_cursor is null);
+    with them, results are keyset-paginated: limit, and the opaque cursor from the
+    previous page's next_cursor. Responses up to STREAM_PAGE_SIZE models are served
+    as cached bytes (dropped by the CarMake/CarModel signals); larger ones are
+    streamed straight from the DB.
+    Seeding is not done here; load the catalogue with
+    `python manage.py load_catalogue` (or `--seed` for the sample data).
+    """
+    try:
+        query = parse_query(request.GET)
+    except CatalogueQueryError as e:
+        return JsonResponse({"status": 400, "message": f"Bad Request: {e}"})
+
+    if query["limit"] is not None and query["limit"] > STREAM_PAGE_SIZE:
+        return StreamingHttpResponse(stream_page(query), content_type="application/json")
+
+    def build():
+        if query["limit"] is None:
+            # Unpaged: cache the full list while it fits in a cached page,
+            # stream it once the catalogue outgrows that
+            payload = build_page(dict(query, limit=STREAM_PAGE_SIZE))
+            if payload["next_cursor"] is not None:
+                raise Uncached(StreamingHttpResponse(stream_page(query), content_type="application/json"))
+        else:
+            payload = build_page(query)
+        # Empty pages are cheap to query and not cached, so a worker that served
+        # the catalogue before it was loaded never holds on to {"CarModels": []}
+        return payload, bool(payload["CarModels"])
+
+    cache_key = catalogue_cache_key(query_fingerprint(query))
+    return cached_response(request, cache_key, build, ttl=settings.CATALOGUE_CACHE_TTL)
+
+
+# --- DEALER PROXY HELPERS ---
+def dealer_proxy_response(request, field, endpoint):
+    """
+    Serves a backend dealer endpoint wrapped as {"status": 200, "<field>": ...},
+    through the TTL/ETag cache. In passthrough mode the upstream bytes are spliced
+    into the envelope without being parsed; bodies above DEALER_STREAM_THRESHOLD
+    are relayed as a stream instead of being buffered. While the backend is down
+    the last good envelope is served, marked "stale": true.
+    """
+    def build():
+        logger.debug("Fetching dealers from endpoint: %s", endpoint)
+        if not settings.DEALER_PASSTHROUGH:
+            # Use the generic get_request function to fetch data from the external backend
+            data = get_request(endpoint)
+            return {"status": 200, field: data}, data is not None
+
+        upstream = get_request_raw(endpoint)
+        if upstream is None:
+            return splice_envelope(field, None), False
+        size = int(upstream.headers.get("Content-Length") or 0)
+        if settings.DEALER_STREAM_THRESHOLD and size > settings.DEALER_STREAM_THRESHOLD:
+            raise Uncached(StreamingHttpResponse(
+                stream_envelope(field, upstream), content_type="application/json"))
+        try:
+            return splice_envelope(field, upstream.content), True
+        finally:
+            upstream.close()
+
+    # Serve from the TTL cache; a matching If-None-Match gets a 304
+    return cached_response(request, "dealers:" + endpoint, build, keep_stale=True)
+
+
+def stream_envelope(field, upstream, chunk_size=64 * 1024):
+    """
+    Relays an upstream body chunk by chunk inside the JSON envelope.
+    """
+    try:
+        yield b'{"status": 200, "' + field.encode() + b'": '
+        yield from upstream.iter_content(chunk_size=chunk_size)
+        yield b"}"
+    finally:
+        upstream.close()
+
+
+async def dealer_proxy_response_async(request, field, endpoint):
+    """
+    Async counterpart of dealer_proxy_response() (passthrough without streaming).
+    """
+    async def build():
+        if not settings.DEALER_PASSTHROUGH:
+            data = await get_request_async(endpoint)
+            return {"status": 200, field: data}, data is not None
+        raw = await get_request_raw_async(endpoint)
+        return splice_envelope(field, raw), raw is not None
+
+    return await cached_response_async(request, "dealers:" + endpoint, build, keep_stale=True)
+
+
+# --- DEALER SNAPSHOT ---
+# Opt-in (settings.DEALER_SNAPSHOT) local copy of every dealership with
+# per-state/per-id tables. Nothing is loaded until a view asks for it; after that
+# a stale snapshot is served while a background refresh runs
+dealer_snapshot = DealerSnapshotStore(lambda: get_request("/fetchDealers"), interval=settings.DEALER_SNAPSHOT_INTERVAL)
+
+
+def current_dealer_snapshot(wait=True):
+    """
+    Returns the dealer snapshot, or None when disabled or not loaded yet.
+    """
+    return dealer_snapshot.get(wait=wait) if settings.DEALER_SNAPSHOT else None
+
+
+def snapshot_response(request, entry):
+    """
+    Serves a (body, etag) entry of the dealer snapshot, marked stale while
+    refreshing the snapshot from the backend keeps failing.
+    """
+    if dealer_snapshot.failing:
+        return etag_response(request, *stale_entry(entry[0]), stale=True)
+    return etag_response(request, *entry)
 
 
 # --- PROXY VIEW: GET DEALERSHIPS ---
 def get_dealerships(request, state="All"):
     """
     Proxy service view to fetch dealer data from the external backend API.
-    Can filter by state or return all dealers.
+    Can filter by state or return all dealers. Answered from the local dealer
+    snapshot when enabled; otherwise responses are cached for
+    settings.DEALER_CACHE_TTL seconds, carry a strong ETag and, in passthrough
+    mode, reuse the backend's JSON bytes as-is.
     """
     if(state == "All"):
         endpoint = "/fetchDealers"
     else:
         # Note: The backend Express API must handle filtering via a path parameter
         endpoint = "/fetchDealers/"+state
-        
-    print(f"Fetching dealers from endpoint: {endpoint}")
-    
-    # Use the generic get_request function to fetch data from the external backend
-    dealerships = get_request(endpoint)
-    
-    # Return the raw data directly to the client as JSON
-    return JsonResponse({"status": 200, "dealers": dealerships})
+
+    # O(1) answer from the local snapshot when it is available
+    snapshot = current_dealer_snapshot()
+    if snapshot is not None:
+        return snapshot_response(request, snapshot.dealers_body(state))
+
+    return dealer_proxy_response(request, "dealers", endpoint)
 
 
 # --- PROXY VIEW: GET DEALER DETAILS ---
 def get_dealer_details(request, dealer_id):
     """
     Proxy service view to fetch details for a single dealer by ID.
-    Uses /fetchDealer/<dealer_id> endpoint.
+    Uses /fetchDealer/<dealer_id> endpoint, served like get_dealerships.
     """
     if(dealer_id):
         endpoint = "/fetchDealer/"+str(dealer_id)
-        dealership = get_request(endpoint)
-        return JsonResponse({"status":200,"dealer":dealership})
+        snapshot = current_dealer_snapshot()
+        entry = snapshot.dealer_body(dealer_id) if snapshot is not None else None
+        if entry is not None:
+            return snapshot_response(request, entry)
+        # Unknown to the snapshot (e.g. added since the last refresh): ask the backend
+        return dealer_proxy_response(request, "dealer", endpoint)
     else:
         return JsonResponse({"status":400,"message":"Bad Request"})
 
 
+# --- VIEW: NEAREST DEALERS ---
+def load_dealers_for_index():
+    snapshot = current_dealer_snapshot()
+    return snapshot.dealers if snapshot is not None else get_request("/fetchDealers")
+
+
+# In-process spatial index over all dealerships. It follows the dealer snapshot
+# (rebuilt whenever the snapshot's content changes), or the backend on the
+# dealer cache TTL when the snapshot is disabled.
+dealer_locator = DealerLocator(
+    load_dealers_for_index,
+    max_age=settings.DEALER_SNAPSHOT_INTERVAL if settings.DEALER_SNAPSHOT else settings.DEALER_CACHE_TTL)
+
+MAX_NEARBY_DEALERS = 50
+
+
+def get_nearby_dealers(request):
+    """
+    Returns the k dealerships nearest to ?lat=&long= (default k=5, at most 50),
+    optionally only those within radius_km, closest first with a distance_km field.
+    Served from an in-memory grid index instead of the full dealer list.
+    """
+    try:
+        lat = float(request.GET["lat"])
+        lon = float(request.GET["long"])
+        k = int(request.GET.get("k", 5))
+        radius_km = request.GET.get("radius_km")
+        radius_km = float(radius_km) if radius_km not in (None, "") else None
+    except (KeyError, ValueError):
+        return JsonResponse({"status":400,"message":"Bad Request: lat and long are required numbers"})
+    if not (-90 <= lat <= 90 and -180 <= lon <= 180) or not 1 <= k <= MAX_NEARBY_DEALERS:
+        return JsonResponse({"status":400,"message":"Bad Request: lat, long or k out of range"})
+
+    nearest = dealer_locator.nearest(lat, lon, k, radius_km)
+    if nearest is None:
+        return JsonResponse({"status":503,"message":"Dealer data is unavailable"})
+    dealers = [dict(dealer, distance_km=round(distance, 3)) for distance, dealer in nearest]
+    return json_response({"status":200,"dealers":dealers})
+
+
+# --- VIEW: INVENTORY SEARCH ---
+inventory_store = InventoryStore(settings.INVENTORY_PATH)
+
+
+def search_inventory(request):
+    """
+    Searches the dealers' car inventory. Optional filters: dealer_id, make, model,
+    body_type (exact, case-insensitive), year_min/year_max and
+    mileage_min/mileage_max. sort is one of year, -year (default), mileage,
+    -mileage, make or -make; limit (default 50, at most 1000) and the opaque
+    cursor from the previous page's next_cursor paginate. Served from an
+    in-memory index, so the cost follows the matches, not the inventory size.
+    """
+    try:
+        query = parse_inventory_query(request.GET)
+    except InventoryQueryError as e:
+        return JsonResponse({"status": 400, "message": f"Bad Request: {e}"})
+
+    index = inventory_store.get()
+    if index is None:
+        return JsonResponse({"status": 503, "message": "Inventory is unavailable"})
+    return json_response(dict(status=200, **search_payload(index, query)))
+
+
+# --- VIEW: REVIEW SEARCH ---
+def load_reviews_for_search():
+    reviews = get_request("/fetchReviews")
+    if isinstance(reviews, list):
+        # Score unscored reviews once, so the sentiment filter covers them
+        enrich_reviews_sentiment(reviews)
+    return reviews
+
+
+# In-process inverted index over all reviews, rebuilt from the backend every
+# REVIEW_SEARCH_REFRESH seconds and updated as reviews are posted
+review_search = ReviewSearchStore(load_reviews_for_search, max_age=settings.REVIEW_SEARCH_REFRESH)
+
+
+def search_reviews(request):
+    """
+    Full-text search over review text: ?q= (required), ranked by BM25, with
+    optional dealer_id, car_make and sentiment filters and limit (default 20,
+    at most 100) / offset paging. Answered from the in-process index without
+    calling the backend; until the first index is built, the result is empty
+    and carries "warming": true.
+    """
+    text = request.GET.get("q", "").strip()
+    sentiment = request.GET.get("sentiment") or None
+    car_make = request.GET.get("car_make") or None
+    try:
+        dealer_id = int(request.GET["dealer_id"]) if request.GET.get("dealer_id") else None
+        limit = int(request.GET.get("limit") or 20)
+        offset = int(request.GET.get("offset") or 0)
+    except ValueError:
+        return JsonResponse({"status": 400, "message": "Bad Request: dealer_id, limit and offset must be integers"})
+    if not text or not 1 <= limit <= MAX_REVIEW_RESULTS or offset < 0:
+        return JsonResponse({"status": 400, "message": "Bad Request: q is required; limit must be 1-100"})
+
+    index = review_search.get()
+    if index is None:
+        if review_search.warming:
+            # The first index is still loading; answer right away rather than wait for it
+            return json_response({"status": 200, "count": 0, "reviews": [], "warming": True})
+        return JsonResponse({"status": 503, "message": "Review search is unavailable"})
+    count, results = index.search(text, limit=limit, offset=offset,
+                                  dealership=dealer_id, car_make=car_make, sentiment=sentiment)
+    reviews = [dict(review, score=round(score, 4)) for score, review in results]
+    return json_response({"status": 200, "count": count, "reviews": reviews})
+
+
 # --- PROXY VIEW: GET DEALER REVIEWS WITH SENTIMENT ANALYSIS ---
 def get_dealer_reviews(request, dealer_id):
     """
-    Proxy service view to fetch reviews for a dealer, then analyzes the sentiment 
-    for each review using the external microservice.
+    Proxy service view to fetch reviews for a dealer. Reviews scored at write time
+    keep their stored sentiment; the rest are analyzed with the external microservice,
+    either in a single batch call or as a bounded concurrent fan-out
+    (see restapis.sentiment_strategy). While the backend is down the last good
+    reviews are served with "stale": true and a Warning header.
     """
     # if dealer id has been provided
     if(dealer_id):
         endpoint = "/fetchReviews/dealer/"+str(dealer_id)
-        # Fetch reviews (raw JSON list/dict)
-        reviews = get_request(endpoint)
+        # Fetch reviews (raw JSON list/dict), or the last good copy during an outage
+        reviews, stale = get_request_or_stale(endpoint)
         
         # Check if reviews were successfully retrieved and is a list
         if reviews is not None and isinstance(reviews, list):
-            for review_detail in reviews:
-                # 1. Extract the review text
-                review_text = review_detail.get('review', '')
-                
-                # 2. Call the sentiment microservice consumer
-                response = analyze_review_sentiments(review_text)
-                
-                # 3. Extract the sentiment result
-                print(f"Sentiment response for review: {response}")
-                review_detail['sentiment'] = response.get('sentiment', 'N/A')
-                
-            return JsonResponse({"status":200,"reviews":reviews})
+            # Score only the reviews without a stored sentiment (batch or fan-out)
+            enrich_reviews_sentiment(reviews)
+
+            return reviews_response(reviews, stale)
         else:
              # Handle case where reviews could not be fetched
             return JsonResponse({"status":404, "message":"Reviews not found for this dealer."})
@@ -176,6 +408,32 @@ def get_dealer_reviews(request, dealer_id):
         return JsonResponse({"status":400,"message":"Bad Request: Missing dealer ID"})
 
 
+def reviews_response(reviews, stale):
+    if stale:
+        return mark_stale_response(json_response({"stale": True, "status":200, "reviews":reviews}))
+    return json_response({"status":200,"reviews":reviews})
+
+
+def reviews_posted(reviews):
+    """
+    Updates the local read models after the backend stored reviews. The reviews
+    are already saved upstream, so a failure here is logged, not returned.
+    """
+    try:
+        record_reviews(reviews)
+    except DatabaseError:
+        logger.exception("Could not update the dealer sentiment summaries")
+    review_search.add(reviews)
+
+
+def stored_review(data, response):
+    """
+    The review as the backend stored it (with its id), falling back to what was sent.
+    """
+    stored = response.get("data")
+    return dict(data, **stored) if isinstance(stored, dict) else data
+
+
 # --- PROXY VIEW: ADD REVIEW ---
 @csrf_exempt
 def add_review(request):
@@ -189,12 +447,16 @@ def add_review(request):
         try:
             # Load the JSON payload from the request body
             data = json.loads(request.body)
-            print(f"Received review data: {data}")
+            logger.debug("Received review data: %s", data)
+
+            # Write-time enrichment: score the review once so reads can reuse it
+            enrich_reviews_sentiment([data])
             
             # Use the post_review utility function to send data to the backend
             response = post_review(data)
             
             if response.get("status") == "success":
+                reviews_posted([stored_review(data, response)])
                 return JsonResponse({"status": 201, "message": "Review posted successfully"})
             else:
                 # Return the error message provided by the post_review utility
@@ -206,4 +468,144 @@ def add_review(request):
             logger.error(f"Error posting review: {e}")
             return JsonResponse({"status": 500, "message": f"An unexpected error occurred: {str(e)}"})
     else:
-        return JsonResponse({"status": 405, "message": "Method not allowed"})
\ No newline at end of file
+        return JsonResponse({"status": 405, "message": "Method not allowed"})
+
+
+# --- PROXY VIEW: BULK REVIEW INGESTION ---
+@csrf_exempt
+def add_reviews(request):
+    """
+    Submits many reviews in one request: a JSON array of review objects, or one
+    review per line when sent as NDJSON (Content-Type application/x-ndjson).
+    Each record is validated, then valid ones are scored and forwarded to the
+    backend in batches of restapis.review_batch_size. The reply is streamed as
+    {"status": 200, "results": [per-record status...], "received": n, "created": n,
+    "invalid": n, "failed": n}. The upload is parsed as it is read, so memory use
+    doesn't grow with its size.
+    """
+    if not request.user.is_authenticated:
+        return JsonResponse({"status": 403, "message": "Unauthorized: User is not logged in"})
+    if request.method != 'POST':
+        return JsonResponse({"status": 405, "message": "Method not allowed"})
+
+    # Decode incrementally, so a multi-byte character split across reads is kept whole
+    body = codecs.getreader("utf-8")(request)
+    content_type = request.content_type or ""
+    if "ndjson" in content_type or "jsonlines" in content_type:
+        records = iter_ndjson(body)
+    else:
+        records = iter_json_array(body)
+    return StreamingHttpResponse(
+        stream_ingest_response(records, review_batch_size, on_stored=reviews_posted), content_type="application/json")
+
+
+# --- VIEW: DEALER SENTIMENT SUMMARY ---
+def get_dealer_sentiment_summary(request, dealer_id):
+    """
+    Returns a dealer's review count, per-sentiment counts, positive share and
+    purchase rate from the locally maintained aggregates (one primary-key
+    lookup), instead of fetching and scoring all of its reviews.
+    """
+    summary = DealerSentimentSummary.objects.filter(dealer_id=dealer_id).first()
+    return json_response({"status": 200, "summary": summary_payload(dealer_id, summary)})
+
+
+def get_dealers_sentiment_summary(request):
+    """
+    Returns the summaries of every dealer with reviews (or only ?ids=1,2,3) in
+    one query, for dealer list pages.
+    """
+    summaries = DealerSentimentSummary.objects.order_by("dealer_id")
+    ids = request.GET.get("ids")
+    if ids:
+        try:
+            summaries = summaries.filter(dealer_id__in=[int(dealer_id) for dealer_id in ids.split(",")])
+        except ValueError:
+            return JsonResponse({"status": 400, "message": "Bad Request: ids must be comma-separated integers"})
+    return json_response({"status": 200, "summaries": [
+        summary_payload(summary.dealer_id, summary) for summary in summaries]})
+
+
+# --- ASYNC PROXY VIEWS (served natively under djangoproj/asgi.py) ---
+# Same behaviour as the sync views above, but upstream waits don't hold a thread.
+# urls.py routes to these when settings.ASYNC_PROXY_VIEWS is enabled.
+
+async def get_dealerships_async(request, state="All"):
+    """
+    Async version of get_dealerships.
+    """
+    if(state == "All"):
+        endpoint = "/fetchDealers"
+    else:
+        endpoint = "/fetchDealers/"+state
+
+    # Never block the event loop on a snapshot load; fall back to the proxy instead
+    snapshot = current_dealer_snapshot(wait=False)
+    if snapshot is not None:
+        return snapshot_response(request, snapshot.dealers_body(state))
+
+    return await dealer_proxy_response_async(request, "dealers", endpoint)
+
+
+async def get_dealer_details_async(request, dealer_id):
+    """
+    Async version of get_dealer_details.
+    """
+    if(dealer_id):
+        endpoint = "/fetchDealer/"+str(dealer_id)
+        snapshot = current_dealer_snapshot(wait=False)
+        entry = snapshot.dealer_body(dealer_id) if snapshot is not None else None
+        if entry is not None:
+            return snapshot_response(request, entry)
+        return await dealer_proxy_response_async(request, "dealer", endpoint)
+    else:
+        return JsonResponse({"status":400,"message":"Bad Request"})
+
+
+async def get_dealer_reviews_async(request, dealer_id):
+    """
+    Async version of get_dealer_reviews.
+    """
+    if(dealer_id):
+        endpoint = "/fetchReviews/dealer/"+str(dealer_id)
+        reviews, stale = await get_request_or_stale_async(endpoint)
+
+        if reviews is not None and isinstance(reviews, list):
+            await enrich_reviews_sentiment_async(reviews)
+
+            return reviews_response(reviews, stale)
+        else:
+            return JsonResponse({"status":404, "message":"Reviews not found for this dealer."})
+    else:
+        return JsonResponse({"status":400,"message":"Bad Request: Missing dealer ID"})
+
+
+@csrf_exempt
+async def add_review_async(request):
+    """
+    Async version of add_review.
+    """
+    # request.user is a lazy sync lookup; resolve it without blocking the loop
+    user = await request.auser()
+    if not user.is_authenticated:
+        return JsonResponse({"status": 403, "message": "Unauthorized: User is not logged in"})
+
+    if request.method == 'POST':
+        try:
+            data = json.loads(request.body)
+            await enrich_reviews_sentiment_async([data])
+            response = await post_review_async(data)
+
+            if response.get("status") == "success":
+                await sync_to_async(reviews_posted)([stored_review(data, response)])
+                return JsonResponse({"status": 201, "message": "Review posted successfully"})
+            else:
+                return JsonResponse({"status": 500, "message": f"Failed to post review: {response.get('message')}"})
+
+        except json.JSONDecodeError:
+            return JsonResponse({"status": 400, "message": "Invalid JSON format in request body"})
+        except Exception as e:
+            logger.error(f"Error posting review: {e}")
+            return JsonResponse({"status": 500, "message": f"An unexpected error occurred: {str(e)}"})
+    else:
+        return JsonResponse({"status": 405, "message": "Method not allowed"})
@@ -3,6 +3,11 @@ ASGI config for djangoproj project.
 
 It exposes the ASGI callable as a module-level variable named ``application``.
 
+Set async_proxy_views=true to route the dealer/review proxy views to their
+native async versions, e.g.:
+
+    async_proxy_views=true uvicorn djangoproj.asgi:application --workers 2
+
 For more information on this file, see
 https://docs.djangoproject.com/en/3.2/howto/deployment/asgi/
 """
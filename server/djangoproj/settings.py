@@ -47,6 +47,8 @@ INSTALLED_APPS = [
 ]
 
 MIDDLEWARE = [
+    # First, so its total covers the rest of the stack
+    'djangoapp.timing.ServerTimingMiddleware',
     'django.middleware.security.SecurityMiddleware',
     'django.contrib.sessions.middleware.SessionMiddleware',
     'django.middleware.common.CommonMiddleware',
@@ -81,15 +83,146 @@ TEMPLATES = [
 
 WSGI_APPLICATION = 'djangoproj.wsgi.application'
 
+# Serve the dealer/review proxy routes with native async views. Only useful under
+# an ASGI server (djangoproj.asgi), e.g. `uvicorn djangoproj.asgi:application`.
+ASYNC_PROXY_VIEWS = os.getenv('async_proxy_views', 'false').lower() in ('1', 'true', 'yes')
+
 
 # Database
-DATABASES = {
+# db_engine=sqlite (default): the local db.sqlite3 file, tuned by djangoapp.db
+# (WAL journal so reads don't wait on writes, synchronous and mmap pragmas).
+# db_engine=postgres: a server database shared by several nodes, with a psycopg
+# connection pool per process (needs `pip install "psycopg[binary,pool]"`).
+DB_ENGINE = os.getenv('db_engine', 'sqlite')
+# Seconds a connection is kept open across requests (0 closes it after each one)
+DB_CONN_MAX_AGE = int(os.getenv('db_conn_max_age', '600'))
+DB_CONN_HEALTH_CHECKS = os.getenv('db_conn_health_checks', 'true').lower() in ('1', 'true', 'yes')
+
+if DB_ENGINE == 'postgres':
+    DB_POOL = os.getenv('db_pool', 'true').lower() in ('1', 'true', 'yes')
+    DATABASES = {
+        'default': {
+            'ENGINE': 'django.db.backends.postgresql',
+            'NAME': os.getenv('db_name', 'djangoproj'),
+            'USER': os.getenv('db_user', 'postgres'),
+            'PASSWORD': os.getenv('db_password', ''),
+            'HOST': os.getenv('db_host', 'localhost'),
+            'PORT': os.getenv('db_port', '5432'),
+            # The pool keeps connections itself; Django requires CONN_MAX_AGE=0 with it
+            'CONN_MAX_AGE': 0 if DB_POOL else DB_CONN_MAX_AGE,
+            'CONN_HEALTH_CHECKS': DB_CONN_HEALTH_CHECKS,
+            'OPTIONS': {
+                'pool': {
+                    'min_size': int(os.getenv('db_pool_min_size', '2')),
+                    'max_size': int(os.getenv('db_pool_max_size', '10')),
+                    'timeout': float(os.getenv('db_pool_timeout', '10')),
+                },
+            } if DB_POOL else {},
+        }
+    }
+else:
+    DATABASES = {
+        'default': {
+            'ENGINE': 'django.db.backends.sqlite3',
+            'NAME': os.getenv('db_name', str(BASE_DIR / 'db.sqlite3')),
+            'CONN_MAX_AGE': DB_CONN_MAX_AGE,
+            'CONN_HEALTH_CHECKS': DB_CONN_HEALTH_CHECKS,
+            'OPTIONS': {
+                # Seconds a writer waits for the write lock before "database is locked"
+                'timeout': float(os.getenv('sqlite_busy_timeout', '5')),
+                # Take the write lock when a transaction starts, so two writers
+                # queue on the busy timeout instead of failing mid-transaction
+                'transaction_mode': 'IMMEDIATE',
+            },
+        }
+    }
+
+# Pragmas djangoapp.db applies to every new SQLite connection
+SQLITE_JOURNAL_MODE = os.getenv('sqlite_journal_mode', 'WAL')
+SQLITE_SYNCHRONOUS = os.getenv('sqlite_synchronous', 'NORMAL')
+# Bytes of the database file read through mmap (0 disables)
+SQLITE_MMAP_SIZE = int(os.getenv('sqlite_mmap_size', str(256 * 1024 * 1024)))
+
+# Cache
+# Backs the dealer proxy cache; point it at a shared backend (Redis, Memcached)
+# to share entries between worker processes.
+CACHES = {
     'default': {
-        'ENGINE': 'django.db.backends.sqlite3',
-        'NAME': BASE_DIR / 'db.sqlite3',
+        'BACKEND': 'django.core.cache.backends.locmem.LocMemCache',
+        'LOCATION': 'djangoapp',
     }
 }
 
+# Seconds a dealer list/detail payload is served from cache (0 disables caching)
+DEALER_CACHE_TTL = int(os.getenv('dealer_cache_ttl', '300'))
+# Seconds the last good dealer payload is kept to answer with (marked "stale": true)
+# while the backend is down
+STALE_TTL = int(os.getenv('stale_ttl', '86400'))
+
+# Passthrough mode: splice the backend's dealer JSON bytes straight into the
+# {"status": 200, "dealers": ...} envelope instead of decoding and re-encoding them
+DEALER_PASSTHROUGH = os.getenv('dealer_passthrough', 'true').lower() in ('1', 'true', 'yes')
+# Upstream bodies larger than this many bytes are streamed to the client (and not
+# cached) instead of being buffered; 0 never streams
+DEALER_STREAM_THRESHOLD = int(os.getenv('dealer_stream_threshold', str(1024 * 1024)))
+
+# Opt-in: answer get_dealerships/get_dealer_details from a local snapshot of all
+# dealers, refreshed in the background once it is DEALER_SNAPSHOT_INTERVAL seconds
+# old. Off by default, leaving those views to the TTL/ETag cache and passthrough.
+DEALER_SNAPSHOT = os.getenv('dealer_snapshot', 'false').lower() in ('1', 'true', 'yes')
+DEALER_SNAPSHOT_INTERVAL = int(os.getenv('dealer_snapshot_interval', '60'))
+
+# Upper bound on how long a serialized get_cars payload lives. Catalogue changes
+# retire cached pages in every process through a generation counter kept in the
+# database (djangoapp.http_cache), so the TTL only bounds memory use.
+CATALOGUE_CACHE_TTL = int(os.getenv('catalogue_cache_ttl', '3600'))
+# Seconds a process reuses the generation it last read before asking the database
+# again, i.e. how long other processes may keep serving a replaced catalogue;
+# the process that made the change sees it at once. 0 reads it on every request.
+CATALOGUE_GENERATION_TTL = float(os.getenv('catalogue_generation_ttl', '2'))
+
+# Per-dealer inventory ({"cars": [...]}) served by the inventory search, indexed in
+# memory and re-indexed when the file changes
+INVENTORY_PATH = os.getenv('inventory_path', str(BASE_DIR / 'database' / 'data' / 'car_records.json'))
+
+# Seconds between full rebuilds of the in-process review search index from the
+# backend; reviews posted through djangoapp are added to it right away
+REVIEW_SEARCH_REFRESH = int(os.getenv('review_search_refresh', '600'))
+
+# Send the per-request upstream/db/serialize timings to clients as a Server-Timing
+# header (browser dev tools show them); turn off to keep them in the logs only
+SERVER_TIMING_HEADER = os.getenv('server_timing_header', 'true').lower() in ('1', 'true', 'yes')
+
+# Logging
+# djangoapp logs upstream failures at WARNING, one timing line per request at
+# INFO (djangoapp.timing) and each upstream call at DEBUG. Raise log_level (or
+# request_log_level for just the per-request lines) to cut the volume under load.
+LOGGING = {
+    'version': 1,
+    'disable_existing_loggers': False,
+    'formatters': {
+        'plain': {
+            'format': '%(asctime)s %(levelname)s %(name)s %(message)s',
+        },
+    },
+    'handlers': {
+        'console': {
+            'class': 'logging.StreamHandler',
+            'formatter': 'plain',
+        },
+    },
+    'loggers': {
+        'djangoapp': {
+            'handlers': ['console'],
+            'level': os.getenv('log_level', 'INFO').upper(),
+            'propagate': False,
+        },
+        'djangoapp.timing': {
+            'level': os.getenv('request_log_level', os.getenv('log_level', 'INFO')).upper(),
+        },
+    },
+}
+
 AUTH_PASSWORD_VALIDATORS = [
     {
         'NAME':
@@ -110,6 +243,32 @@ AUTH_PASSWORD_VALIDATORS = [
 ]
 
 
+# Sessions
+# Where login sessions live: 'db' (Django's default, one django_session write per
+# login), 'cache' (the default cache; use a shared one such as Redis with several
+# workers), 'cached_db' (cache reads, still written through to the db) or
+# 'signed_cookies' (no server-side storage at all)
+SESSION_ENGINES = {
+    'db': 'django.contrib.sessions.backends.db',
+    'cache': 'django.contrib.sessions.backends.cache',
+    'cached_db': 'django.contrib.sessions.backends.cached_db',
+    'signed_cookies': 'django.contrib.sessions.backends.signed_cookies',
+}
+SESSION_ENGINE = SESSION_ENGINES[os.getenv('session_engine', 'db')]
+
+# Password hashing
+# PBKDF2 iterations for new and re-hashed passwords (0 keeps Django's default).
+# Lowering it makes logins cheap for load tests and CI. Only honoured with DEBUG
+# on, and stored hashes are never re-encoded with fewer iterations than they have.
+PASSWORD_HASH_ITERATIONS = int(os.getenv('password_hash_iterations', '0'))
+PASSWORD_HASHERS = [
+    'djangoapp.hashers.PBKDF2PasswordHasher',
+    'django.contrib.auth.hashers.PBKDF2SHA1PasswordHasher',
+    'django.contrib.auth.hashers.Argon2PasswordHasher',
+    'django.contrib.auth.hashers.BCryptSHA256PasswordHasher',
+    'django.contrib.auth.hashers.ScryptPasswordHasher',
+]
+
 # Internationalization
 LANGUAGE_CODE = 'en-us'
 